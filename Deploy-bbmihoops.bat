@@ -43,6 +43,20 @@ python "%PIPELINE_DIR%\build_tournament_results.py" || (
     echo WARNING: build_tournament_results.py failed — continuing deploy
 )
 echo.
+echo ============================================
+echo   Building per-team / per-date data shards...
+echo ============================================
+python build-data-shards.py || (
+    echo WARNING: build-data-shards.py failed — continuing deploy
+)
+echo.
+echo ============================================
+echo   Snapshotting data files...
+echo ============================================
+python src\scripts\snapshot_archive.py || (
+    echo WARNING: snapshot_archive.py failed — continuing deploy
+)
+echo.
 echo Staging changes...
 git add -A || (
     echo GIT ADD FAILED
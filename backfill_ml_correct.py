@@ -4,7 +4,12 @@ For each day, extracts baseball-games.json from that day's FIRST commit,
 applies Platt scaling to the homeWinPct and odds from that snapshot,
 computes ML picks, and matches to actual final scores.
 """
-import subprocess, json, math, sys
+import subprocess, json, math, os, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "scripts"))
+from team_registry import load_registry
+
+REGISTRY = load_registry()
 
 PLATT_A = 2.796
 PLATT_B = -0.366
@@ -32,6 +37,10 @@ def american_to_prob(ml):
     elif ml < 0: return abs(ml) / (abs(ml) + 100)
     return 0.5
 
+def game_key(date, away, home):
+    """Join key for a game; team spellings may differ between snapshots."""
+    return (date, REGISTRY.key(away), REGISTRY.key(home))
+
 def get_snapshot(sha):
     """Extract baseball-games.json from a specific git commit."""
     result = subprocess.run(
@@ -47,7 +56,7 @@ with open("src/data/betting-lines/baseball-games.json") as f:
     current_games = json.load(f)
 score_lookup = {}
 for g in current_games:
-    key = f"{g.get('date')}|{g.get('awayTeam')}|{g.get('homeTeam')}"
+    key = game_key(g.get('date'), g.get('awayTeam'), g.get('homeTeam'))
     if g.get("actualHomeScore") is not None:
         score_lookup[key] = (g["actualHomeScore"], g["actualAwayScore"])
 
@@ -116,7 +125,7 @@ for date in sorted(DAY_COMMITS.keys()):
 
         if pick:
             # Match to actual score
-            key = f"{date}|{g.get('awayTeam')}|{g.get('homeTeam')}"
+            key = game_key(date, g.get('awayTeam'), g.get('homeTeam'))
             scores = score_lookup.get(key)
             won = None
             if scores:
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Data shard build stage
+Splits the season-long game files into per-team and per-date JSON shards
+under public/data/shards/ so a page can fetch one team's or one day's rows
+(a few KB) instead of importing the whole file (MBs).
+
+Only datasets (and shard kinds) that a page reads through useShard /
+loadShard (src/lib/dataShards.ts) are built; output for datasets dropped
+from DATASETS is deleted on the next full build. Pages that aggregate over
+the whole season (picks history, model vs Vegas, ...) keep importing the
+source file, so games.json / football-games.json are not sharded.
+
+Each dataset gets a manifest.json mapping team name / date to its shard:
+    {"source": ..., "sourceHash": ..., "generated": ...,
+     "teams": {"Duke": {"path": "/data/shards/ncaa-scores/teams/duke.json", "count": 34, "hash": "..."}},
+     "dates": {"2026-03-01": {...}}}
+
+Shards and manifests go through artifact_writer.write_json, so like other
+public/ artifacts they get .gz / .br siblings and the size budgets in
+artifact-budgets.json. Only shards whose content changed are rewritten (the
+manifest hash is compared before writing); a dataset whose source is
+unchanged is skipped entirely, and shards that no longer exist are deleted
+along with their siblings.
+
+Usage:
+    python build-data-shards.py
+    python build-data-shards.py --force        # rewrite every shard
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "scripts"))
+from artifact_writer import write_json
+from team_registry import file_slug
+
+# ===== CONFIGURATION =====
+OUTPUT_DIR = "public/data/shards"
+URL_BASE = "/data/shards"
+MANIFEST_NAME = "manifest.json"
+
+# dataset -> source file, fields naming the team(s) in a row, field holding the
+# date, shard kinds a page reads
+DATASETS = {
+    # ncaa-team/[team] page
+    "ncaa-scores": {
+        "source": "src/data/ncaa-team/ncaa-scores.json",
+        "team_fields": ["homeTeam", "awayTeam"],
+        "date_field": "gameDate",
+        "kinds": ["teams"],
+    },
+    # wiaa-team/[team] page
+    "wiaa-scores": {
+        "source": "src/data/wiaa-team/wiaa-scores.json",
+        "team_fields": ["team"],
+        "date_field": "date",
+        "kinds": ["teams"],
+    },
+}
+
+def load_json(path, default=None):
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return default
+
+def encode(rows):
+    return json.dumps(rows, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def short_hash(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+# ===== SHARDING =====
+def group_rows(rows, team_fields, date_field):
+    """One pass over the source: ({team: [rows]}, {YYYY-MM-DD: [rows]}) in source order"""
+    teams, dates = {}, {}
+    for row in rows:
+        for team in dict.fromkeys(row.get(f) for f in team_fields):
+            if team:
+                teams.setdefault(team, []).append(row)
+        date = str(row.get(date_field) or "")[:10]
+        if date:
+            dates.setdefault(date, []).append(row)
+    return teams, dates
+
+def shard_names(keys):
+    """Stable, collision-free file stems for shard keys"""
+    names, used = {}, set()
+    for key in sorted(keys):
+        stem = file_slug(key) or "unnamed"
+        candidate, n = stem, 2
+        while candidate in used:
+            candidate, n = f"{stem}-{n}", n + 1
+        used.add(candidate)
+        names[key] = candidate
+    return names
+
+def write_group(out_dir, kind, groups, names, previous, stats):
+    """Write changed shards of one kind ("teams" / "dates"); returns manifest section"""
+    section = {}
+    kind_dir = os.path.join(out_dir, kind)
+    os.makedirs(kind_dir, exist_ok=True)
+    for key in sorted(groups):
+        data = encode(groups[key])
+        filename = f"{names[key]}.json"
+        path = os.path.join(kind_dir, filename)
+        digest = short_hash(data)
+        prev = previous.get(key)
+        if (prev and prev["hash"] == digest and prev["path"].endswith(f"/{kind}/{filename}")
+                and os.path.exists(path) and os.path.exists(path + ".gz")):
+            stats["unchanged"] += 1
+        else:
+            write_json(path, groups[key], quiet=True)
+            stats["written"] += 1
+            stats["bytes"] += len(data)
+        section[key] = {
+            "path": f"{URL_BASE}/{os.path.basename(out_dir)}/{kind}/{filename}",
+            "count": len(groups[key]),
+            "hash": digest,
+        }
+    # Remove shards (and their .gz / .br siblings) for teams / dates that disappeared
+    keep = {os.path.basename(e["path"]) for e in section.values()}
+    for f in os.listdir(kind_dir):
+        shard = f.rsplit(".", 1)[0] if f.endswith((".gz", ".br")) else f
+        if shard.endswith(".json") and shard not in keep:
+            os.remove(os.path.join(kind_dir, f))
+            stats["removed"] += f == shard
+    return section
+
+def remove_dir(path):
+    """Delete a shard directory; returns the number of shard files removed"""
+    if not os.path.isdir(path):
+        return 0
+    removed = 0
+    for root, _, files in os.walk(path, topdown=False):
+        for f in files:
+            os.remove(os.path.join(root, f))
+            removed += f.endswith(".json") and f != MANIFEST_NAME
+        os.rmdir(root)
+    return removed
+
+def prune_datasets():
+    """Delete the output of datasets no longer in DATASETS"""
+    if not os.path.isdir(OUTPUT_DIR):
+        return
+    for name in sorted(os.listdir(OUTPUT_DIR)):
+        if name not in DATASETS and os.path.isdir(os.path.join(OUTPUT_DIR, name)):
+            print(f"  {name:12s} no longer built: removed {remove_dir(os.path.join(OUTPUT_DIR, name))} shard(s)")
+
+def build_dataset(name, cfg, force=False):
+    out_dir = os.path.join(OUTPUT_DIR, name)
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    previous = load_json(manifest_path, {}) if not force else {}
+
+    with open(cfg["source"], 'rb') as f:
+        raw = f.read()
+    source_hash = short_hash(raw)
+    if previous.get("sourceHash") == source_hash:
+        print(f"  {name:12s} unchanged ({cfg['source']})")
+        return
+
+    rows = json.loads(raw)
+    groups = dict(zip(("teams", "dates"), group_rows(rows, cfg["team_fields"], cfg["date_field"])))
+    stats = {"written": 0, "unchanged": 0, "removed": 0, "bytes": 0}
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {
+        "source": cfg["source"],
+        "sourceHash": source_hash,
+        "generated": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    for kind, group in groups.items():
+        if kind in cfg["kinds"]:
+            manifest[kind] = write_group(out_dir, kind, group, shard_names(group), previous.get(kind, {}), stats)
+        else:
+            manifest[kind] = {}
+            stats["removed"] += remove_dir(os.path.join(out_dir, kind))
+    write_json(manifest_path, manifest)
+
+    largest = max((e["count"] for e in manifest["teams"].values()), default=0)
+    print(f"  {name:12s} {len(rows):>6} rows → {len(manifest['teams'])} team / {len(manifest['dates'])} date shards "
+          f"({stats['written']} written, {stats['bytes'] / 1024:,.0f} KB; {stats['unchanged']} unchanged; "
+          f"{stats['removed']} removed; largest team shard {largest} rows)")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--force", action="store_true", help="Rewrite every shard even if unchanged")
+    parser.add_argument("datasets", nargs="*", help=f"Datasets to build (default: all of {', '.join(DATASETS)})")
+    args = parser.parse_args()
+    unknown = [d for d in args.datasets if d not in DATASETS]
+    if unknown:
+        parser.error(f"unknown dataset(s): {', '.join(unknown)}")
+
+    print("=" * 70)
+    print("DATA SHARD BUILD")
+    print("=" * 70)
+    if not args.datasets:
+        prune_datasets()
+    for name in args.datasets or DATASETS:
+        build_dataset(name, DATASETS[name], force=args.force)
+    print(f"\n✅ Done! Shards in {OUTPUT_DIR}/")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Logo asset build stage
+Run after fetch-ncaa-logos.py and update-logo-mapping.py.
+
+For every NCAA / WIAA logo:
+  - writes resized, palette-compressed PNG variants at the sizes the site
+    renders (2x for retina) as <stem>-<size>.<hash>.png, the hash covering
+    the source and the build settings
+  - packs one sprite sheet per page (rankings, bracket, picks) so a page
+    needs a single image request instead of one per team
+and records each page's logos (hash + sprite cell) in
+src/data/logo-assets/<league>-<page>.json (see src/scripts/logo_assets.py).
+Only that page imports its manifest; ncaa-logo-mapping.json /
+wiaa-logo-mapping.json keep just filename / path.
+
+Sources whose content hash is unchanged since the last build are not
+re-encoded; build outputs no longer referenced are deleted.
+
+Usage:
+    python build-logo-assets.py
+"""
+
+import hashlib
+import io
+import json
+import math
+import os
+import sys
+
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "scripts"))
+from artifact_writer import write_json
+from logo_assets import PAGE_ASSETS_DIR, manifest_path
+
+# ===== CONFIGURATION =====
+LEAGUES = {
+    "ncaa": {
+        "logos_dir": "public/logos/ncaa",
+        "mapping_file": "src/data/ncaa-logo-mapping.json",
+    },
+    "wiaa": {
+        "logos_dir": "public/logos/wiaa",
+        "mapping_file": "src/data/wiaa-logo-mapping.json",
+    },
+}
+
+# Pixel sizes to emit. Components render 11-30px (up to 120px on team pages);
+# each variant serves display sizes up to half its width on 2x screens.
+VARIANT_SIZES = [32, 64, 128, 256]
+SPRITE_CELL = 64   # sprite cells serve logos displayed at <= 32 CSS px
+QUANTIZE = True    # 256-colour palette; logos are flat artwork
+
+BUILD_SUBDIR = "build"
+SPRITE_SUBDIR = "sprites"
+MANIFEST_NAME = "manifest.json"
+
+def load_json(path, default=None):
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return default
+
+# ===== PAGE TEAM LISTS =====
+def ncaa_pages():
+    """Team names per NCAA page (keys of ncaa-logo-mapping.json)"""
+    rankings = load_json("src/data/rankings/rankings.json", [])
+    seeding = load_json("src/data/seeding/seeding.json", [])
+    games = load_json("src/data/betting-lines/games.json", [])
+    upcoming = [g for g in games if g.get("actualHomeScore") is None]
+    if not upcoming and games:
+        latest = max(g.get("date", "") for g in games)
+        upcoming = [g for g in games if g.get("date") == latest]
+    return {
+        "rankings": [r.get("team") or r.get("Team") for r in rankings],
+        "bracket": [t["Team"] for t in seeding],
+        "picks": sorted({t for g in upcoming for t in (g.get("away"), g.get("home")) if t}),
+    }
+
+def wiaa_pages():
+    """Team slugs per WIAA page (the slug TeamLogo receives)"""
+    rankings = load_json("src/data/wiaa-rankings/WIAArankings-with-slugs.json", [])
+    bracket = []
+    for div in range(1, 6):
+        bracket += [t["slug"] for t in load_json(f"src/data/wiaa-seeding/wiaa-d{div}-bracket.json", []) if t.get("slug")]
+    return {
+        "rankings": [r["slug"] for r in rankings if r.get("slug")],
+        "bracket": bracket,
+    }
+
+# ===== IMAGE HELPERS =====
+def fit_square(img, size):
+    """Scale into a size x size transparent square, preserving aspect ratio"""
+    img = img.convert("RGBA")
+    img.thumbnail((size, size), Image.LANCZOS)
+    canvas = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    canvas.paste(img, ((size - img.width) // 2, (size - img.height) // 2))
+    return canvas
+
+def encode_png(img):
+    if QUANTIZE:
+        img = img.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+def write_hashed(data, out_dir, stem):
+    """Write bytes as <stem>.<hash>.png (skipped if already present); returns filename"""
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    filename = f"{stem}.{digest}.png"
+    path = os.path.join(out_dir, filename)
+    if not os.path.exists(path):
+        with open(path, 'wb') as f:
+            f.write(data)
+    return filename
+
+def file_sha(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def variant_hash(source_sha):
+    """One hash for all of a logo's variants: the source plus the settings that shape them"""
+    return hashlib.sha256(f"{source_sha}:{VARIANT_SIZES}:{QUANTIZE}".encode()).hexdigest()[:10]
+
+def variant_name(filename, size, digest):
+    return f"{os.path.splitext(filename)[0]}-{size}.{digest}.png"
+
+# ===== BUILD =====
+def build_variants(logos_dir, sources, manifest, stats):
+    """Resize every source logo; returns {source filename: variant hash}"""
+    build_dir = os.path.join(logos_dir, BUILD_SUBDIR)
+    os.makedirs(build_dir, exist_ok=True)
+    hashes = {}
+    for filename in sorted(sources):
+        src = os.path.join(logos_dir, filename)
+        sha = file_sha(src)
+        digest = variant_hash(sha)
+        names = [variant_name(filename, size, digest) for size in VARIANT_SIZES]
+        hashes[filename] = digest
+        prev = manifest.get(filename)
+        if (prev and prev.get("hash") == digest
+                and all(os.path.exists(os.path.join(build_dir, n)) for n in names)):
+            stats["reused"] += 1
+            continue
+
+        with Image.open(src) as img:
+            img.load()
+            for size, name in zip(VARIANT_SIZES, names):
+                with open(os.path.join(build_dir, name), 'wb') as f:
+                    f.write(encode_png(fit_square(img, size)))
+        manifest[filename] = {"sha": sha, "hash": digest}
+        stats["encoded"] += 1
+        stats["source_bytes"] += os.path.getsize(src)
+    return hashes
+
+def build_sprite(logos_dir, page, keys, key_to_file, stats):
+    """Pack one page's logos into a grid; returns (sheet filename, {key: (x, y)}, w, h)"""
+    files = []
+    seen = set()
+    for key in keys:
+        filename = key_to_file(key)
+        if key in seen or not filename or not os.path.exists(os.path.join(logos_dir, filename)):
+            continue
+        seen.add(key)
+        files.append((key, filename))
+    if not files:
+        return None
+
+    cols = math.ceil(math.sqrt(len(files)))
+    rows = math.ceil(len(files) / cols)
+    sheet = Image.new("RGBA", (cols * SPRITE_CELL, rows * SPRITE_CELL), (0, 0, 0, 0))
+    coords = {}
+    for i, (key, filename) in enumerate(files):
+        x, y = (i % cols) * SPRITE_CELL, (i // cols) * SPRITE_CELL
+        with Image.open(os.path.join(logos_dir, filename)) as img:
+            sheet.paste(fit_square(img, SPRITE_CELL), (x, y))
+        coords[key] = (x, y)
+
+    sprite_dir = os.path.join(logos_dir, SPRITE_SUBDIR)
+    os.makedirs(sprite_dir, exist_ok=True)
+    name = write_hashed(encode_png(sheet), sprite_dir, page)
+    stats["sprites"] += 1
+    return name, coords, sheet.width, sheet.height
+
+def prune(directory, keep):
+    """Delete build outputs that are no longer referenced"""
+    removed = 0
+    if not os.path.isdir(directory):
+        return removed
+    for f in os.listdir(directory):
+        if f.endswith(".png") and f not in keep:
+            os.remove(os.path.join(directory, f))
+            removed += 1
+    return removed
+
+def build_league(league, cfg, pages, key_to_file):
+    logos_dir = cfg["logos_dir"]
+    url_base = "/" + os.path.relpath(logos_dir, "public").replace(os.sep, "/")
+    build_manifest = os.path.join(logos_dir, BUILD_SUBDIR, MANIFEST_NAME)
+    manifest = load_json(build_manifest, {})
+    mapping = load_json(cfg["mapping_file"], {})
+    stats = {"encoded": 0, "reused": 0, "sprites": 0, "source_bytes": 0}
+
+    sources = [f for f in os.listdir(logos_dir) if f.endswith(".png")]
+    hashes = build_variants(logos_dir, sources, manifest, stats)
+    manifest = {f: manifest[f] for f in hashes if f in manifest}
+
+    # One manifest per page, holding only the logos that page shows
+    sprites = {}
+    for page, keys in pages.items():
+        built = build_sprite(logos_dir, page, keys, lambda k: key_to_file(mapping, k), stats)
+        assets = {"build": f"{url_base}/{BUILD_SUBDIR}", "sizes": VARIANT_SIZES, "logos": {}}
+        if built:
+            sprites[page] = built
+            sheet, coords, width, height = built
+            assets["sprite"] = {"sheet": f"{url_base}/{SPRITE_SUBDIR}/{sheet}", "cell": SPRITE_CELL,
+                                "width": width, "height": height}
+            for key, (x, y) in coords.items():
+                filename = key_to_file(mapping, key)
+                assets["logos"][key] = {"file": filename, "hash": hashes[filename], "x": x, "y": y}
+        write_json(manifest_path(league, page), assets)
+
+    # Earlier builds wrote variants / sprites into the mapping itself
+    stripped = False
+    for entry in mapping.values():
+        if isinstance(entry, dict):
+            stripped |= entry.pop("variants", None) is not None
+            stripped |= entry.pop("sprites", None) is not None
+    if stripped:
+        write_json(cfg["mapping_file"], mapping)
+
+    # The build manifest is this script's cache, never fetched by a page
+    write_json(build_manifest, manifest, compress=False)
+
+    keep_variants = {variant_name(f, size, digest) for f, digest in hashes.items() for size in VARIANT_SIZES}
+    removed = prune(os.path.join(logos_dir, BUILD_SUBDIR), keep_variants)
+    removed += prune(os.path.join(logos_dir, SPRITE_SUBDIR), {s[0] for s in sprites.values()})
+
+    built_bytes = sum(os.path.getsize(os.path.join(logos_dir, BUILD_SUBDIR, n)) for n in keep_variants)
+    print(f"\n{league.upper()}")
+    print(f"  Sources:        {len(sources)} ({stats['encoded']} encoded, {stats['reused']} unchanged)")
+    print(f"  Variant bytes:  {built_bytes / 1024:,.0f} KB across {len(keep_variants)} files")
+    for page, (sheet, coords, _, _) in sprites.items():
+        size = os.path.getsize(os.path.join(logos_dir, SPRITE_SUBDIR, sheet))
+        print(f"  Sprite {page:9s} {len(coords):>4} logos, {size / 1024:,.0f} KB  → {sheet}")
+    if removed:
+        print(f"  Removed {removed} stale build file(s)")
+
+# ===== MAPPING ADAPTERS =====
+def ncaa_file(mapping, team):
+    info = mapping.get(team)
+    return info.get("filename") if isinstance(info, dict) else None
+
+def wiaa_file(mapping, slug):
+    # Legacy entries are plain strings naming the file stem
+    info = mapping.get(slug, slug)
+    stem = info.get("filename", "")[:-4] if isinstance(info, dict) else info
+    return f"{stem}.png"
+
+def main():
+    print("=" * 70)
+    print("LOGO ASSET BUILD")
+    print("=" * 70)
+
+    build_league("ncaa", LEAGUES["ncaa"], ncaa_pages(), ncaa_file)
+    build_league("wiaa", LEAGUES["wiaa"], wiaa_pages(), wiaa_file)
+
+    print(f"\n✅ Done! Page manifests updated in {os.path.relpath(PAGE_ASSETS_DIR)}")
+
+if __name__ == "__main__":
+    main()
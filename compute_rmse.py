@@ -11,10 +11,16 @@ Usage:
 """
 
 import json
-import math
+import os
+import sys
 import argparse
 from pathlib import Path
 
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "scripts"))
+from bbmi_metrics import error_report
+
 def load_games(path: str) -> list[dict]:
     with open(path, "r") as f:
         return json.load(f)
@@ -32,20 +38,16 @@ def compute_rmse(games: list[dict]) -> dict:
     if not completed:
         raise ValueError("No completed games with BBMI lines found.")
 
-    errors = []
-    for g in completed:
-        actual_margin = g["actualHomeScore"] - g["actualAwayScore"]
-        bbmi_line = g["bbmiHomeLine"]
-        # BBMI line is from home team perspective (negative = home favored)
-        # Predicted margin = -bbmiHomeLine (e.g. line of -5 means home favored by 5)
-        predicted_margin = -bbmi_line
-        errors.append(predicted_margin - actual_margin)
-
-    n = len(errors)
-    mse = sum(e ** 2 for e in errors) / n
-    rmse = math.sqrt(mse)
-    mae = sum(abs(e) for e in errors) / n
-    bias = sum(errors) / n  # positive = BBMI systematically overestimates home
+    actual_margin = np.array([g["actualHomeScore"] - g["actualAwayScore"] for g in completed], dtype=float)
+    # BBMI line is from home team perspective (negative = home favored)
+    # Predicted margin = -bbmiHomeLine (e.g. line of -5 means home favored by 5)
+    predicted_margin = -np.array([g["bbmiHomeLine"] for g in completed], dtype=float)
+
+    report = error_report(predicted_margin, actual_margin)
+    n = report["n"]
+    rmse = report["rmse"]
+    mae = report["mae"]
+    bias = report["bias"]  # positive = BBMI systematically overestimates home
 
     # Equivalence thresholds
     # Games where |bbmiLine - vegasLine| < threshold are "statistically equivalent"
@@ -54,17 +56,16 @@ def compute_rmse(games: list[dict]) -> dict:
 
     # Also compute win rate at various edge thresholds for context
     all_bets = [g for g in completed if g.get("fakeBet", 0) and float(g.get("fakeBet", 0)) > 0]
-    
+    edge = np.array([abs((g.get("bbmiHomeLine") or 0) - (g.get("vegasHomeLine") or 0)) for g in all_bets], dtype=float)
+    won = np.array([float(g.get("fakeWin", 0)) > 0 for g in all_bets], dtype=bool)
+
     results = {}
     thresholds = [0, 1, 2, 3, 4, 5, 6]
     for t in thresholds:
-        bucket = [
-            g for g in all_bets
-            if abs((g.get("bbmiHomeLine") or 0) - (g.get("vegasHomeLine") or 0)) >= t
-        ]
-        wins = [g for g in bucket if float(g.get("fakeWin", 0)) > 0]
-        win_pct = (len(wins) / len(bucket) * 100) if bucket else 0
-        results[t] = {"games": len(bucket), "win_pct": round(win_pct, 1)}
+        bucket = edge >= t
+        games = int(bucket.sum())
+        win_pct = (int(won[bucket].sum()) / games * 100) if games else 0
+        results[t] = {"games": games, "win_pct": round(win_pct, 1)}
 
     return {
         "n": n,
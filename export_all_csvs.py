@@ -41,8 +41,8 @@ def read_range(ws, cell_range):
         ])
     return rows
 
-def export_csv(sheet_name, cell_range, output_path):
-    wb = openpyxl.load_workbook(excel_path, data_only=True)
+def export_csv(sheet_name, cell_range, output_path, workbook_path=None):
+    wb = openpyxl.load_workbook(workbook_path or excel_path, data_only=True)
     ws = wb[sheet_name]
     rows = read_range(ws, cell_range)
     
@@ -55,7 +55,11 @@ def export_csv(sheet_name, cell_range, output_path):
     print(f"Exported → {output_path}")
 
 # === MAIN ===
-for key, cfg in DATA_MAP.items():
-    export_csv(cfg["sheet"], cfg["range"], cfg["output"])
+def main(workbook_path=None, data_map=None):
+    for key, cfg in (data_map or DATA_MAP).items():
+        export_csv(cfg["sheet"], cfg["range"], cfg["output"], workbook_path)
 
-print("\n✓ All exports complete!")
\ No newline at end of file
+    print("\n✓ All exports complete!")
+
+if __name__ == "__main__":
+    main()
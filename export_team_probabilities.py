@@ -2,10 +2,13 @@
 Extract cells BF6:BG14 from 'team probabilities' sheet to JSON
 """
 import win32com.client as win32
-import json
+import os
 from pathlib import Path
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "scripts"))
+from artifact_writer import write_json
+
 def extract_range_to_json(excel_path, output_path):
     """Extract BF6:BG14 from 'team probabilities' sheet and save as JSON"""
     
@@ -50,8 +53,7 @@ def extract_range_to_json(excel_path, output_path):
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        write_json(str(output_path), data)
         
         print(f"JSON saved to: {output_path}")
         print(f"Extracted {len(data)} rows x {len(data[0]) if data else 0} columns")
@@ -1,155 +1,286 @@
 #!/usr/bin/env python3
 """
-NCAA Team Logo Fetcher - Improved with rate limiting
-Uses TheSportsDB API with smart throttling
+NCAA Team Logo Fetcher - Async with token-bucket rate limiting
+Uses TheSportsDB API; only the search endpoint is throttled.
+
+Teams whose logo is already on disk are skipped immediately, cached API
+responses are used without waiting, and badge images are downloaded
+concurrently over a single pooled connection.
+
+Mapping paths are the output directory's URL under public/ (Next.js serves
+public/ from /), so --output-dir public/logos/ncaa-test maps to
+/logos/ncaa-test/<file>.png; a directory outside public/ is recorded as its
+file path. Existing mapping entries are updated in place, keeping fields
+other scripts add (variants, sprites, sportsdb_id).
+
+Requires aiohttp (see requirements.txt). tests/test_fetch_ncaa_logos.py
+runs the fetcher against a local aiohttp stub server.
+
+Usage:
+    python fetch-ncaa-logos.py
+    python fetch-ncaa-logos.py --api-url http://127.0.0.1:8080/searchteams.php --output-dir /tmp/logos
 """
 
-import requests
+import argparse
+import asyncio
 import json
 import os
+import sys
 import time
-from pathlib import Path
 from urllib.parse import quote
 
+import aiohttp
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "scripts"))
+from api_cache import ApiCache
+from artifact_writer import write_json
+from team_registry import file_slug
+
 # ===== CONFIGURATION =====
 RANKINGS_FILE = "src/data/rankings/rankings.json"
 OUTPUT_DIR = "public/logos/ncaa"
+PUBLIC_DIR = "public"  # served from / by Next.js
 MAPPING_FILE = "src/data/ncaa-logo-mapping.json"
-CACHE_FILE = "logo-fetch-cache.json"  # Cache to avoid re-fetching
+CACHE_FILE = "logo-fetch-cache.sqlite"  # Cache to avoid re-fetching
+LEGACY_CACHE_FILE = "logo-fetch-cache.json"  # imported once into CACHE_FILE
+CACHE_TTL_DAYS = 90  # successful lookups
+NEGATIVE_CACHE_TTL_DAYS = 1  # failed / empty lookups are retried after this
+CACHE_MAX_MB = 64
 
 # API Configuration
 SPORTS_DB_URL = "https://www.thesportsdb.com/api/v1/json/3/searchteams.php"
-REQUEST_DELAY = 2.0  # 2 seconds between requests (increased)
+REQUEST_DELAY = 2.0  # average seconds between search requests
+REQUEST_BURST = 3    # searches allowed back-to-back before throttling kicks in
 MAX_RETRIES = 3
 RETRY_DELAY = 5  # seconds
+DOWNLOAD_CONNECTIONS = 20  # pooled connections shared by all image downloads
+SAVE_EVERY = 10  # teams between mapping saves
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens/second, holding at most `capacity`."""
 
-def setup():
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+def setup(output_dir):
     """Create necessary directories"""
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
     os.makedirs(os.path.dirname(MAPPING_FILE), exist_ok=True)
 
-def load_cache():
-    """Load cached API responses"""
-    if os.path.exists(CACHE_FILE):
-        with open(CACHE_FILE, 'r') as f:
+def open_cache():
+    """Open the API response cache (each entry is written as it arrives)"""
+    return ApiCache(
+        CACHE_FILE,
+        ttl=CACHE_TTL_DAYS * 86400,
+        negative_ttl=NEGATIVE_CACHE_TTL_DAYS * 86400,
+        max_bytes=CACHE_MAX_MB * 1024 * 1024,
+        legacy_json=LEGACY_CACHE_FILE,
+    )
+
+def load_mapping():
+    if os.path.exists(MAPPING_FILE):
+        with open(MAPPING_FILE, 'r', encoding='utf-8') as f:
             return json.load(f)
     return {}
 
-def save_cache(cache):
-    """Save API responses to cache"""
-    with open(CACHE_FILE, 'w') as f:
-        json.dump(cache, f, indent=2)
-
-def sanitize_filename(name):
-    """Convert team name to safe filename"""
-    safe_name = name.lower().strip()
-    safe_name = safe_name.replace(' ', '-')
-    safe_name = safe_name.replace("'", '')
-    safe_name = safe_name.replace("(", '').replace(")", '')
-    safe_name = safe_name.replace("&", 'and')
-    safe_name = ''.join(c for c in safe_name if c.isalnum() or c == '-')
-    return safe_name
+def save_mapping(logo_mapping, quiet=False):
+    write_json(MAPPING_FILE, logo_mapping, quiet=quiet)
+
+sanitize_filename = file_slug  # memoized; shared with update-logo-mapping.py
+
+def logo_url_base(output_dir):
+    """URL prefix of logos saved in output_dir (its path under public/)"""
+    rel = os.path.relpath(os.path.abspath(output_dir), os.path.abspath(PUBLIC_DIR))
+    if rel == ".." or rel.startswith(".." + os.sep):
+        # Not served by the site; record where the files are
+        return os.path.abspath(output_dir).replace(os.sep, "/")
+    return "/" + rel.replace(os.sep, "/")
+
+def set_logo(logo_mapping, team_name, filename, output_dir, **fields):
+    """Point a team's mapping entry at filename, keeping its other fields"""
+    entry = logo_mapping.setdefault(team_name, {})
+    entry.update(filename=filename, path=f"{logo_url_base(output_dir)}/{filename}", **fields)
 
 def load_teams():
     """Load team names from rankings.json"""
     try:
         with open(RANKINGS_FILE, 'r', encoding='utf-8') as f:
             data = json.load(f)
-        
+
         teams = []
         for item in data:
             team_name = item.get('team') or item.get('Team')
             if team_name:
                 teams.append(team_name)
-        
+
         print(f"✓ Loaded {len(teams)} teams")
         return teams
     except Exception as e:
         print(f"✗ Error loading teams: {e}")
         return []
 
-def search_team_api(team_name, cache, retry_count=0):
-    """Search for team with retry logic"""
-    
-    # Check cache first
-    if team_name in cache:
-        print(f"  📦 Using cached result")
-        return cache[team_name]
-    
-    try:
-        url = f"{SPORTS_DB_URL}?t={quote(team_name)}"
-        response = requests.get(url, timeout=15)
-        
-        # Handle rate limiting
-        if response.status_code == 429:
-            if retry_count < MAX_RETRIES:
-                wait_time = RETRY_DELAY * (retry_count + 1)
-                print(f"  ⏳ Rate limited. Waiting {wait_time}s...")
-                time.sleep(wait_time)
-                return search_team_api(team_name, cache, retry_count + 1)
-            else:
-                print(f"  ✗ Rate limit - max retries reached")
-                cache[team_name] = None
-                return None
-        
-        response.raise_for_status()
-        data = response.json()
-        
-        # Cache the result
-        cache[team_name] = data
-        
-        if data.get('teams'):
-            for team in data['teams']:
-                if team.get('strSport') == 'Basketball':
-                    return data
-        
-        return None
-    
-    except Exception as e:
-        print(f"  ✗ API Error: {e}")
-        cache[team_name] = None
-        return None
+def basketball_team(data):
+    """Return the first basketball team in an API response, if any"""
+    for team in (data or {}).get('teams') or []:
+        if team.get('strSport') == 'Basketball':
+            return team
+    return None
+
+async def search_team_api(session, limiter, api_url, team_name, cache):
+    """Search for team with retry logic; only uncached lookups are throttled"""
+
+    # Check cache first (expired entries and stale misses come back as MISS)
+    cached = cache.get(team_name)
+    if cached is not ApiCache.MISS:
+        print(f"  📦 {team_name}: using cached result")
+        return cached
 
-def download_logo(logo_url, team_name):
-    """Download logo image"""
+    for retry_count in range(MAX_RETRIES + 1):
+        await limiter.acquire()
+        try:
+            url = f"{api_url}?t={quote(team_name)}"
+            async with session.get(url) as response:
+                # Handle rate limiting
+                if response.status == 429:
+                    if retry_count < MAX_RETRIES:
+                        wait_time = RETRY_DELAY * (retry_count + 1)
+                        print(f"  ⏳ {team_name}: rate limited. Waiting {wait_time}s...")
+                        await asyncio.sleep(wait_time)
+                        continue
+                    print(f"  ✗ {team_name}: rate limit - max retries reached")
+                    cache.put(team_name, None)
+                    return None
+
+                response.raise_for_status()
+                data = await response.json(content_type=None)
+
+            # Cache the result; "no teams" is cached as a miss so it is retried later
+            cache.put(team_name, data if data and data.get('teams') else None)
+            return data
+
+        except Exception as e:
+            print(f"  ✗ {team_name}: API error: {e}")
+            cache.put(team_name, None)
+            return None
+    return None
+
+async def download_logo(session, logo_url, team_name, output_dir):
+    """Download logo image (not rate limited)"""
     if not logo_url:
         return None
-    
+
     try:
-        response = requests.get(logo_url, timeout=15)
-        response.raise_for_status()
-        
+        async with session.get(logo_url) as response:
+            response.raise_for_status()
+            content = await response.read()
+
         filename = f"{sanitize_filename(team_name)}.png"
-        filepath = os.path.join(OUTPUT_DIR, filename)
-        
+        filepath = os.path.join(output_dir, filename)
+
         with open(filepath, 'wb') as f:
-            f.write(response.content)
-        
+            f.write(content)
+
         return filename
     except Exception as e:
-        print(f"  ✗ Download error: {e}")
+        print(f"  ✗ {team_name}: download error: {e}")
         return None
 
+async def process_team(session, limiter, api_url, team_name, cache, output_dir, logo_mapping, stats):
+    filename = f"{sanitize_filename(team_name)}.png"
+
+    team_data = await search_team_api(session, limiter, api_url, team_name, cache)
+    team_info = basketball_team(team_data)
+
+    if not team_data or not team_data.get('teams'):
+        print(f"  ✗ {team_name}: not found in API")
+        stats['failed'] += 1
+    elif not team_info:
+        print(f"  ✗ {team_name}: not a basketball team")
+        stats['failed'] += 1
+    else:
+        stats['found'] += 1
+        logo_url = team_info.get('strBadge') or team_info.get('strLogo')
+        if not logo_url:
+            print(f"  ✗ {team_name}: no logo URL")
+            stats['failed'] += 1
+        elif await download_logo(session, logo_url, team_name, output_dir):
+            stats['downloaded'] += 1
+            set_logo(logo_mapping, team_name, filename, output_dir, sportsdb_id=team_info.get('idTeam'))
+            print(f"  ✓ {team_name}: downloaded")
+        else:
+            stats['failed'] += 1
+
+    stats['processed'] += 1
+
+async def fetch_all(teams, cache, logo_mapping, stats, api_url, output_dir):
+    limiter = TokenBucket(rate=1.0 / REQUEST_DELAY, capacity=REQUEST_BURST)
+    connector = aiohttp.TCPConnector(limit=DOWNLOAD_CONNECTIONS)
+    timeout = aiohttp.ClientTimeout(total=15)
+
+    pending = []
+    for team_name in teams:
+        # Already downloaded: no API call, no delay
+        filename = f"{sanitize_filename(team_name)}.png"
+        if os.path.exists(os.path.join(output_dir, filename)):
+            stats['skipped'] += 1
+            stats['processed'] += 1
+            set_logo(logo_mapping, team_name, filename, output_dir)
+        else:
+            pending.append(team_name)
+
+    print(f"✓ {stats['skipped']} logos already on disk, {len(pending)} to fetch\n")
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        tasks = [
+            asyncio.create_task(process_team(session, limiter, api_url, t, cache, output_dir, logo_mapping, stats))
+            for t in pending
+        ]
+        for done, task in enumerate(asyncio.as_completed(tasks), 1):
+            await task
+            # Cache entries are already on disk; checkpoint the mapping
+            if done % SAVE_EVERY == 0:
+                save_mapping(logo_mapping, quiet=True)
+                print(f"\n💾 Progress saved ({stats['processed']}/{stats['total']})\n")
+
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--api-url", default=SPORTS_DB_URL, help="TheSportsDB searchteams endpoint (override for a local stub)")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help="Directory for downloaded logos")
+    args = parser.parse_args()
+
     print("=" * 70)
-    print("NCAA LOGO FETCHER - TheSportsDB (Rate-Limited Version)")
+    print("NCAA LOGO FETCHER - TheSportsDB (Async, Rate-Limited Searches)")
     print("=" * 70)
-    print("\n⚠️  This will be SLOW to avoid rate limiting (2s between requests)")
-    print("⚠️  Estimated time: ~12 minutes for 365 teams")
+    print(f"\n⚠️  Uncached searches are limited to 1 every {REQUEST_DELAY:.0f}s (burst {REQUEST_BURST})")
     print("\nPress Ctrl+C to stop at any time. Progress is saved!\n")
-    
-    setup()
+
+    setup(args.output_dir)
     teams = load_teams()
-    
+
     if not teams:
         return
-    
-    # Load cache
-    cache = load_cache()
-    print(f"✓ Loaded cache with {len(cache)} entries\n")
-    
-    # Track results
-    logo_mapping = {}
+
+    # Open cache
+    cache = open_cache()
+    print(f"✓ Opened cache with {len(cache)} entries")
+
+    # Track results (on top of the existing mapping, so other fields survive)
+    logo_mapping = load_mapping()
     stats = {
         'total': len(teams),
         'processed': 0,
@@ -158,85 +289,19 @@ def main():
         'skipped': 0,
         'failed': 0
     }
-    
+
     try:
-        for idx, team_name in enumerate(teams, 1):
-            print(f"[{idx}/{len(teams)}] {team_name}")
-            
-            # Check if already downloaded
-            filename = f"{sanitize_filename(team_name)}.png"
-            filepath = os.path.join(OUTPUT_DIR, filename)
-            
-            if os.path.exists(filepath):
-                print(f"  ✓ Already have logo")
-                stats['skipped'] += 1
-                logo_mapping[team_name] = {
-                    'filename': filename,
-                    'path': f'/logos/ncaa/{filename}'
-                }
-                stats['processed'] += 1
-                continue
-            
-            # Search API
-            team_data = search_team_api(team_name, cache)
-            
-            if team_data and team_data.get('teams'):
-                team_info = None
-                for team in team_data['teams']:
-                    if team.get('strSport') == 'Basketball':
-                        team_info = team
-                        break
-                
-                if team_info:
-                    stats['found'] += 1
-                    logo_url = team_info.get('strBadge') or team_info.get('strLogo')
-                    
-                    if logo_url:
-                        print(f"  ✓ Found logo")
-                        
-                        if download_logo(logo_url, team_name):
-                            stats['downloaded'] += 1
-                            logo_mapping[team_name] = {
-                                'filename': filename,
-                                'path': f'/logos/ncaa/{filename}',
-                                'sportsdb_id': team_info.get('idTeam')
-                            }
-                            print(f"  ✓ Downloaded")
-                        else:
-                            stats['failed'] += 1
-                    else:
-                        print(f"  ✗ No logo URL")
-                        stats['failed'] += 1
-                else:
-                    print(f"  ✗ Not a basketball team")
-                    stats['failed'] += 1
-            else:
-                print(f"  ✗ Not found in API")
-                stats['failed'] += 1
-            
-            stats['processed'] += 1
-            
-            # Save progress every 10 teams
-            if idx % 10 == 0:
-                save_cache(cache)
-                with open(MAPPING_FILE, 'w') as f:
-                    json.dump(logo_mapping, f, indent=2)
-                print(f"\n💾 Progress saved ({stats['processed']}/{stats['total']})\n")
-            
-            # Rate limiting delay
-            time.sleep(REQUEST_DELAY)
-    
+        asyncio.run(fetch_all(teams, cache, logo_mapping, stats, args.api_url, args.output_dir))
+
     except KeyboardInterrupt:
         print("\n\n⚠️  Interrupted by user")
         print("Progress has been saved. You can resume later.")
-    
+
     finally:
         # Save final results
-        save_cache(cache)
-        
-        with open(MAPPING_FILE, 'w') as f:
-            json.dump(logo_mapping, f, indent=2)
-        
+        cache.close()
+        save_mapping(logo_mapping)
+
         # Summary
         print("\n" + "=" * 70)
         print("SUMMARY")
@@ -247,13 +312,13 @@ def main():
         print(f"Found in API:  {stats['found']}")
         print(f"Failed:        {stats['failed']}")
         print("=" * 70)
-        
+
         if stats['processed'] < stats['total']:
             remaining = stats['total'] - stats['processed']
             print(f"\n⏸️  {remaining} teams remaining. Run script again to continue.")
-        
+
         print(f"\n✅ Results saved to:")
-        print(f"   - {OUTPUT_DIR}/")
+        print(f"   - {args.output_dir}/")
         print(f"   - {MAPPING_FILE}")
         print(f"   - {CACHE_FILE} (cache)")
 
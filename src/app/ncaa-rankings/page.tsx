@@ -9,6 +9,7 @@ import { Input } from "@/components/ui/input";
 import { Button } from "@/components/ui/button";
 import LogoBadge from "@/components/LogoBadge";
 import NCAALogo from "@/components/NCAALogo";
+import rankingsLogos from "@/data/logo-assets/ncaa-rankings.json";
 import { ChevronUp, ChevronDown } from "lucide-react";
 
 type Ranking = {
@@ -454,7 +455,7 @@ export default function RankingsPage() {
                           <td style={TD}>
                             <div style={{ display: "flex", alignItems: "center", gap: 6 }}>
                               <Link href={`/ncaa-team/${encodeURIComponent(team.team)}`} style={{ display: "flex", alignItems: "center", gap: 8, color: "#1a1a1a", fontWeight: 600, fontSize: 13 }} className="hover:underline">
-                                <NCAALogo teamName={team.team} size={26} />
+                                <NCAALogo teamName={team.team} size={26} assets={rankingsLogos} />
                                 <span style={{ overflow: "hidden", textOverflow: "ellipsis", whiteSpace: "nowrap" }}>{team.team}</span>
                               </Link>
                               <RankMovement current={team.model_rank} previous={team.prev_rank} />
@@ -6,8 +6,8 @@ import { notFound } from "next/navigation";
 import LogoBadge from "@/components/LogoBadge";
 import NCAALogo from "@/components/NCAALogo";
 import rankings from "@/data/rankings/rankings.json";
-import scoresRaw from "@/data/ncaa-team/ncaa-scores.json";
 import seedingData from "@/data/seeding/seeding.json";
+import { useShard } from "@/lib/dataShards";
 
 type RankingRow = {
   team: string;
@@ -62,14 +62,23 @@ type GameRow = {
   opp_score: number | null;
 };
 
-const normalizeTeamName = (name: string): string => {
-  const nameMap: Record<string, string> = {
-    "BYU": "Brigham Young",
-    "UConn": "Uconn",
-    "Mississippi St.": "Mississippi State",
-      "McNeese": "McNeese State"
-  };
-  return nameMap[name] || name;
+const nameMap: Record<string, string> = {
+  "BYU": "Brigham Young",
+  "UConn": "Uconn",
+  "Mississippi St.": "Mississippi State",
+  "McNeese": "McNeese State"
+};
+
+const normalizeTeamName = (name: string): string => nameMap[name] || name;
+
+// ncaa-scores shards are keyed by the scores file's own spelling, so load every
+// spelling that normalizes to this team ("McNeese State" -> "McNeese" shard too)
+const teamSpellings = (name: string): string[] => {
+  const normalized = normalizeTeamName(name).toLowerCase();
+  const spellings = [name, normalizeTeamName(name), ...Object.keys(nameMap).filter(
+    (k) => nameMap[k].toLowerCase() === normalized
+  )];
+  return Array.from(new Set(spellings.map((s) => s.toLowerCase())));
 };
 
 const rankMap = new Map(
@@ -168,12 +177,13 @@ export default function TeamClient({ params }: { params: { team: string } }) {
   }, [teamName]);
 
   console.log("[TEAM]", teamName, "→", normalizeTeamName(teamName));
-console.log("[SCORES SAMPLE]", (scoresRaw as RawScoreRow[]).slice(0, 5).map(g => [g.homeTeam, g.awayTeam]));
+
+const scoresRaw = useShard<RawScoreRow>("ncaa-scores", "teams", teamSpellings(teamName));
 
 const games = useMemo<GameRow[]>(() => {
   const normalizedInput = normalizeTeamName(teamName).toLowerCase();  // ADD THIS
   const teamGames: GameRow[] = [];
-  (scoresRaw as RawScoreRow[]).forEach((game) => {
+  (scoresRaw ?? []).forEach((game) => {
     const isHome = normalizeTeamName(game.homeTeam).toLowerCase() === normalizedInput;  // CHANGE
     const isAway = normalizeTeamName(game.awayTeam).toLowerCase() === normalizedInput;  // CHANGE
     if (!isHome && !isAway) return;
@@ -197,7 +207,7 @@ const games = useMemo<GameRow[]>(() => {
       });
     });
     return teamGames.sort((a, b) => new Date(b.date).getTime() - new Date(a.date).getTime());
-  }, [teamName]);
+  }, [teamName, scoresRaw]);
 
   const today = new Date().toLocaleDateString("en-CA"); // YYYY-MM-DD
 
@@ -438,7 +448,7 @@ const games = useMemo<GameRow[]>(() => {
                     {playedGames.length === 0 && (
                       <tr>
                         <td colSpan={6} style={{ ...TD, textAlign: "center", color: "#78716c", fontStyle: "italic", padding: "32px 0" }}>
-                          No completed games.
+                          {scoresRaw === null ? "Loading schedule…" : "No completed games."}
                         </td>
                       </tr>
                     )}
@@ -9,6 +9,7 @@ import games from "@/data/betting-lines/games.json";
 import injuryData from "@/data/betting-lines/injuries.json";
 import LogoBadge from "@/components/LogoBadge";
 import NCAALogo from "@/components/NCAALogo";
+import picksLogos from "@/data/logo-assets/ncaa-picks.json";
 import EdgePerformanceGraph, { BASKETBALL_EDGE_CATEGORIES } from "@/components/EdgePerformanceGraph";
 import { AuthProvider, useAuth } from "../AuthContext";
 import { doc, getDoc } from "firebase/firestore";
@@ -1513,7 +1514,7 @@ function BettingLinesPageContent() {
 
                           <td style={{ ...TD, paddingLeft: 16 }}>
                             <Link href={`/ncaa-team/${encodeURIComponent(awayStr)}`} style={{ display: "flex", alignItems: "center", gap: 8, color: "#4a6fa5" }} className="hover:underline">
-                              <NCAALogo teamName={awayStr} size={22} />
+                              <NCAALogo teamName={awayStr} size={22} assets={picksLogos} />
                               <div style={{ display: "flex", flexDirection: "column", gap: 2 }}>
                                 <span style={{ fontSize: 13, fontWeight: 500 }}>{g.away}</span>
                                 <div style={{ display: "flex", alignItems: "center", gap: 4 }}>
@@ -1526,7 +1527,7 @@ function BettingLinesPageContent() {
 
                           <td style={TD}>
                             <Link href={`/ncaa-team/${encodeURIComponent(homeStr)}`} style={{ display: "flex", alignItems: "center", gap: 8, color: "#4a6fa5" }} className="hover:underline">
-                              <NCAALogo teamName={homeStr} size={22} />
+                              <NCAALogo teamName={homeStr} size={22} assets={picksLogos} />
                               <div style={{ display: "flex", flexDirection: "column", gap: 2 }}>
                                 <span style={{ fontSize: 13, fontWeight: 500 }}>{g.home}</span>
                                 <div style={{ display: "flex", alignItems: "center", gap: 4 }}>
@@ -1547,7 +1548,7 @@ function BettingLinesPageContent() {
                               <td style={TD}>
                                 {g.bbmiPick && (
                                   <Link href={`/ncaa-team/${encodeURIComponent(String(g.bbmiPick))}`} style={{ display: "flex", alignItems: "center", gap: 6, color: "#4a6fa5" }} className="hover:underline">
-                                    <NCAALogo teamName={String(g.bbmiPick)} size={18} />
+                                    <NCAALogo teamName={String(g.bbmiPick)} size={18} assets={picksLogos} />
                                     <span style={{ fontSize: 13, fontWeight: 600 }}>{g.bbmiPick}</span>
                                   </Link>
                                 )}
@@ -1677,13 +1678,13 @@ function BettingLinesPageContent() {
                           </td>
                           <td style={{ ...TD, paddingLeft: 16 }}>
                             <Link href={`/ncaa-team/${encodeURIComponent(awayStr)}`} style={{ display: "flex", alignItems: "center", gap: 8, color: "#9ca3af" }}>
-                              <NCAALogo teamName={awayStr} size={22} />
+                              <NCAALogo teamName={awayStr} size={22} assets={picksLogos} />
                               <span style={{ fontSize: 13, fontWeight: 500 }}>{g.away}</span>
                             </Link>
                           </td>
                           <td style={TD}>
                             <Link href={`/ncaa-team/${encodeURIComponent(homeStr)}`} style={{ display: "flex", alignItems: "center", gap: 8, color: "#9ca3af" }}>
-                              <NCAALogo teamName={homeStr} size={22} />
+                              <NCAALogo teamName={homeStr} size={22} assets={picksLogos} />
                               <span style={{ fontSize: 13, fontWeight: 500 }}>{g.home}</span>
                             </Link>
                           </td>
@@ -1845,7 +1846,7 @@ function BettingLinesPageContent() {
                               <td style={{ ...TD, textAlign: "center", fontSize: 12, fontWeight: 600, color: "#57534e" }}>{dateDisplay}</td>
                               <td style={{ ...TD, paddingLeft: 8 }}>
                                 <Link href={`/ncaa-team/${encodeURIComponent(awayStr)}`} style={{ display: "flex", alignItems: "center", gap: 8, color: "#4a6fa5" }} className="hover:underline">
-                                  <NCAALogo teamName={awayStr} size={22} />
+                                  <NCAALogo teamName={awayStr} size={22} assets={picksLogos} />
                                   <div style={{ display: "flex", flexDirection: "column", gap: 2 }}>
                                     <span style={{ fontSize: 13, fontWeight: 500 }}>{g.away}</span>
                                     <div style={{ display: "flex", alignItems: "center", gap: 4 }}>
@@ -1856,7 +1857,7 @@ function BettingLinesPageContent() {
                               </td>
                               <td style={TD}>
                                 <Link href={`/ncaa-team/${encodeURIComponent(homeStr)}`} style={{ display: "flex", alignItems: "center", gap: 8, color: "#4a6fa5" }} className="hover:underline">
-                                  <NCAALogo teamName={homeStr} size={22} />
+                                  <NCAALogo teamName={homeStr} size={22} assets={picksLogos} />
                                   <div style={{ display: "flex", flexDirection: "column", gap: 2 }}>
                                     <span style={{ fontSize: 13, fontWeight: 500 }}>{g.home}</span>
                                     <div style={{ display: "flex", alignItems: "center", gap: 4 }}>
@@ -1890,7 +1891,7 @@ function BettingLinesPageContent() {
                                   <td style={TD}>
                                     {pickStr && (
                                       <Link href={`/ncaa-team/${encodeURIComponent(pickStr)}`} style={{ display: "flex", alignItems: "center", gap: 6, color: "#4a6fa5" }} className="hover:underline">
-                                        <NCAALogo teamName={pickStr} size={18} />
+                                        <NCAALogo teamName={pickStr} size={18} assets={picksLogos} />
                                         <span style={{ fontSize: 13, fontWeight: 600 }}>{pickStr}</span>
                                       </Link>
                                     )}
@@ -7,6 +7,7 @@ import Link from "next/link";
 import { ChevronUp, ChevronDown } from "lucide-react";
 import wiaaData from "@/data/wiaa-rankings/WIAArankings-with-slugs.json";
 import TeamLogo from "@/components/TeamLogo";
+import rankingsLogos from "@/data/logo-assets/wiaa-rankings.json";
 
 type WIAARow = {
   division: number;
@@ -491,7 +492,7 @@ export default function WIAARankingsPage() {
                         }}>
                           <div style={{ display: "flex", alignItems: "center", gap: 8, minWidth: 0 }}>
                             <div style={{ width: 28, flexShrink: 0, display: "flex", justifyContent: "center" }}>
-                              <TeamLogo slug={row.slug} size={26} />
+                              <TeamLogo slug={row.slug} size={26} assets={rankingsLogos} />
                             </div>
                             <Link
                               href={`/wiaa-team/${encodeURIComponent(row.team)}`}
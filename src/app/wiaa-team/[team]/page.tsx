@@ -4,8 +4,8 @@ import { use, useMemo, useState } from "react";
 import Link from "next/link";
 import { notFound } from "next/navigation";
 import TeamLogo from "@/components/TeamLogo";
+import { useShard } from "@/lib/dataShards";
 import rankings from "@/data/wiaa-rankings/WIAArankings-with-slugs.json";
-import scheduleRaw from "@/data/wiaa-team/wiaa-scores.json";
 
 import tournamentD1 from "@/data/wiaa-seeding/wiaa-d1-bracket.json";
 import tournamentD2 from "@/data/wiaa-seeding/wiaa-d2-bracket.json";
@@ -229,6 +229,8 @@ export default function TeamPage({
 }) {
   const { team } = use(params);
   const teamName = decodeURIComponent(team);
+  // Only this team's rows (built by build-data-shards.py), not the whole season file
+  const scheduleRaw = useShard<RawGameRow>("wiaa-scores", "teams", teamName);
 
   const teamInfo = useMemo(() => {
     return (rankings as RankingRow[]).find(
@@ -256,7 +258,7 @@ export default function TeamPage({
   }, [teamName, teamInfo.division]);
 
   const normalizedGames = useMemo<GameRow[]>(() => {
-    return (scheduleRaw as RawGameRow[]).map((g) => ({
+    return (scheduleRaw ?? []).map((g) => ({
       team: g.team,
       team_div: Number(g.teamDiv),
       date: g.date,
@@ -269,7 +271,7 @@ export default function TeamPage({
       teamline: g.teamLine,
       teamwinpct: g.teamWinPct,
     }));
-  }, []);
+  }, [scheduleRaw]);
 
   const games = useMemo(() => {
     return normalizedGames.filter(
@@ -597,7 +599,7 @@ export default function TeamPage({
                   {playedGames.length === 0 && (
                     <tr>
                       <td colSpan={7} style={{ ...TD, textAlign: "center", color: "#78716c", fontStyle: "italic", padding: "32px 0" }}>
-                        No completed games.
+                        {scheduleRaw === null ? "Loading schedule…" : "No completed games."}
                       </td>
                     </tr>
                   )}
@@ -2,6 +2,7 @@
 
 import React, { useMemo } from "react";
 import NCAALogo from "@/components/NCAALogo";
+import bracketLogos from "@/data/logo-assets/ncaa-bracket.json";
 import tournamentResultsRaw from "@/data/seeding/tournament-results.json";
 
 // ── Types ─────────────────────────────────────────────────────────────────────
@@ -212,7 +213,7 @@ function BracketMatchupSlot({
           <span style={{ fontSize: 8, fontWeight: 700, color: "#94a3b8", minWidth: 12, textAlign: "right", flexShrink: 0 }}>
             {teamData?.seed ?? ""}
           </span>
-          <NCAALogo teamName={team} size={11} />
+          <NCAALogo teamName={team} size={11} assets={bracketLogos} />
           <span style={{ fontSize: 9.5, fontWeight: isPicked ? 700 : 500, color: fg, overflow: "hidden", textOverflow: "ellipsis", whiteSpace: "nowrap", flex: 1, textDecoration: strikeThrough ? "line-through" : "none" }}>
             {team}
           </span>
@@ -288,7 +289,7 @@ function PlayInTeamRow({ team, winner, actual }: { team: BracketTeam; winner: st
       padding: "0 4px", backgroundColor: bg, borderBottom: "1px solid #f1f5f9",
     }}>
       <span style={{ fontSize: 9, fontWeight: 700, color: "#94a3b8", minWidth: 13, textAlign: "right", flexShrink: 0 }}>{team.seed}</span>
-      <NCAALogo teamName={team.name} size={11} />
+      <NCAALogo teamName={team.name} size={11} assets={bracketLogos} />
       <span style={{ fontSize: 9.5, fontWeight: isPicked ? 700 : 500, color: fg, overflow: "hidden", textOverflow: "ellipsis", whiteSpace: "nowrap", flex: 1 }}>
         {team.name}
       </span>
@@ -529,7 +530,7 @@ function ChampSlot({ team, pickKey, allTeams, eliminatedTeams }: {
       {team ? (
         <>
           <span style={{ fontSize: 9, fontWeight: 700, color: "#94a3b8", minWidth: 13, textAlign: "right" }}>{td?.seed}</span>
-          <NCAALogo teamName={team} size={13} />
+          <NCAALogo teamName={team} size={13} assets={bracketLogos} />
           <span style={{ fontSize: 11.5, fontWeight: 700, color: fg, whiteSpace: "nowrap", textDecoration: isBusted ? "line-through" : "none" }}>{team}</span>
           {correct && <span style={{ fontSize: 9, color: "#16a34a" }}>✓</span>}
           {(wrong || isBusted) && <span style={{ fontSize: 9, color: "#dc2626" }}>✗</span>}
@@ -776,7 +777,7 @@ export default function BracketView({
                   const isChampBusted = !!champElimRound;
                   return (
                     <div style={{ display: "flex", alignItems: "center", justifyContent: "center", gap: 6, marginTop: 4 }}>
-                      <NCAALogo teamName={champ} size={22} />
+                      <NCAALogo teamName={champ} size={22} assets={bracketLogos} />
                       <div style={{ textAlign: "left" }}>
                         <div style={{ fontSize: 9, color: "#94a3b8", fontWeight: 700 }}>
                           #{allTeams.find(t => t.name === champ)?.seed}
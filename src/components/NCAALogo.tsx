@@ -1,17 +1,23 @@
 import Image from 'next/image';
 import logoMapping from '@/data/ncaa-logo-mapping.json';
+import { logoSpriteStyle, pickLogoVariant, type LogoPageAssets } from '@/lib/logoAssets';
 
 type NCAALogoProps = {
   teamName: string;
   size?: number;
   className?: string;
+  // The page's built logo assets (src/data/logo-assets, see build-logo-assets.py)
+  assets?: LogoPageAssets;
 };
 
-export default function NCAALogo({ teamName, size = 40, className = '' }: NCAALogoProps) {
+// filename / path are cleared when the logo file is deleted (update-logo-mapping.py)
+type NCAALogoEntry = { filename?: string; path?: string };
+
+export default function NCAALogo({ teamName, size = 40, className = '', assets }: NCAALogoProps) {
   // Get logo info from mapping
-  const logoInfo = logoMapping[teamName as keyof typeof logoMapping];
+  const logoInfo = (logoMapping as Record<string, NCAALogoEntry>)[teamName];
   
-  if (!logoInfo) {
+  if (!logoInfo?.path) {
     // Fallback: Show team initials
     const initials = teamName
       .split(' ')
@@ -31,9 +37,14 @@ export default function NCAALogo({ teamName, size = 40, className = '' }: NCAALo
     );
   }
   
+  const spriteStyle = logoSpriteStyle(assets, teamName, logoInfo.filename, size);
+  if (spriteStyle) {
+    return <span role="img" aria-label={`${teamName} logo`} className={className} title={teamName} style={spriteStyle} />;
+  }
+
   return (
     <Image
-      src={logoInfo.path}
+      src={pickLogoVariant(assets, teamName, logoInfo.filename, size) ?? logoInfo.path}
       alt={`${teamName} logo`}
       width={size}
       height={size}
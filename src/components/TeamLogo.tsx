@@ -3,17 +3,23 @@
 import Image from "next/image";
 import ncaaLogoMapping from "@/data/ncaa-logo-mapping.json";
 import wiaaLogoMapping from "@/data/wiaa-logo-mapping.json";
+import { logoSpriteStyle, pickLogoVariant, type LogoPageAssets } from "@/lib/logoAssets";
 
 type TeamLogoProps = {
   slug: string;
   size?: number;
   league?: "ncaa" | "wiaa";
+  // The page's built logo assets (src/data/logo-assets, see build-logo-assets.py)
+  assets?: LogoPageAssets;
 };
 
+type LogoEntry = { filename?: string };
+
 export default function TeamLogo({ 
   slug, 
   size = 28,
-  league = "wiaa"  // Default to WIAA
+  league = "wiaa",  // Default to WIAA
+  assets
 }: TeamLogoProps) {
   if (!slug) return null;
 
@@ -21,7 +27,7 @@ export default function TeamLogo({
   let mappedSlug = slug;
   
   if (league === "ncaa") {
-    const mapping = ncaaLogoMapping as Record<string, { filename?: string }>;
+    const mapping = ncaaLogoMapping as Record<string, LogoEntry>;
     const teamData = mapping[slug];
     if (teamData && typeof teamData === 'object' && teamData.filename) {
       mappedSlug = teamData.filename.replace('.png', '');
@@ -29,11 +35,22 @@ export default function TeamLogo({
       mappedSlug = slug;
     }
   } else if (league === "wiaa") {
-    const mapping = wiaaLogoMapping as Record<string, string>;
-    mappedSlug = mapping[slug] || slug;
+    // Entries are either a plain filename stem or a {filename} object
+    const mapping = wiaaLogoMapping as unknown as Record<string, string | LogoEntry>;
+    const entry = mapping[slug];
+    if (typeof entry === "string") {
+      mappedSlug = entry;
+    } else if (entry) {
+      mappedSlug = entry.filename ? entry.filename.replace('.png', '') : slug;
+    }
+  }
+
+  const spriteStyle = logoSpriteStyle(assets, slug, `${mappedSlug}.png`, size);
+  if (spriteStyle) {
+    return <span role="img" aria-label={`${slug} logo`} style={spriteStyle} />;
   }
 
-  const logoPath = `/logos/${league}/${mappedSlug}.png`;
+  const logoPath = pickLogoVariant(assets, slug, `${mappedSlug}.png`, size) ?? `/logos/${league}/${mappedSlug}.png`;
 
   return (
     <Image
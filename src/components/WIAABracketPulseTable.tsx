@@ -14,6 +14,7 @@
 import React, { useMemo } from "react";
 import Link from "next/link";
 import TeamLogo from "@/components/TeamLogo";
+import bracketLogos from "@/data/logo-assets/wiaa-bracket.json";
 
 import rankingsData from "@/data/wiaa-rankings/WIAArankings-with-slugs.json";
 import d1Data from "@/data/wiaa-seeding/wiaa-d1-bracket.json";
@@ -291,7 +292,7 @@ function TeamSlot({
         }}
         className="group"
       >
-        <TeamLogo slug={team.slug} size={16} />
+        <TeamLogo slug={team.slug} size={16} assets={bracketLogos} />
         <strong style={{ fontSize: 10.5, flexShrink: 0, color: seedColor, minWidth: 18 }}>
           #{overrideSeed ?? team.WIAASeed}
         </strong>
@@ -10,6 +10,8 @@ Usage: python compare_predictions.py
 """
 import json, os, sys
 
+import numpy as np
+
 sys.stdout.reconfigure(encoding='utf-8')
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -19,6 +21,10 @@ NCAA_PRE_DIR = os.path.join(SCRIPT_DIR, "ncaa")
 WIAA_CUR_DIR = os.path.normpath(os.path.join(DATA_DIR, "wiaa-seeding"))
 NCAA_CUR_FILE = os.path.normpath(os.path.join(DATA_DIR, "seeding", "seeding.json"))
 
+sys.path.insert(0, os.path.normpath(os.path.join(DATA_DIR, "..", "scripts")))
+from bbmi_metrics import brier
+from team_registry import load_registry
+
 
 # ── WIAA Analysis ─────────────────────────────────────────────────
 
@@ -164,6 +170,89 @@ def analyze_wiaa():
             print(f"  {display:20s}  {total_correct}/{total_total}  ({total_correct/total_total*100:.1f}%)")
 
 
+def score_wiaa_division(pre_data, cur_data):
+    """Additive per-round counts (correct/total, Brier sum/n) for one WIAA division snapshot."""
+    cur_by_team = {t["Team"]: t for t in cur_data}
+    rows = [t for t in pre_data if t["Team"] in cur_by_team]
+    rounds = {}
+    for pre_key, cur_key in WIAA_ROUND_MAP.items():
+        pred = np.array([float(t.get(pre_key, 0) or 0) for t in rows], dtype=float)
+        adv = np.array([1.0 if cur_by_team[t["Team"]].get(cur_key, 0) == 1.0 else 0.0 for t in rows])
+        rounds[WIAA_ROUND_DISPLAY[pre_key]] = {
+            "correct": int(((pred >= 0.5) == (adv == 1.0)).sum()),
+            "total": len(rows),
+            "brier_sum": float(((pred - adv) ** 2).sum()),
+        }
+    return rounds
+
+
+def ncaa_by_team(cur_data):
+    """Current NCAA seeding keyed by team-registry ID, so spellings need not match."""
+    reg = load_registry()
+    return {reg.key(t["Team"]): t for t in cur_data}
+
+
+def build_round_index(pre_data, cur_by_team):
+    """
+    Normalize a seeding snapshot and the current seeding into aligned
+    teams x rounds arrays in one pass.
+
+    Returns a dict with:
+      teams, seeds  — per-row team name / pre-tournament seed
+      pred          — predicted probability to reach each round
+      advanced      — 1.0 where the team reached the round
+      decided       — True where the round's outcome is known for the team
+                      (advanced, eliminated in an earlier round, or lost in a
+                      round that has already produced winners)
+    `cur_by_team` is keyed by registry ID (see ncaa_by_team).
+    Teams missing from the current seeding are dropped.
+    """
+    reg = load_registry()
+    round_keys = [k for k, _ in NCAA_ROUNDS]
+    keys = [reg.key(t["Team"]) for t in pre_data]
+    rows = [t for t, key in zip(pre_data, keys) if key in cur_by_team]
+    cur_rows = [cur_by_team[key] for key in keys if key in cur_by_team]
+
+    pred = np.array([[float(t.get(k, 0)) for k in round_keys] for t in rows], dtype=float)
+    actual = np.array([[float(c.get(k, 0)) for k in round_keys] for c in cur_rows], dtype=float)
+    pred = pred.reshape(len(rows), len(round_keys))
+    actual = actual.reshape(len(rows), len(round_keys))
+
+    advanced = actual == 1.0
+    zero = actual == 0.0
+    # A 0.0 in any earlier round means the team was already eliminated
+    prior_zero = np.zeros_like(zero)
+    prior_zero[:, 1:] = np.logical_or.accumulate(zero, axis=1)[:, :-1]
+    # A round has been played once any team has a 1.0 in it
+    round_started = advanced.any(axis=0)
+    # Fractional values are updated predictions, not results
+    decided = advanced | (zero & (prior_zero | round_started[None, :]))
+
+    return {
+        "teams": [t["Team"] for t in rows],
+        "seeds": [t.get("CurrentSeed", "?") for t in rows],
+        "pred": pred,
+        "advanced": advanced.astype(float),
+        "decided": decided,
+    }
+
+
+def score_ncaa(pre_data, cur_data):
+    """Additive per-round counts (correct/total, Brier sum/n) for one NCAA snapshot."""
+    idx = build_round_index(pre_data, ncaa_by_team(cur_data))
+    rounds = {}
+    for r, (_, display) in enumerate(NCAA_ROUNDS):
+        decided = idx["decided"][:, r]
+        pred = idx["pred"][decided, r]
+        adv = idx["advanced"][decided, r]
+        rounds[display] = {
+            "correct": int(((pred >= 0.5) == (adv == 1.0)).sum()),
+            "total": int(decided.sum()),
+            "brier_sum": float(((pred - adv) ** 2).sum()),
+        }
+    return rounds
+
+
 def analyze_ncaa():
     print(f"\n\n{'=' * 80}")
     print(f"  NCAA TOURNAMENT — PREDICTION vs ACTUAL (In Progress)")
@@ -176,128 +265,50 @@ def analyze_ncaa():
     with open(NCAA_CUR_FILE) as f:
         cur_data = json.load(f)
 
-    cur_by_team = {t["Team"]: t for t in cur_data}
+    idx = build_round_index(pre_data, ncaa_by_team(cur_data))
 
-    for round_key, display in NCAA_ROUNDS:
-        predicted_yes = 0
-        actual_yes = 0
-        actual_no = 0
-        correct = 0
-        total_decided = 0
-        still_alive = 0
-        calibration_sum = 0.0
-        calibration_actual = 0
-
-        details = []
-
-        for team in pre_data:
-            name = team["Team"]
-            cur_team = cur_by_team.get(name)
-            if not cur_team:
-                continue
-
-            pred_prob = float(team.get(round_key, 0))
-            actual_val = cur_team.get(round_key, 0)
-            if isinstance(actual_val, str):
-                actual_val = float(actual_val)
-
-            if actual_val == 1.0:
-                actual_yes += 1
-                actual_binary = 1
-            elif actual_val == 0.0:
-                # Check if they were eliminated or just haven't played yet
-                # If a prior round is 0, they were eliminated before this round
-                prior_eliminated = False
-                for prior_key, _ in NCAA_ROUNDS:
-                    if prior_key == round_key:
-                        break
-                    prior_val = cur_team.get(prior_key, 0)
-                    if isinstance(prior_val, str):
-                        prior_val = float(prior_val)
-                    if prior_val == 0.0:
-                        prior_eliminated = True
-                        break
-
-                if prior_eliminated:
-                    actual_binary = 0
-                    actual_no += 1
-                else:
-                    # Check if current round has any 1.0s (round has started)
-                    # If no teams have 1.0 for this round, it hasn't been played
-                    any_decided = any(
-                        (cur_by_team.get(t["Team"], {}).get(round_key, 0) == 1.0 or
-                         (isinstance(cur_by_team.get(t["Team"], {}).get(round_key, 0), str) and
-                          float(cur_by_team.get(t["Team"], {}).get(round_key, 0)) == 1.0))
-                        for t in pre_data if cur_by_team.get(t["Team"])
-                    )
-                    if any_decided:
-                        # Round has started, this team lost
-                        actual_binary = 0
-                        actual_no += 1
-                    else:
-                        # Round not yet played
-                        still_alive += 1
-                        continue
-            else:
-                # Fractional value = updated prediction, not a result
-                still_alive += 1
-                continue
-
-            total_decided += 1
-            if pred_prob >= 0.5:
-                predicted_yes += 1
-
-            if (pred_prob >= 0.5 and actual_binary == 1) or (pred_prob < 0.5 and actual_binary == 0):
-                correct += 1
-
-            if actual_binary == 1:
-                calibration_sum += pred_prob
-                calibration_actual += 1
-                details.append((name, team.get("CurrentSeed", "?"), pred_prob, "✓ ADVANCED"))
-            elif pred_prob >= 0.5:
-                details.append((name, team.get("CurrentSeed", "?"), pred_prob, "✗ ELIMINATED"))
+    for r, (round_key, display) in enumerate(NCAA_ROUNDS):
+        decided = idx["decided"][:, r]
+        pred = idx["pred"][:, r]
+        adv = idx["advanced"][:, r] == 1.0
 
+        total_decided = int(decided.sum())
         if total_decided == 0:
             print(f"\n  {display:20s}  Not yet played")
             continue
 
+        pick_yes = pred >= 0.5
+        correct = int((decided & (pick_yes == adv)).sum())
+        actual_yes = int(adv.sum())
+        actual_no = int((decided & ~adv).sum())
+        still_alive = int((~decided).sum())
         accuracy = correct / total_decided * 100
-        avg_pred = calibration_sum / calibration_actual if calibration_actual else 0
+        avg_pred = float(pred[adv].mean()) if actual_yes else 0
 
         print(f"\n  {display:20s}  Accuracy: {accuracy:5.1f}%  ({correct}/{total_decided})")
         print(f"    Advanced: {actual_yes}  |  Eliminated: {actual_no}  |  Still TBD: {still_alive}")
-        if calibration_actual:
+        if actual_yes:
             print(f"    Avg predicted prob for teams that advanced: {avg_pred:.3f}")
 
         # Show notable results
-        details.sort(key=lambda x: -x[2])
         if display in ("Sweet 16", "Elite 8", "Final Four", "Championship", "Champion"):
+            notable = np.flatnonzero(adv | (decided & pick_yes))
+            notable = notable[np.argsort(-pred[notable], kind="stable")]
             print(f"    {'Team':30s} {'Seed':>4s}  {'Predicted':>9s}  Result")
-            for name, seed, prob, result in details:
-                print(f"    {name:30s} {str(seed):>4s}  {prob:8.1%}   {result}")
+            for i in notable:
+                result = "✓ ADVANCED" if adv[i] else "✗ ELIMINATED"
+                print(f"    {idx['teams'][i]:30s} {str(idx['seeds'][i]):>4s}  {pred[i]:8.1%}   {result}")
 
     # Brier score for calibration
     print(f"\n{'─' * 80}")
     print(f"  CALIBRATION CHECK (Brier Score — lower is better)")
     print(f"{'─' * 80}")
-    for round_key, display in NCAA_ROUNDS:
-        brier_sum = 0
-        n = 0
-        for team in pre_data:
-            name = team["Team"]
-            cur_team = cur_by_team.get(name)
-            if not cur_team:
-                continue
-            pred = float(team.get(round_key, 0))
-            actual_val = cur_team.get(round_key, 0)
-            if isinstance(actual_val, str):
-                actual_val = float(actual_val)
-            if actual_val in (0.0, 1.0):
-                brier_sum += (pred - actual_val) ** 2
-                n += 1
+    for r, (round_key, display) in enumerate(NCAA_ROUNDS):
+        decided = idx["decided"][:, r]
+        n = int(decided.sum())
         if n:
-            brier = brier_sum / n
-            print(f"  {display:20s}  Brier: {brier:.4f}  (n={n})")
+            score = brier(idx["pred"][decided, r], idx["advanced"][decided, r])
+            print(f"  {display:20s}  Brier: {score:.4f}  (n={n})")
 
 
 def main():
@@ -0,0 +1,220 @@
+"""
+Pre-Tournament Snapshot Leaderboard
+====================================
+Scores every dated pre-tournament snapshot in this folder against its final
+tournament results and writes a consolidated accuracy-over-time leaderboard.
+
+Snapshots are discovered by filename:
+  ncaa/seeding-YYYYMMDD.json
+  wiaa/wiaa-dN-bracket-YYYYMMDD.json
+
+Final results for a snapshot's season (the YYYY of its date) are read from
+  ncaa/final/seeding-YYYY.json
+  wiaa/final/wiaa-dN-bracket-YYYY.json
+when archived, otherwise the live files (src/data/seeding/seeding.json and
+src/data/wiaa-seeding/wiaa-dN-bracket.json) are used for the latest season.
+
+Each snapshot is scored in a separate process. Metrics are cached in
+.eval-cache.json keyed by the SHA-256 of the snapshot and results files (and
+of team-registry.json for NCAA, which decides how names join), so a re-run
+only scores snapshots that are new or whose inputs changed.
+
+Usage: python evaluate_snapshots.py [--workers N] [--output leaderboard.json]
+"""
+import argparse, hashlib, json, os, re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from compare_predictions import (
+    SCRIPT_DIR, WIAA_PRE_DIR, NCAA_PRE_DIR, WIAA_CUR_DIR, NCAA_CUR_FILE,
+    NCAA_ROUNDS, WIAA_ROUND_DISPLAY, score_ncaa, score_wiaa_division,
+)
+from artifact_writer import write_json  # src/scripts is on sys.path via compare_predictions
+from team_registry import REGISTRY_FILE
+
+CACHE_FILE = os.path.join(SCRIPT_DIR, ".eval-cache.json")
+LEADERBOARD_FILE = os.path.join(SCRIPT_DIR, "leaderboard.json")
+
+NCAA_SNAPSHOT_RE = re.compile(r"^seeding-(\d{8})\.json$")
+WIAA_SNAPSHOT_RE = re.compile(r"^wiaa-d(\d)-bracket-(\d{8})\.json$")
+
+
+# ── Discovery ─────────────────────────────────────────────────────
+
+def discover_snapshots():
+    """Return scoring units: one per snapshot file, paired with its results file."""
+    units = []
+
+    ncaa_files = sorted(f for f in os.listdir(NCAA_PRE_DIR) if NCAA_SNAPSHOT_RE.match(f))
+    latest = max((NCAA_SNAPSHOT_RE.match(f).group(1)[:4] for f in ncaa_files), default=None)
+    for f in ncaa_files:
+        date = NCAA_SNAPSHOT_RE.match(f).group(1)
+        season = date[:4]
+        archived = os.path.join(NCAA_PRE_DIR, "final", f"seeding-{season}.json")
+        results = archived if os.path.exists(archived) else (NCAA_CUR_FILE if season == latest else None)
+        if results:
+            units.append({"sport": "ncaa", "division": None, "date": date, "season": season,
+                          "snapshot": os.path.join(NCAA_PRE_DIR, f), "results": results})
+
+    wiaa_files = sorted(f for f in os.listdir(WIAA_PRE_DIR) if WIAA_SNAPSHOT_RE.match(f))
+    latest = max((WIAA_SNAPSHOT_RE.match(f).group(2)[:4] for f in wiaa_files), default=None)
+    for f in wiaa_files:
+        div, date = WIAA_SNAPSHOT_RE.match(f).groups()
+        season = date[:4]
+        archived = os.path.join(WIAA_PRE_DIR, "final", f"wiaa-d{div}-bracket-{season}.json")
+        live = os.path.join(WIAA_CUR_DIR, f"wiaa-d{div}-bracket.json")
+        results = archived if os.path.exists(archived) else (live if season == latest else None)
+        if results:
+            units.append({"sport": "wiaa", "division": int(div), "date": date, "season": season,
+                          "snapshot": os.path.join(WIAA_PRE_DIR, f), "results": results})
+
+    return units
+
+
+# ── Scoring ───────────────────────────────────────────────────────
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def unit_key(unit):
+    key = f"{file_hash(unit['snapshot'])}:{file_hash(unit['results'])}"
+    if unit["sport"] == "ncaa" and os.path.exists(REGISTRY_FILE):
+        key += f":{file_hash(REGISTRY_FILE)}"
+    return key
+
+
+def score_unit(unit):
+    """Worker: load one snapshot + its results and return per-round counts."""
+    with open(unit["snapshot"]) as f:
+        pre_data = json.load(f)
+    with open(unit["results"]) as f:
+        cur_data = json.load(f)
+    if unit["sport"] == "ncaa":
+        return score_ncaa(pre_data, cur_data)
+    return score_wiaa_division(pre_data, cur_data)
+
+
+def load_cache():
+    if os.path.exists(CACHE_FILE):
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    return {}
+
+
+def save_cache(cache):
+    tmp = CACHE_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp, CACHE_FILE)
+
+
+def score_all(units, workers=None):
+    """Score every unit, reusing cached metrics. Returns (metrics per unit, n scored)."""
+    cache = load_cache()
+    keys = [unit_key(u) for u in units]
+    todo = [i for i, k in enumerate(keys) if k not in cache]
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for i, rounds in zip(todo, pool.map(score_unit, [units[i] for i in todo])):
+                cache[keys[i]] = rounds
+
+    # Drop entries for files that no longer exist / changed
+    live = set(keys)
+    cache = {k: v for k, v in cache.items() if k in live}
+    save_cache(cache)
+    return [cache[k] for k in keys], len(todo)
+
+
+# ── Leaderboard ───────────────────────────────────────────────────
+
+def summarize(rounds, order):
+    out = {}
+    correct = total = 0
+    brier_sum = 0.0
+    for display in order:
+        r = rounds.get(display)
+        if not r or not r["total"]:
+            continue
+        out[display] = {
+            "accuracy": round(r["correct"] / r["total"] * 100, 1),
+            "correct": r["correct"],
+            "total": r["total"],
+            "brier": round(r["brier_sum"] / r["total"], 4),
+        }
+        correct += r["correct"]
+        total += r["total"]
+        brier_sum += r["brier_sum"]
+    return out, correct, total, brier_sum
+
+
+def build_leaderboard(units, metrics):
+    # WIAA divisions of the same date are combined into one snapshot entry
+    grouped = {}
+    for unit, rounds in zip(units, metrics):
+        entry = grouped.setdefault((unit["sport"], unit["date"]), {
+            "sport": unit["sport"], "season": unit["season"], "date": unit["date"],
+            "files": [], "rounds": {},
+        })
+        entry["files"].append(os.path.relpath(unit["snapshot"], SCRIPT_DIR).replace(os.sep, "/"))
+        for display, r in rounds.items():
+            acc = entry["rounds"].setdefault(display, {"correct": 0, "total": 0, "brier_sum": 0.0})
+            for k in acc:
+                acc[k] += r[k]
+
+    snapshots = []
+    for (sport, _), entry in sorted(grouped.items(), key=lambda kv: (kv[0][1], kv[0][0])):
+        order = [d for _, d in NCAA_ROUNDS] if sport == "ncaa" else list(WIAA_ROUND_DISPLAY.values())
+        rounds, correct, total, brier_sum = summarize(entry["rounds"], order)
+        snapshots.append({
+            "sport": sport,
+            "season": entry["season"],
+            "date": entry["date"],
+            "files": entry["files"],
+            "accuracy": round(correct / total * 100, 1) if total else None,
+            "brier": round(brier_sum / total, 4) if total else None,
+            "decided": total,
+            "rounds": rounds,
+        })
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "snapshots": snapshots,
+        "by_sport": {
+            sport: [{"date": s["date"], "accuracy": s["accuracy"], "brier": s["brier"]}
+                    for s in snapshots if s["sport"] == sport]
+            for sport in sorted({s["sport"] for s in snapshots})
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", default=LEADERBOARD_FILE)
+    args = parser.parse_args()
+
+    units = discover_snapshots()
+    print(f"  Found {len(units)} snapshot file(s) with results")
+    metrics, scored = score_all(units, args.workers)
+    print(f"  Scored {scored}, reused {len(units) - scored} from cache")
+
+    board = build_leaderboard(units, metrics)
+    write_json(args.output, board, indent=2)
+
+    print(f"\n  {'Sport':6s} {'Date':10s} {'Accuracy':>9s} {'Brier':>8s} {'Decided':>8s}")
+    print(f"  {'-' * 46}")
+    for s in board["snapshots"]:
+        acc = f"{s['accuracy']:.1f}%" if s["accuracy"] is not None else "—"
+        brier = f"{s['brier']:.4f}" if s["brier"] is not None else "—"
+        print(f"  {s['sport'].upper():6s} {s['date']:10s} {acc:>9s} {brier:>8s} {s['decided']:>8d}")
+    print(f"\n  Leaderboard written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
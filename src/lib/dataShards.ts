@@ -0,0 +1,76 @@
+import { useEffect, useState } from "react";
+
+// Per-team / per-date shards written by build-data-shards.py into public/data/shards/
+
+export type ShardEntry = {
+  path: string;
+  count: number;
+  hash: string;
+};
+
+export type ShardManifest = {
+  source: string;
+  sourceHash: string;
+  generated: string;
+  teams: Record<string, ShardEntry>;
+  dates: Record<string, ShardEntry>;
+};
+
+export type ShardKind = "teams" | "dates";
+
+const manifests = new Map<string, Promise<ShardManifest>>();
+
+function loadManifest(dataset: string): Promise<ShardManifest> {
+  let manifest = manifests.get(dataset);
+  if (!manifest) {
+    manifest = fetch(`/data/shards/${dataset}/manifest.json`).then((res) => {
+      if (!res.ok) throw new Error(`No shard manifest for ${dataset}`);
+      return res.json();
+    });
+    manifests.set(dataset, manifest);
+    manifest.catch(() => manifests.delete(dataset));
+  }
+  return manifest;
+}
+
+// Team names are matched case-insensitively, like the pages' own lookups
+function findEntry(section: Record<string, ShardEntry>, key: string): ShardEntry | undefined {
+  if (section[key]) return section[key];
+  const lower = key.toLowerCase();
+  const match = Object.keys(section).find((k) => k.toLowerCase() === lower);
+  return match ? section[match] : undefined;
+}
+
+// Rows for one team or date; [] when the key has no shard
+export async function loadShard<T>(dataset: string, kind: ShardKind, key: string): Promise<T[]> {
+  const manifest = await loadManifest(dataset);
+  const entry = findEntry(manifest[kind], key);
+  if (!entry) return [];
+  // The content hash busts caches whenever the shard is rewritten
+  const res = await fetch(`${entry.path}?v=${entry.hash}`);
+  if (!res.ok) throw new Error(`Failed to load ${entry.path}`);
+  return res.json();
+}
+
+// Rows of several keys (e.g. every spelling of a team), concatenated in key order
+export async function loadShards<T>(dataset: string, kind: ShardKind, keys: string[]): Promise<T[]> {
+  const parts = await Promise.all(keys.map((key) => loadShard<T>(dataset, kind, key)));
+  return parts.flat();
+}
+
+// null while loading, then the shard's rows ([] on a missing key or fetch error).
+// A key list loads and concatenates the shards of every key.
+export function useShard<T>(dataset: string, kind: ShardKind, key: string | string[]): T[] | null {
+  const [rows, setRows] = useState<T[] | null>(null);
+  const keys = Array.isArray(key) ? key : [key];
+  const keyList = keys.join("\n");
+  useEffect(() => {
+    let cancelled = false;
+    setRows(null);
+    loadShards<T>(dataset, kind, keyList.split("\n"))
+      .then((data) => { if (!cancelled) setRows(data); })
+      .catch(() => { if (!cancelled) setRows([]); });
+    return () => { cancelled = true; };
+  }, [dataset, kind, keyList]);
+  return rows;
+}
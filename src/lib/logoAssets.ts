@@ -0,0 +1,62 @@
+import type { CSSProperties } from "react";
+
+// Per-page manifests written by build-logo-assets.py to src/data/logo-assets/<league>-<page>.json.
+// A page imports its own manifest and passes it to NCAALogo / TeamLogo as `assets`.
+
+export type LogoPageEntry = {
+  file: string; // source logo the assets were built from
+  hash: string;
+  x: number;
+  y: number;
+};
+
+export type LogoPageAssets = {
+  build?: string;
+  sizes?: number[];
+  sprite?: { sheet: string; cell: number; width: number; height: number };
+  logos?: Record<string, LogoPageEntry>;
+};
+
+// Built entry for `key`, unless it was built from a different file than the mapping names now
+function builtLogo(assets: LogoPageAssets | undefined, key: string, file: string | undefined) {
+  const entry = assets?.logos?.[key];
+  return entry && (!file || entry.file === file) ? entry : undefined;
+}
+
+// Smallest built variant that is still sharp at `size` CSS px on a 2x screen
+export function pickLogoVariant(
+  assets: LogoPageAssets | undefined,
+  key: string,
+  file: string | undefined,
+  size: number
+): string | undefined {
+  const entry = builtLogo(assets, key, file);
+  const sizes = assets?.sizes;
+  if (!entry || !assets?.build || !sizes?.length) return undefined;
+  const best = sizes.find((s) => s >= size * 2) ?? sizes[sizes.length - 1];
+  return `${assets.build}/${entry.file.replace(/\.png$/, "")}-${best}.${entry.hash}.png`;
+}
+
+// Background style that shows the logo's cell of the page sprite sheet at `size` px,
+// or undefined when the logo is not on the sheet or would be upscaled
+export function logoSpriteStyle(
+  assets: LogoPageAssets | undefined,
+  key: string,
+  file: string | undefined,
+  size: number
+): CSSProperties | undefined {
+  const entry = builtLogo(assets, key, file);
+  const sprite = assets?.sprite;
+  if (!entry || !sprite || size * 2 > sprite.cell) return undefined;
+  const scale = size / sprite.cell;
+  return {
+    display: "inline-block",
+    flexShrink: 0,
+    width: size,
+    height: size,
+    backgroundImage: `url(${sprite.sheet})`,
+    backgroundRepeat: "no-repeat",
+    backgroundPosition: `-${entry.x * scale}px -${entry.y * scale}px`,
+    backgroundSize: `${sprite.width * scale}px ${sprite.height * scale}px`,
+  };
+}
@@ -0,0 +1,151 @@
+"""
+API Response Cache
+===================
+SQLite-backed cache for external API responses (TheSportsDB lookups etc.).
+
+  - every put() is its own small transaction, so checkpointing is O(1) and a
+    crash never loses more than the entry being written
+  - successful responses expire after `ttl` seconds, misses (None / failed
+    lookups) after the much shorter `negative_ttl`, so stale misses are
+    retried automatically
+  - total stored bytes (UTF-8 encoded key + JSON) are bounded by
+    `max_bytes`; least-recently-used rows are evicted first
+  - sizes are read before each DELETE in the same transaction rather than
+    with DELETE ... RETURNING, which needs SQLite 3.35+
+
+USAGE:
+  sys.path.insert(0, os.path.join(BASE, "src", "scripts"))
+  from api_cache import ApiCache
+
+  with ApiCache("logo-fetch-cache.sqlite", legacy_json="logo-fetch-cache.json") as cache:
+      data = cache.get(team_name)
+      if data is ApiCache.MISS:
+          data = fetch(team_name)
+          cache.put(team_name, data)
+"""
+import json
+import os
+import sqlite3
+import time
+
+DAY = 24 * 60 * 60
+
+
+class ApiCache:
+    MISS = object()  # returned by get() when there is no fresh entry
+
+    def __init__(self, path, ttl=90 * DAY, negative_ttl=1 * DAY, max_bytes=64 * 1024 * 1024,
+                 legacy_json=None):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_bytes = max_bytes
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT,"            # JSON text, NULL for a negative entry
+                " fetched_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL,"
+                " size INTEGER NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (accessed_at)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self.conn.execute("INSERT OR IGNORE INTO meta VALUES ('total_bytes', 0)")
+        if legacy_json and os.path.exists(legacy_json) and len(self) == 0:
+            self.import_json(legacy_json)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def __contains__(self, key):
+        return self.get(key) is not ApiCache.MISS
+
+    @property
+    def total_bytes(self):
+        return self.conn.execute("SELECT value FROM meta WHERE name = 'total_bytes'").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, key):
+        """Return the cached value (None for a cached miss) or ApiCache.MISS."""
+        row = self.conn.execute("SELECT value, fetched_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return ApiCache.MISS
+        value, fetched_at = row
+        ttl = self.ttl if value is not None else self.negative_ttl
+        if time.time() - fetched_at > ttl:
+            return ApiCache.MISS
+        with self.conn:
+            self.conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return None if value is None else json.loads(value)
+
+    def put(self, key, value, fetched_at=None):
+        """Store a response; None is stored as a negative (short-TTL) entry."""
+        text = None if value is None else json.dumps(value, separators=(",", ":"))
+        size = len(key.encode("utf-8")) + (len(text.encode("utf-8")) if text else 0)
+        now = time.time()
+        with self.conn:
+            old = self.conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key, text, now if fetched_at is None else fetched_at, now, size),
+            )
+            self._add_bytes(size - (old[0] if old else 0))
+            self._evict()
+
+    def delete(self, key):
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            row = self.conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._add_bytes(-row[0])
+
+    def purge_expired(self):
+        """Drop every expired entry. Returns the number removed."""
+        now = time.time()
+        expired = "(value IS NOT NULL AND fetched_at < ?) OR (value IS NULL AND fetched_at < ?)"
+        cutoffs = (now - self.ttl, now - self.negative_ttl)
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            count, size = self.conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE {expired}", cutoffs
+            ).fetchone()
+            self.conn.execute(f"DELETE FROM entries WHERE {expired}", cutoffs)
+            self._add_bytes(-size)
+        return count
+
+    def import_json(self, path):
+        """One-time import of a legacy {key: response} JSON cache.
+
+        Legacy misses (None) are imported as already-expired so they are retried.
+        """
+        with open(path, "r") as f:
+            legacy = json.load(f)
+        mtime = os.path.getmtime(path)
+        for key, value in legacy.items():
+            self.put(key, value, fetched_at=mtime if value is not None else 0.0)
+        return len(legacy)
+
+    def _add_bytes(self, delta):
+        self.conn.execute("UPDATE meta SET value = value + ? WHERE name = 'total_bytes'", (delta,))
+
+    def _evict(self):
+        # Runs inside put()'s transaction
+        while self.total_bytes > self.max_bytes:
+            row = self.conn.execute("SELECT key, size FROM entries ORDER BY accessed_at LIMIT 1").fetchone()
+            if row is None:
+                break
+            self.conn.execute("DELETE FROM entries WHERE key = ?", (row[0],))
+            self._add_bytes(-row[1])
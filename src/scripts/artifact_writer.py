@@ -0,0 +1,115 @@
+"""
+Artifact Writer
+================
+Shared JSON emitter for the data files the site loads.
+
+  - minified JSON (no indent, compact separators; indent= pretty-prints)
+  - written to a temp file and renamed into place, so the dev server and
+    deploy never see half a file
+  - files under public/ (served as static assets) also get precompressed
+    .gz and .br siblings (gzip -9, brotli quality 11); src/data files are
+    bundled by Next.js, so for them the compressed sizes are only measured,
+    with cheap settings (gzip -6, brotli quality 5 and only when the budget
+    has a br_kb limit) so a write stays fast
+  - raw / gzip / brotli sizes are checked against artifact-budgets.json;
+    an artifact over budget raises ArtifactBudgetError and the previous
+    file is left untouched
+
+Brotli needs the `brotli` package; without it .br siblings are skipped and
+only the raw / gzip budgets are enforced.
+
+USAGE:
+  sys.path.insert(0, os.path.join(BASE, "src", "scripts"))
+  from artifact_writer import write_json
+
+  write_json("src/data/ncaa-logo-mapping.json", mapping)
+"""
+import fnmatch
+import gzip
+import json
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BASE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BUDGETS_FILE = os.path.join(BASE, "src", "data", "artifact-budgets.json")
+PUBLIC_DIR = os.path.join(BASE, "public")
+
+
+class ArtifactBudgetError(RuntimeError):
+    pass
+
+
+def _load_budgets():
+    if os.path.exists(BUDGETS_FILE):
+        with open(BUDGETS_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def budget_for(path, budgets=None):
+    """Budget {raw_kb, gz_kb, br_kb} for a path: first matching pattern, else default."""
+    budgets = _load_budgets() if budgets is None else budgets
+    full = os.path.abspath(path).replace(os.sep, "/")
+    for pattern, budget in budgets.get("patterns", {}).items():
+        # Patterns are repo-relative; match them as a suffix of the absolute path
+        if fnmatch.fnmatch(full, "*/" + pattern):
+            return budget
+    return budgets.get("default", {})
+
+
+def _write_atomic(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _fmt_kb(n):
+    return f"{n / 1024:,.1f} KB"
+
+
+def write_json(path, data, budget=None, compress=None, quiet=False, indent=None):
+    """Write `data` as minified JSON; returns {"raw", "gz", "br"} byte sizes.
+
+    `budget` overrides artifact-budgets.json; `compress` forces .gz/.br
+    siblings on (True) or off (False) instead of the public/-only default;
+    `indent` pretty-prints instead of minifying (budgets apply to the result).
+    """
+    separators = (",", ":") if indent is None else None
+    raw = json.dumps(data, indent=indent, separators=separators, ensure_ascii=False).encode("utf-8")
+    budget = budget_for(path) if budget is None else budget
+    if compress is None:
+        compress = os.path.abspath(path).startswith(PUBLIC_DIR + os.sep)
+    # Full-strength compression only for the siblings that get served
+    gz = gzip.compress(raw, compresslevel=9 if compress else 6, mtime=0)
+    br = None
+    if brotli and (compress or "br_kb" in budget):
+        br = brotli.compress(raw, quality=11 if compress else 5)
+    sizes = {"raw": len(raw), "gz": len(gz), "br": len(br) if br is not None else None}
+
+    over = [
+        f"{kind} {_fmt_kb(sizes[kind])} > {budget[f'{kind}_kb']:,} KB"
+        for kind in ("raw", "gz", "br")
+        if sizes[kind] is not None and f"{kind}_kb" in budget and sizes[kind] > budget[f"{kind}_kb"] * 1024
+    ]
+    if over:
+        raise ArtifactBudgetError(f"{path} over budget: {'; '.join(over)} (see {BUDGETS_FILE})")
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    _write_atomic(path, raw)
+    if compress:
+        _write_atomic(path + ".gz", gz)
+        if br is not None:
+            _write_atomic(path + ".br", br)
+
+    if not quiet:
+        limit = f"  (budget {budget['raw_kb']:,} KB)" if "raw_kb" in budget else ""
+        br_text = f" | br {_fmt_kb(sizes['br'])}" if br is not None else ""
+        print(f"  📦 {path}: {_fmt_kb(sizes['raw'])} | gz {_fmt_kb(sizes['gz'])}{br_text}{limit}")
+    return sizes
@@ -0,0 +1,253 @@
+"""
+BBMI Metrics
+=============
+Shared, vectorized scoring for the analysis scripts.
+
+Every function takes NumPy-compatible arrays, an optional `weights` array and
+an optional `groups` array of keys. Without `groups` a float is returned; with
+`groups` a {key: value} dict is returned, computed in one pass with
+np.bincount rather than a Python loop per group.
+
+  Probabilistic (p = predicted probability, y = 0/1 outcome):
+    brier, log_loss, ece, calibration_table, roc_auc, pick_side
+  Point forecasts (pred vs actual):
+    rmse, mae, bias
+  Betting (score = edge, won = 0/1, profit = units per 1-unit bet):
+    threshold_sweep
+  Bundles:
+    probability_report, error_report
+
+USAGE (from a script outside src/scripts):
+  sys.path.insert(0, os.path.join(BASE, "src", "scripts"))
+  from bbmi_metrics import brier, error_report
+"""
+import numpy as np
+
+
+# ── Helpers ───────────────────────────────────────────────────────
+
+def _arrays(*arrays):
+    return [np.asarray(a, dtype=float) for a in arrays]
+
+
+def _weights(weights, n):
+    if weights is None:
+        return np.ones(n)
+    w = np.asarray(weights, dtype=float)
+    if w.shape != (n,):
+        raise ValueError(f"weights must have shape ({n},), got {w.shape}")
+    return w
+
+
+def _group_index(groups, n):
+    """Return (unique keys, inverse index) for a groups array, or (None, zeros)."""
+    if groups is None:
+        return None, np.zeros(n, dtype=np.int64)
+    keys, inverse = np.unique(np.asarray(groups), return_inverse=True)
+    return keys, inverse.ravel()
+
+
+def _key(k):
+    return k.item() if hasattr(k, "item") else k
+
+
+def _weighted_mean(values, weights, groups):
+    """Weighted mean of per-row values, overall or per group."""
+    w = _weights(weights, values.shape[0])
+    keys, inv = _group_index(groups, values.shape[0])
+    n_groups = 1 if keys is None else len(keys)
+    num = np.bincount(inv, weights=values * w, minlength=n_groups)
+    den = np.bincount(inv, weights=w, minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = num / den
+    if keys is None:
+        return float(out[0]) if den[0] else float("nan")
+    return {_key(k): float(v) for k, v in zip(keys, out)}
+
+
+# ── Probabilistic metrics ─────────────────────────────────────────
+
+def pick_side(p, y):
+    """
+    Fold home-perspective probabilities onto the picked side (p >= 0.5).
+    Returns (pick_prob, pick_won) arrays.
+    """
+    p, y = _arrays(p, y)
+    home = p >= 0.5
+    return np.where(home, p, 1 - p), np.where(home, y, 1 - y)
+
+
+def brier(p, y, weights=None, groups=None):
+    p, y = _arrays(p, y)
+    return _weighted_mean((p - y) ** 2, weights, groups)
+
+
+def log_loss(p, y, weights=None, groups=None, eps=1e-15):
+    p, y = _arrays(p, y)
+    p = np.clip(p, eps, 1 - eps)
+    return _weighted_mean(-(y * np.log(p) + (1 - y) * np.log(1 - p)), weights, groups)
+
+
+def _bin_index(p, edges):
+    # Right-open buckets [lo, hi); values outside the edges get -1
+    idx = np.searchsorted(edges, p, side="right") - 1
+    idx[(p < edges[0]) | (p >= edges[-1])] = -1
+    return idx
+
+
+def calibration_table(p, y, edges=None, weights=None, min_count=0):
+    """
+    Bucketed calibration. Returns a list of rows
+    {"lo", "hi", "n", "model", "actual", "gap"} for buckets with >= min_count rows.
+    `edges` defaults to ten equal-width buckets on [0, 1].
+    """
+    p, y = _arrays(p, y)
+    edges = np.linspace(0, 1, 11) if edges is None else np.asarray(edges, dtype=float)
+    w = _weights(weights, p.shape[0])
+    idx = _bin_index(p, edges)
+    ok = idx >= 0
+    nb = len(edges) - 1
+    n = np.bincount(idx[ok], minlength=nb)
+    sw = np.bincount(idx[ok], weights=w[ok], minlength=nb)
+    sp = np.bincount(idx[ok], weights=(p * w)[ok], minlength=nb)
+    sy = np.bincount(idx[ok], weights=(y * w)[ok], minlength=nb)
+
+    rows = []
+    for b in range(nb):
+        if n[b] == 0 or n[b] < min_count:
+            continue
+        model, actual = sp[b] / sw[b], sy[b] / sw[b]
+        rows.append({"lo": float(edges[b]), "hi": float(edges[b + 1]), "n": int(n[b]),
+                     "model": float(model), "actual": float(actual), "gap": float(actual - model)})
+    return rows
+
+
+def ece(p, y, edges=None, weights=None, groups=None):
+    """Expected calibration error: weighted mean |actual - model| over buckets."""
+    p, y = _arrays(p, y)
+    edges = np.linspace(0, 1, 11) if edges is None else np.asarray(edges, dtype=float)
+    # Include p == 1.0 in the top bucket for the default [0, 1] edges
+    p_binned = np.minimum(p, np.nextafter(edges[-1], edges[0]))
+    w = _weights(weights, p.shape[0])
+    keys, inv = _group_index(groups, p.shape[0])
+    n_groups = 1 if keys is None else len(keys)
+    nb = len(edges) - 1
+
+    idx = _bin_index(p_binned, edges)
+    ok = idx >= 0
+    cell = inv[ok] * nb + idx[ok]
+    size = n_groups * nb
+    sw = np.bincount(cell, weights=w[ok], minlength=size).reshape(n_groups, nb)
+    sp = np.bincount(cell, weights=(p * w)[ok], minlength=size).reshape(n_groups, nb)
+    sy = np.bincount(cell, weights=(y * w)[ok], minlength=size).reshape(n_groups, nb)
+    total = sw.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = np.abs(sy - sp).sum(axis=1) / total
+    if keys is None:
+        return float(out[0]) if total[0] else float("nan")
+    return {_key(k): float(v) for k, v in zip(keys, out)}
+
+
+def _auc(score, y, w):
+    pos, neg = y == 1, y == 0
+    wp, wn = w[pos].sum(), w[neg].sum()
+    if wp == 0 or wn == 0:
+        return float("nan")
+    # Weighted Mann-Whitney U with ties counted as half
+    order = np.argsort(score, kind="mergesort")
+    s, yy, ww = score[order], y[order], w[order]
+    uniq, start = np.unique(s, return_index=True)
+    neg_w = np.add.reduceat(ww * (yy == 0), start)
+    pos_w = np.add.reduceat(ww * (yy == 1), start)
+    neg_below = np.concatenate([[0.0], np.cumsum(neg_w)[:-1]])
+    u = (pos_w * (neg_below + 0.5 * neg_w)).sum()
+    return float(u / (wp * wn))
+
+
+def roc_auc(score, y, weights=None, groups=None):
+    """ROC-AUC of score for outcome y (use pick_side() first for pick-side AUC)."""
+    score, y = _arrays(score, y)
+    w = _weights(weights, score.shape[0])
+    keys, inv = _group_index(groups, score.shape[0])
+    if keys is None:
+        return _auc(score, y, w)
+    return {_key(k): _auc(score[inv == i], y[inv == i], w[inv == i]) for i, k in enumerate(keys)}
+
+
+# ── Point-forecast metrics ────────────────────────────────────────
+
+def rmse(pred, actual, weights=None, groups=None):
+    pred, actual = _arrays(pred, actual)
+    mse = _weighted_mean((pred - actual) ** 2, weights, groups)
+    if isinstance(mse, dict):
+        return {k: float(np.sqrt(v)) for k, v in mse.items()}
+    return float(np.sqrt(mse))
+
+
+def mae(pred, actual, weights=None, groups=None):
+    pred, actual = _arrays(pred, actual)
+    return _weighted_mean(np.abs(pred - actual), weights, groups)
+
+
+def bias(pred, actual, weights=None, groups=None):
+    """Mean signed error (pred - actual); positive = model runs high."""
+    pred, actual = _arrays(pred, actual)
+    return _weighted_mean(pred - actual, weights, groups)
+
+
+# ── Betting ───────────────────────────────────────────────────────
+
+def threshold_sweep(score, won, profit, thresholds):
+    """n, wins and total profit of the bets with score >= each threshold.
+
+    One sort plus cumulative sums: every threshold is a np.searchsorted
+    lookup into the sorted scores, so the cost does not grow with the
+    number of thresholds. Returns [{"threshold", "n", "wins", "profit"}].
+    """
+    score, won, profit = _arrays(score, won, profit)
+    order = np.argsort(score, kind="mergesort")
+    s = score[order]
+    # Suffix sums via prefix sums: rows [i:] total = total - prefix[i]
+    wins_cum = np.concatenate([[0.0], np.cumsum(won[order])])
+    profit_cum = np.concatenate([[0.0], np.cumsum(profit[order])])
+    start = np.searchsorted(s, np.asarray(thresholds, dtype=float), side="left")
+    n = s.shape[0] - start
+    wins = wins_cum[-1] - wins_cum[start]
+    total = profit_cum[-1] - profit_cum[start]
+    return [{"threshold": float(t), "n": int(k), "wins": int(round(w)), "profit": float(pr)}
+            for t, k, w, pr in zip(thresholds, n, wins, total)]
+
+
+# ── Bundles ───────────────────────────────────────────────────────
+
+def probability_report(p, y, weights=None, groups=None, edges=None):
+    """n, Brier, log loss, ECE and pick-side ROC-AUC in one call."""
+    p, y = _arrays(p, y)
+    pick_p, pick_y = pick_side(p, y)
+    report = {
+        "brier": brier(p, y, weights, groups),
+        "log_loss": log_loss(p, y, weights, groups),
+        "ece": ece(pick_p, pick_y, edges, weights, groups),
+        "auc": roc_auc(p, y, weights, groups),
+        "pick_auc": roc_auc(pick_p, pick_y, weights, groups),
+    }
+    if groups is None:
+        return {"n": int(p.shape[0]), **report}
+    keys, counts = np.unique(np.asarray(groups), return_counts=True)
+    return {_key(k): {"n": int(c), **{m: v[_key(k)] for m, v in report.items()}}
+            for k, c in zip(keys, counts)}
+
+
+def error_report(pred, actual, weights=None, groups=None):
+    """n, RMSE, MAE and bias in one call."""
+    pred, actual = _arrays(pred, actual)
+    report = {
+        "rmse": rmse(pred, actual, weights, groups),
+        "mae": mae(pred, actual, weights, groups),
+        "bias": bias(pred, actual, weights, groups),
+    }
+    if groups is None:
+        return {"n": int(pred.shape[0]), **report}
+    keys, counts = np.unique(np.asarray(groups), return_counts=True)
+    return {_key(k): {"n": int(c), **{m: v[_key(k)] for m, v in report.items()}}
+            for k, c in zip(keys, counts)}
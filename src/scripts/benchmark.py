@@ -0,0 +1,449 @@
+"""
+Analysis Script Benchmarks
+===========================
+Runs the analysis scripts against 1×, 10× and 100× copies of their input
+data and records wall time and peak memory, so we can see how they scale
+as seasons accumulate and catch regressions.
+
+Cases:
+  compute_rmse          compute_rmse.py --games <scaled games.json>
+  ml_diagnostics        src/scripts/ml_diagnostics_all_sports.py (games / football / mlb)
+  compare_predictions   src/data/pre_tournament_snapshots/compare_predictions.py
+  backfill_ml_correct   backfill_ml_correct.py (skipped when baseball-games.json
+                        and its snapshot commits are not available)
+  export_all_csvs       export_all_csvs.py against a synthetic .xlsx workbook
+                        (skipped when openpyxl is not installed)
+
+Scaled data: an N× dataset holds N copies of every input. Game files get
+each copy's dates shifted back one year per copy (N seasons of history).
+Bracket / seeding files get each copy's team names suffixed (N times the
+field). The synthetic workbook has the three sheets export_all_csvs.py
+reads; at 1× each range (Betting Lines AL8:AV3000, My Rankings BZ6:CQ371,
+Team Probabilities AV6:BD74) is filled from games.json / rankings.json /
+seeding.json, and at N× each range is N stacked copies with the export's
+ranges stretched to match. The datasets are written to a temp directory
+and the scripts' path constants are pointed at it.
+
+Each case × scale runs in its own Python process (stdout discarded), so
+peak memory is that process's peak RSS (peak working set on Windows).
+Wall time covers the script itself, not interpreter start-up. It is the
+best of --repeat runs.
+
+Every run is appended to src/data/.benchmark-history.json. A case is
+flagged as a regression when its time or memory exceeds the median of the
+previous BASELINE_RUNS runs at the same scale by more than --threshold
+(default 25%). Differences under MIN_SECONDS / MIN_MB are ignored as noise.
+
+USAGE:
+  python src/scripts/benchmark.py                          # every case at 1×, 10×, 100×
+  python src/scripts/benchmark.py --scales 1,10 --cases compute_rmse,ml_diagnostics
+  python src/scripts/benchmark.py --repeat 3 --threshold 0.15
+  python src/scripts/benchmark.py --fail-on-regression     # exit 1 when anything regressed (CI)
+  python src/scripts/benchmark.py --history                # show recorded runs
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BASE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA = os.path.join(BASE, "src", "data")
+LINES = os.path.join(DATA, "betting-lines")
+SNAPSHOTS = os.path.join(DATA, "pre_tournament_snapshots")
+HISTORY_FILE = os.path.join(DATA, ".benchmark-history.json")
+
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_THRESHOLD = 0.25
+BASELINE_RUNS = 5
+MIN_SECONDS = 0.05
+MIN_MB = 5.0
+TIMEOUT = 1800
+
+
+# ── Scaled datasets ───────────────────────────────────────────────
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+
+
+def _shift_year(value, years):
+    if not years or not isinstance(value, str) or len(value) < 4 or not value[:4].isdigit():
+        return value
+    return f"{int(value[:4]) - years:04d}{value[4:]}"
+
+
+def scale_games(rows, n):
+    """n seasons of history: copy k has its dates moved back k years."""
+    out = []
+    for k in range(n):
+        for row in rows:
+            copy = dict(row)
+            for field in ("date", "gameDate"):
+                if field in copy:
+                    copy[field] = _shift_year(copy[field], k)
+            out.append(copy)
+    return out
+
+
+def scale_teams(rows, n, field="Team"):
+    """n copies of a bracket / seeding field with suffixed team names."""
+    out = []
+    for k in range(n):
+        for row in rows:
+            copy = dict(row)
+            if k and copy.get(field):
+                copy[field] = f"{copy[field]} {k + 1}"
+            out.append(copy)
+    return out
+
+
+def build_games_dataset(root, n):
+    """Scaled games / football / mlb files; returns the total row count."""
+    rows = 0
+    for name in ("games.json", "football-games.json", "mlb-games.json"):
+        data = scale_games(_read(os.path.join(LINES, name)), n)
+        _write(os.path.join(root, "betting-lines", name), data)
+        rows += len(data)
+    return rows
+
+
+def build_snapshot_dataset(root, n):
+    rows = 0
+    for name in os.listdir(os.path.join(SNAPSHOTS, "wiaa")):
+        if name.endswith(".json"):
+            data = scale_teams(_read(os.path.join(SNAPSHOTS, "wiaa", name)), n)
+            _write(os.path.join(root, "pre", "wiaa", name), data)
+            rows += len(data)
+    for name in os.listdir(os.path.join(DATA, "wiaa-seeding")):
+        if name.startswith("wiaa-d") and name.endswith(".json"):
+            _write(os.path.join(root, "cur", "wiaa", name), scale_teams(_read(os.path.join(DATA, "wiaa-seeding", name)), n))
+    pre = scale_teams(_read(os.path.join(SNAPSHOTS, "ncaa", "seeding-20260315.json")), n)
+    _write(os.path.join(root, "pre", "ncaa", "seeding-20260315.json"), pre)
+    _write(os.path.join(root, "cur", "seeding.json"), scale_teams(_read(os.path.join(DATA, "seeding", "seeding.json")), n))
+    return rows + len(pre)
+
+
+# export_all_csvs.py DATA_MAP ranges and the JSON file each one's rows come from
+WORKBOOK_SHEETS = {
+    "games": ("Betting Lines", "AL8:AV3000", os.path.join(LINES, "games.json")),
+    "rankings": ("My Rankings", "BZ6:CQ371", os.path.join(DATA, "rankings", "rankings.json")),
+    "seeding": ("Team Probabilities", "AV6:BD74", os.path.join(DATA, "seeding", "seeding.json")),
+}
+
+
+def build_workbook_dataset(root, n):
+    """Synthetic workbook.xlsx with each export range repeated n times; returns the row count."""
+    import openpyxl
+    from openpyxl.utils import get_column_letter, range_boundaries
+
+    wb = openpyxl.Workbook(write_only=True)
+    data_map, rows = {}, 0
+    for key, (sheet, cell_range, source) in WORKBOOK_SHEETS.items():
+        min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+        width, height = max_col - min_col + 1, (max_row - min_row + 1) * n
+        records = _read(source)
+        ws = wb.create_sheet(sheet)
+        for _ in range(min_row - 1):
+            ws.append([])
+        for i in range(height):
+            values = list(records[i % len(records)].values())[:width]
+            ws.append([None] * (min_col - 1) + values)
+        data_map[key] = {
+            "sheet": sheet,
+            "range": f"{get_column_letter(min_col)}{min_row}:{get_column_letter(max_col)}{min_row + height - 1}",
+            "output": os.path.join(root, "csv", f"{key}.csv"),
+        }
+        rows += height
+    wb.save(os.path.join(root, "workbook.xlsx"))
+    _write(os.path.join(root, "data-map.json"), data_map)
+    return rows
+
+
+# ── Cases ─────────────────────────────────────────────────────────
+
+def _load_module(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_compute_rmse(root):
+    sys.argv = ["compute_rmse.py", "--games", os.path.join(root, "betting-lines", "games.json")]
+    _load_module(os.path.join(BASE, "compute_rmse.py"), "compute_rmse").main()
+
+
+def run_ml_diagnostics(root):
+    module = _load_module(os.path.join(BASE, "src", "scripts", "ml_diagnostics_all_sports.py"), "ml_diagnostics")
+    module.DATA = os.path.join(root, "betting-lines")
+    module.main()
+
+
+def run_compare_predictions(root):
+    module = _load_module(os.path.join(SNAPSHOTS, "compare_predictions.py"), "compare_predictions")
+    module.WIAA_PRE_DIR = os.path.join(root, "pre", "wiaa")
+    module.NCAA_PRE_DIR = os.path.join(root, "pre", "ncaa")
+    module.WIAA_CUR_DIR = os.path.join(root, "cur", "wiaa")
+    module.NCAA_CUR_FILE = os.path.join(root, "cur", "seeding.json")
+    module.main()
+
+
+def backfill_unavailable():
+    if not os.path.exists(os.path.join(LINES, "baseball-games.json")):
+        return "src/data/betting-lines/baseball-games.json is not in this checkout"
+    return None
+
+
+def run_backfill_ml_correct(root):
+    # The script reads baseball-games.json relative to the cwd and its snapshots from git
+    os.chdir(BASE)
+    _load_module(os.path.join(BASE, "backfill_ml_correct.py"), "backfill_ml_correct")
+
+
+def workbook_unavailable():
+    if importlib.util.find_spec("openpyxl") is None:
+        return "openpyxl is not installed"
+    return None
+
+
+def run_export_all_csvs(root):
+    module = _load_module(os.path.join(BASE, "export_all_csvs.py"), "export_all_csvs")
+    module.main(os.path.join(root, "workbook.xlsx"), _read(os.path.join(root, "data-map.json")))
+
+
+CASES = {
+    "compute_rmse": {"build": build_games_dataset, "run": run_compute_rmse},
+    "ml_diagnostics": {"build": build_games_dataset, "run": run_ml_diagnostics},
+    "compare_predictions": {"build": build_snapshot_dataset, "run": run_compare_predictions},
+    "backfill_ml_correct": {"build": None, "run": run_backfill_ml_correct, "unavailable": backfill_unavailable,
+                            "fixed": True},  # point-in-time git snapshots cannot be scaled
+    "export_all_csvs": {"build": build_workbook_dataset, "run": run_export_all_csvs,
+                        "unavailable": workbook_unavailable},
+}
+
+
+# ── Child process ─────────────────────────────────────────────────
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (peak working set on Windows)."""
+    # Linux: VmHWM starts afresh at exec, unlike ru_maxrss, which keeps the forking parent's peak
+    if os.path.exists("/proc/self/status"):
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(Counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(),
+                                                 ctypes.byref(counters), counters.cb)
+        return counters.PeakWorkingSetSize / (1024 * 1024)
+
+
+def child(case, root, result_path):
+    """Run one case with stdout discarded; write {"seconds", "peak_mb"} to result_path."""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    devnull = open(os.devnull, "w", encoding="utf-8")
+    real_stdout, sys.stdout = sys.stdout, devnull
+    started = time.perf_counter()
+    try:
+        CASES[case]["run"](root)
+    finally:
+        seconds = time.perf_counter() - started
+        sys.stdout = real_stdout
+        devnull.close()
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump({"seconds": seconds, "peak_mb": peak_rss_mb()}, f)
+
+
+def measure(case, root, repeat):
+    """Best-of-`repeat` seconds and the peak memory of that run, each in a fresh process."""
+    best = None
+    for _ in range(repeat):
+        fd, result_path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", case, root, result_path],
+                                  capture_output=True, text=True, timeout=TIMEOUT, cwd=BASE)
+            if proc.returncode != 0:
+                tail = (proc.stderr.strip().splitlines() or ["no output"])[-1]
+                return {"status": "error", "error": tail}
+            run = _read(result_path)
+        finally:
+            os.remove(result_path)
+        if best is None or run["seconds"] < best["seconds"]:
+            best = run
+    return {"status": "ok", "seconds": round(best["seconds"], 4), "peak_mb": round(best["peak_mb"], 1)}
+
+
+# ── History and regressions ───────────────────────────────────────
+
+def load_history(path=HISTORY_FILE):
+    if os.path.exists(path):
+        try:
+            return _read(path)
+        except (OSError, ValueError):
+            pass
+    return []
+
+
+def save_history(history, path=HISTORY_FILE):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+    os.replace(tmp, path)
+
+
+def baseline(history, case, scale, metric, runs=BASELINE_RUNS):
+    """Median of `metric` over the last `runs` successful runs of a case at a scale."""
+    values = [run["results"][case][str(scale)][metric] for run in history
+              if run.get("results", {}).get(case, {}).get(str(scale), {}).get("status") == "ok"]
+    values = values[-runs:]
+    return statistics.median(values) if values else None
+
+
+def regressions(history, results, threshold):
+    """[(case, scale, metric, baseline, now)] for results beyond the threshold."""
+    flagged = []
+    for case, by_scale in results.items():
+        for scale, result in by_scale.items():
+            if result.get("status") != "ok":
+                continue
+            for metric, floor in (("seconds", MIN_SECONDS), ("peak_mb", MIN_MB)):
+                base = baseline(history, case, scale, metric)
+                now = result[metric]
+                if base is not None and now > base * (1 + threshold) and now - base > floor:
+                    flagged.append((case, scale, metric, base, now))
+    return flagged
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=BASE)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def show_history(history):
+    for run in history[-10:]:
+        print(f"\n  {run['timestamp']}  {run.get('commit') or ''}  python {run.get('python', '')}")
+        for case, by_scale in run["results"].items():
+            cells = []
+            for scale, r in by_scale.items():
+                cells.append(f"{scale}×: {r['seconds']:.2f}s {r['peak_mb']:.0f}MB" if r.get("status") == "ok"
+                             else f"{scale}×: {r.get('status')}")
+            print(f"    {case:22s} " + "   ".join(cells))
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(*sys.argv[2:5])
+        return
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", help=f"Comma-separated subset of: {', '.join(CASES)}")
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)), help="Comma-separated scale factors")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case/scale; the fastest is kept")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Regression threshold as a fraction of the baseline (default 0.25)")
+    parser.add_argument("--no-record", action="store_true", help="Do not append this run to the history")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if anything regressed")
+    parser.add_argument("--history", action="store_true", help="Show the recorded runs and exit")
+    args = parser.parse_args()
+
+    history = load_history()
+    if args.history:
+        show_history(history)
+        return
+
+    cases = args.cases.split(",") if args.cases else list(CASES)
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+    scales = [int(s) for s in args.scales.split(",")]
+
+    print("=" * 60)
+    print("  ANALYSIS SCRIPT BENCHMARKS")
+    print("=" * 60)
+    print(f"  Cases: {', '.join(cases)}   Scales: {', '.join(f'{s}×' for s in scales)}   Repeat: {args.repeat}")
+    print(f"\n  {'Case':22s} {'Scale':>6s} {'Rows':>9s} {'Time':>9s} {'Peak MB':>9s}")
+
+    results = {}
+    for case in cases:
+        spec = CASES[case]
+        results[case] = {}
+        reason = spec.get("unavailable", lambda: None)()
+        for scale in ([1] if spec.get("fixed") else scales):
+            if reason:
+                results[case][str(scale)] = {"status": "skipped", "reason": reason}
+                print(f"  {case:22s} {scale:>5d}×  skipped: {reason}")
+                continue
+            root = tempfile.mkdtemp(prefix=f"bench-{case}-{scale}x-")
+            try:
+                rows = spec["build"](root, scale) if spec["build"] else None
+                result = measure(case, root, args.repeat)
+            finally:
+                shutil.rmtree(root, ignore_errors=True)
+            result["rows"] = rows
+            results[case][str(scale)] = result
+            if result["status"] == "ok":
+                print(f"  {case:22s} {scale:>5d}× {rows or 0:>9,} {result['seconds']:>8.3f}s {result['peak_mb']:>9.1f}")
+            else:
+                print(f"  {case:22s} {scale:>5d}×  error: {result['error']}")
+
+    flagged = regressions(history, results, args.threshold)
+    if flagged:
+        print(f"\n⚠️  {len(flagged)} regression(s) beyond {args.threshold:.0%} of the last {BASELINE_RUNS} runs:")
+        for case, scale, metric, base, now in flagged:
+            print(f"   {case} @ {scale}×: {metric} {base:.3f} → {now:.3f} (+{100 * (now / base - 1):.0f}%)")
+    elif history:
+        print(f"\n✅ No regressions beyond {args.threshold:.0%}")
+
+    if not args.no_record:
+        history.append({
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+            "regressions": [{"case": c, "scale": s, "metric": m, "baseline": b, "value": v}
+                            for c, s, m, b, v in flagged],
+        })
+        save_history(history)
+        print(f"  Recorded in {HISTORY_FILE}")
+    if flagged and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Record-Level Data Diff
+=======================
+Compares two versions of a data artifact by record identity instead of by
+text, and writes a compact delta of what a pipeline run actually changed.
+
+Records are indexed by key in one pass over each version (O(n) hashing);
+unchanged records are skipped with a single dict comparison. Duplicate keys
+are kept apart by occurrence (key, key#2, ...).
+
+Delta file (src/data/deltas/<artifact>.delta.json):
+  {"artifact": "src/data/betting-lines/games.json", "key": ["date", "away", "home"],
+   "from": "HEAD", "to": "working tree", "generated": ...,
+   "summary": {"added": 3, "removed": 0, "changed": 41, "unchanged": 3322},
+   "added":   [{"key": "2026-04-06|UConn|Michigan", "record": {...}}],
+   "removed": [{"key": "...", "record": {...}}],
+   "changed": [{"key": "...", "fields": {"actualHomeScore": [null, 71], ...}}]}
+
+Downstream steps use affected(delta, fields) to rebuild only the outputs
+touching the changed records (e.g. the teams named in "home"/"away").
+
+USAGE:
+  python src/scripts/data_diff.py src/data/betting-lines/games.json            # HEAD vs working tree
+  python src/scripts/data_diff.py src/data/rankings/rankings.json --from HEAD~3 --to HEAD
+  python src/scripts/data_diff.py new.json --old old.json --key team --no-write
+
+  sys.path.insert(0, os.path.join(BASE, "src", "scripts"))
+  from data_diff import diff_records, affected
+"""
+import argparse
+import json
+import os
+import subprocess
+from datetime import datetime, timezone
+
+BASE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DELTA_DIR = os.path.join(BASE, "src", "data", "deltas")
+
+# Record identity per artifact (matched on file name)
+KEY_FIELDS = {
+    "games.json": ["date", "away", "home"],
+    "football-games.json": ["gameDate", "awayTeam", "homeTeam"],
+    "mlb-games.json": ["gameId"],
+    "nfl-games.json": ["gameId"],
+    "kalshi-trades.json": ["ticker"],
+    "rankings.json": ["team"],
+    "football-rankings.json": ["team"],
+    "seeding.json": ["Team"],
+    "WIAArankings-with-slugs.json": ["division", "team"],
+    "wiaa-scores.json": ["team", "date", "opp"],
+    "WIAA-team.json": ["team", "date", "opp"],
+    "ncaa-scores.json": ["gameDate", "awayTeam", "homeTeam"],
+}
+# Tried in order when an artifact has no entry above
+FALLBACK_KEYS = [["gameId"], ["id"], ["ticker"], ["slug"], ["team"], ["Team"]]
+
+# Artifacts whose records sit under a top-level field
+RECORDS_FIELD = {
+    "kalshi-trades.json": "trades",
+}
+
+
+def records_of(data, artifact):
+    field = RECORDS_FIELD.get(os.path.basename(artifact))
+    if field and isinstance(data, dict):
+        return data.get(field, [])
+    if isinstance(data, dict):
+        # {key: record} mappings (e.g. the logo mappings) diff as keyed records
+        return [{"_key": k, **(v if isinstance(v, dict) else {"value": v})} for k, v in data.items()]
+    return data
+
+
+def key_fields_for(artifact, records):
+    fields = KEY_FIELDS.get(os.path.basename(artifact))
+    if fields:
+        return fields
+    if records and "_key" in records[0]:
+        return ["_key"]
+    for candidate in FALLBACK_KEYS:
+        if records and all(f in records[0] for f in candidate):
+            return candidate
+    raise ValueError(f"No record key known for {artifact}; pass --key")
+
+
+def index_records(records, key_fields):
+    """{key string: record}, one pass; repeated keys become key#2, key#3, ..."""
+    index, seen = {}, {}
+    for r in records:
+        key = "|".join(str(r.get(f)) for f in key_fields)
+        n = seen.get(key, 0) + 1
+        seen[key] = n
+        index[key if n == 1 else f"{key}#{n}"] = r
+    return index
+
+
+def diff_records(old_records, new_records, key_fields):
+    """(added, removed, changed, unchanged count) between two record lists."""
+    old = index_records(old_records, key_fields)
+    new = index_records(new_records, key_fields)
+
+    added = [{"key": k, "record": r} for k, r in new.items() if k not in old]
+    removed = [{"key": k, "record": r} for k, r in old.items() if k not in new]
+    changed, unchanged = [], 0
+    for k, r in new.items():
+        before = old.get(k)
+        if before is None:
+            continue
+        if before == r:
+            unchanged += 1
+            continue
+        fields = {f: [before.get(f), r.get(f)] for f in before.keys() | r.keys() if before.get(f) != r.get(f)}
+        changed.append({"key": k, "fields": dict(sorted(fields.items()))})
+    return added, removed, changed, unchanged
+
+
+def build_delta(artifact, old_data, new_data, key_fields=None, old_label="old", new_label="new"):
+    old_records = records_of(old_data, artifact) if old_data is not None else []
+    new_records = records_of(new_data, artifact)
+    key_fields = key_fields or key_fields_for(artifact, new_records or old_records)
+    added, removed, changed, unchanged = diff_records(old_records, new_records, key_fields)
+    return {
+        "artifact": artifact,
+        "key": key_fields,
+        "from": old_label,
+        "to": new_label,
+        "generated": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "summary": {"added": len(added), "removed": len(removed), "changed": len(changed), "unchanged": unchanged},
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+    }
+
+
+def affected(delta, fields):
+    """Values of `fields` on every added, removed or changed record (old and new values)."""
+    values = set()
+    for entry in delta["added"] + delta["removed"]:
+        values.update(entry["record"].get(f) for f in fields)
+    if delta["changed"]:
+        key_fields = delta["key"]
+        for entry in delta["changed"]:
+            parts = entry["key"].split("#")[0].split("|")
+            keyed = dict(zip(key_fields, parts))
+            for f in fields:
+                if f in entry["fields"]:
+                    values.update(entry["fields"][f])
+                elif f in keyed:
+                    values.add(keyed[f])
+    values.discard(None)
+    return values
+
+
+# ── Loading versions ──────────────────────────────────────────────
+
+def load_version(path, rev=None):
+    """JSON content of `path` at a git revision (None = working tree); None if absent."""
+    if rev is None:
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    rel = os.path.relpath(os.path.abspath(path), BASE).replace(os.sep, "/")
+    result = subprocess.run(["git", "show", f"{rev}:{rel}"], cwd=BASE, capture_output=True)
+    if result.returncode != 0:
+        return None
+    return json.loads(result.stdout.decode("utf-8"))
+
+
+def delta_path(artifact):
+    stem = os.path.splitext(os.path.basename(artifact))[0]
+    return os.path.join(DELTA_DIR, f"{stem}.delta.json")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("artifact", help="Data file to diff")
+    parser.add_argument("--old", help="Compare against this file instead of a git revision")
+    parser.add_argument("--from", dest="rev_from", default="HEAD", help="Old git revision (default HEAD)")
+    parser.add_argument("--to", dest="rev_to", help="New git revision (default: working tree)")
+    parser.add_argument("--key", help="Comma-separated key fields (default: per-artifact)")
+    parser.add_argument("--output", help="Delta file path (default: src/data/deltas/<artifact>.delta.json)")
+    parser.add_argument("--no-write", action="store_true", help="Only print the summary")
+    args = parser.parse_args()
+
+    if args.old:
+        old_data, old_label = load_version(args.old), args.old
+    else:
+        old_data, old_label = load_version(args.artifact, args.rev_from), args.rev_from
+    new_data = load_version(args.artifact, args.rev_to)
+    new_label = args.rev_to or "working tree"
+    if new_data is None:
+        raise SystemExit(f"{args.artifact} not found at {new_label}")
+
+    delta = build_delta(
+        os.path.relpath(os.path.abspath(args.artifact), BASE).replace(os.sep, "/"),
+        old_data, new_data,
+        key_fields=args.key.split(",") if args.key else None,
+        old_label=old_label, new_label=new_label,
+    )
+
+    s = delta["summary"]
+    print(f"  {delta['artifact']}  ({old_label} → {new_label}, key: {'+'.join(delta['key'])})")
+    print(f"  +{s['added']} added  -{s['removed']} removed  ~{s['changed']} changed  ={s['unchanged']} unchanged")
+    field_counts = {}
+    for entry in delta["changed"]:
+        for f in entry["fields"]:
+            field_counts[f] = field_counts.get(f, 0) + 1
+    for f, n in sorted(field_counts.items(), key=lambda x: -x[1])[:10]:
+        print(f"    {f:28s} {n:>6} record(s)")
+
+    if not args.no_write:
+        out = args.output or delta_path(args.artifact)
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        tmp = out + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(delta, f, separators=(",", ":"), ensure_ascii=False)
+        os.replace(tmp, out)
+        print(f"  Delta written to {out} ({os.path.getsize(out) / 1024:,.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Directory Watcher
+==================
+Debounced change batches for a set of directories, driven by Linux inotify
+(through libc, no extra packages) with a polling fallback everywhere else.
+
+Each batch is a dict {path: kind} where kind is "added", "modified" or
+"removed"; a rename shows up as "removed" for the old name and "added" for
+the new one. A batch is yielded once no event has arrived for `debounce`
+seconds, so a burst (copying 50 logos, an editor's save dance) is one batch.
+
+USAGE:
+  sys.path.insert(0, os.path.join(BASE, "src", "scripts"))
+  from file_watch import watch
+
+  for batch in watch(["public/logos/ncaa"], debounce=0.5):
+      for path, kind in batch.items():
+          ...
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+# inotify event masks (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+
+def _inotify_libc():
+    """libc with inotify, or None when unavailable (non-Linux, no libc)."""
+    if not hasattr(select, "poll"):
+        return None
+    name = ctypes.util.find_library("c")
+    if not name:
+        return None
+    try:
+        libc = ctypes.CDLL(name, use_errno=True)
+    except OSError:
+        return None
+    if not (hasattr(libc, "inotify_init1") and hasattr(libc, "inotify_add_watch")):
+        return None
+    return libc
+
+
+class InotifySource:
+    """Raw events from inotify. `rescan` is set when the kernel queue overflowed."""
+
+    def __init__(self, dirs, libc):
+        self.fd = libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+        for d in dirs:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(d), WATCH_MASK)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {d}")
+            self.dirs[wd] = d
+        self.poller = select.poll()
+        self.poller.register(self.fd, select.POLLIN)
+        self.rescan = False
+
+    def read(self, timeout):
+        """Events [(path, kind)] arriving within `timeout` seconds (None = block)."""
+        ready = self.poller.poll(None if timeout is None else timeout * 1000)
+        if not ready:
+            return []
+        buf = os.read(self.fd, 64 * 1024)
+        events, pos = [], 0
+        while pos < len(buf):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(buf, pos)
+            pos += EVENT_HEADER.size
+            name = os.fsdecode(buf[pos:pos + length].rstrip(b"\0"))
+            pos += length
+            if mask & IN_Q_OVERFLOW:
+                self.rescan = True
+                continue
+            if wd not in self.dirs or not name:
+                continue
+            path = os.path.join(self.dirs[wd], name)
+            if mask & (IN_DELETE | IN_MOVED_FROM):
+                events.append((path, "removed"))
+            elif mask & IN_MOVED_TO:
+                events.append((path, "added"))
+            elif mask & IN_CLOSE_WRITE:
+                events.append((path, "modified"))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingSource:
+    """Fallback: diff (mtime, size) listings every `interval` seconds."""
+
+    def __init__(self, dirs, interval=1.0):
+        self.dirs = list(dirs)
+        self.interval = interval
+        self.state = self._listing()
+        self.rescan = False
+
+    def _listing(self):
+        state = {}
+        for d in self.dirs:
+            try:
+                with os.scandir(d) as it:
+                    for entry in it:
+                        if entry.is_file():
+                            st = entry.stat()
+                            state[entry.path] = (st.st_mtime_ns, st.st_size)
+            except FileNotFoundError:
+                pass
+        return state
+
+    def read(self, timeout):
+        time.sleep(self.interval if timeout is None else min(self.interval, timeout))
+        new = self._listing()
+        events = [(p, "removed") for p in self.state.keys() - new.keys()]
+        for p, sig in new.items():
+            old = self.state.get(p)
+            if old is None:
+                events.append((p, "added"))
+            elif old != sig:
+                events.append((p, "modified"))
+        self.state = new
+        return events
+
+    def close(self):
+        pass
+
+
+def open_source(dirs, force_poll=False, poll_interval=1.0):
+    """InotifySource when the platform supports it, else PollingSource."""
+    libc = None if force_poll else _inotify_libc()
+    if libc is not None:
+        try:
+            return InotifySource(dirs, libc)
+        except OSError:
+            pass
+    return PollingSource(dirs, poll_interval)
+
+
+def merge(batch, path, kind):
+    """Fold one event into a pending batch (e.g. added then removed = nothing)."""
+    prev = batch.get(path)
+    if prev == "added" and kind == "removed":
+        del batch[path]
+    elif prev == "added" and kind == "modified":
+        pass
+    elif prev == "removed" and kind in ("added", "modified"):
+        batch[path] = "modified"
+    else:
+        batch[path] = kind
+
+
+def watch(dirs, debounce=0.5, force_poll=False, poll_interval=1.0):
+    """Yield debounced {path: kind} batches forever.
+
+    Yields None instead of a batch when events were lost (inotify queue
+    overflow); callers should then rescan the directories fully.
+    """
+    source = open_source(dirs, force_poll, poll_interval)
+    try:
+        while True:
+            batch = {}
+            for path, kind in source.read(None):
+                merge(batch, path, kind)
+            # Keep collecting until the directory has been quiet for `debounce`
+            while True:
+                more = source.read(debounce)
+                if not more:
+                    break
+                for path, kind in more:
+                    merge(batch, path, kind)
+            if source.rescan:
+                source.rescan = False
+                yield None
+            elif batch:
+                yield batch
+    finally:
+        source.close()
@@ -0,0 +1,281 @@
+"""
+Columnar Game History (Parquet)
+================================
+Exports the betting-lines JSON files to Parquet partitioned by sport and
+season, and loads back only the columns / partitions an analysis needs.
+
+Layout (hive partitioning, one file per partition):
+  src/data/parquet/games/sport=ncaab/season=2026/part-0.parquet   <- games.json
+  src/data/parquet/games/sport=ncaaf/season=2025/...              <- football-games.json
+  src/data/parquet/games/sport=mlb/season=2026/...                <- mlb-games.json
+  src/data/parquet/games/sport=nfl/season=2025/...                <- nfl-games.json
+  src/data/parquet/kalshi/sport=ncaab/season=2026/...             <- kalshi-trades.json "trades"
+
+Each sport keeps its own typed schema (int64 / float64 / bool / string);
+nested values (lists, dicts) are stored as JSON strings. Seasons are named
+by the year they end in for basketball and the year they start in for
+football. A source is re-exported only when its content hash changes.
+
+USAGE:
+  python src/scripts/games_parquet.py                  # export changed sources
+  python src/scripts/games_parquet.py --force          # re-export everything
+  python src/scripts/games_parquet.py --load games --sports ncaab --columns date,home,away,bbmiTotal,actualTotal
+
+  sys.path.insert(0, os.path.join(BASE, "src", "scripts"))
+  from games_parquet import load
+  table = load("games", columns=["bbmiTotal", "vegasTotal", "actualTotal"], sports=["ncaab"], seasons=[2026])
+  rows = table.to_pylist()           # or table.column("actualTotal").to_numpy()
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+BASE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA = os.path.join(BASE, "src", "data")
+LINES = os.path.join(DATA, "betting-lines")
+PARQUET_DIR = os.path.join(DATA, "parquet")
+STATE_FILE = "_export.json"
+
+
+def basketball_season(date):
+    """Nov–Apr season named by the year it ends in."""
+    year, month = int(date[:4]), int(date[5:7])
+    return year + 1 if month >= 7 else year
+
+
+def football_season(date):
+    """Aug–Feb season named by the year it starts in."""
+    year, month = int(date[:4]), int(date[5:7])
+    return year - 1 if month <= 6 else year
+
+
+def calendar_season(date):
+    return int(date[:4])
+
+
+SEASON_RULES = {
+    "ncaab": basketball_season,
+    "ncaaf": football_season,
+    "nfl": football_season,
+    "mlb": calendar_season,
+}
+
+# source -> (dataset, rows extractor, sport of a row, date of a row)
+SOURCES = {
+    "games.json": ("games", lambda d: d, lambda r: "ncaab", lambda r: r.get("date")),
+    "football-games.json": ("games", lambda d: d, lambda r: "ncaaf", lambda r: r.get("gameDate")),
+    "mlb-games.json": ("games", lambda d: d, lambda r: "mlb", lambda r: r.get("date")),
+    "nfl-games.json": ("games", lambda d: d, lambda r: "nfl", lambda r: r.get("date")),
+    "kalshi-trades.json": ("kalshi", lambda d: d.get("trades", []), lambda r: (r.get("sport") or "").lower(),
+                           lambda r: r.get("date")),
+}
+
+
+# ── Export ────────────────────────────────────────────────────────
+
+def column_type(values):
+    """Arrow type for a column's Python values (None is allowed everywhere)."""
+    kinds = {type(v) for v in values if v is not None}
+    if kinds == {bool}:
+        return pa.bool_()
+    if kinds == {int}:
+        return pa.int64()
+    if kinds and kinds <= {int, float}:
+        return pa.float64()
+    return pa.string()
+
+
+def infer_schema(rows):
+    """One schema for every partition of a source, so partitions concatenate."""
+    columns = list(dict.fromkeys(k for r in rows for k in r))
+    return pa.schema([pa.field(name, column_type([r.get(name) for r in rows])) for name in columns])
+
+
+def to_table(rows, schema):
+    """Typed Arrow table; keys missing from a row become nulls."""
+    arrays = []
+    for field in schema:
+        name, typ = field.name, field.type
+        values = [r.get(name) for r in rows]
+        if typ == pa.string():
+            values = [v if v is None or isinstance(v, str) else json.dumps(v, separators=(",", ":"))
+                      for v in values]
+        elif typ == pa.float64():
+            values = [None if v is None else float(v) for v in values]
+        arrays.append(pa.array(values, type=typ))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def export_source(filename, root=PARQUET_DIR):
+    """Write every sport/season partition of one source; returns {(sport, season): rows}."""
+    dataset, extract, sport_of, date_of = SOURCES[filename]
+    with open(os.path.join(LINES, filename), encoding="utf-8") as f:
+        rows = extract(json.load(f))
+
+    partitions = {}
+    for r in rows:
+        sport, date = sport_of(r), date_of(r)
+        if not sport or not date:
+            continue
+        season = r.get("season") if sport == "nfl" and r.get("season") else SEASON_RULES.get(sport, calendar_season)(date)
+        partitions.setdefault((sport, int(season)), []).append(r)
+
+    schema = infer_schema([r for part in partitions.values() for r in part])
+    # Replace this source's sports wholesale so removed seasons disappear
+    for sport in {s for s, _ in partitions}:
+        shutil.rmtree(os.path.join(root, dataset, f"sport={sport}"), ignore_errors=True)
+    for (sport, season), part in sorted(partitions.items()):
+        part_dir = os.path.join(root, dataset, f"sport={sport}", f"season={season}")
+        os.makedirs(part_dir, exist_ok=True)
+        pq.write_table(to_table(part, schema), os.path.join(part_dir, "part-0.parquet"), compression="zstd")
+    return {k: len(v) for k, v in partitions.items()}
+
+
+def export_all(force=False, root=PARQUET_DIR):
+    state_path = os.path.join(root, STATE_FILE)
+    state = {}
+    if os.path.exists(state_path) and not force:
+        with open(state_path) as f:
+            state = json.load(f)
+
+    os.makedirs(root, exist_ok=True)
+    for filename in SOURCES:
+        path = os.path.join(LINES, filename)
+        if not os.path.exists(path):
+            print(f"  {filename:22s} missing — skipped")
+            continue
+        digest = file_hash(path)
+        if state.get(filename) == digest:
+            print(f"  {filename:22s} unchanged")
+            continue
+        counts = export_source(filename, root)
+        state[filename] = digest
+        parts = ", ".join(f"{s}/{y}: {n}" for (s, y), n in sorted(counts.items()))
+        print(f"  {filename:22s} {sum(counts.values()):>6} rows → {parts}")
+
+    with open(state_path, "w") as f:
+        json.dump(state, f, indent=2)
+
+
+# ── Load ──────────────────────────────────────────────────────────
+
+def partition_files(dataset, sports=None, seasons=None, root=PARQUET_DIR):
+    """[(sport, season, path)] for the requested partitions, without opening any file."""
+    base = os.path.join(root, dataset)
+    if not os.path.isdir(base):
+        raise FileNotFoundError(f"No Parquet export at {base} — run games_parquet.py first")
+    wanted_sports = {s.lower() for s in sports} if sports else None
+    wanted_seasons = {int(s) for s in seasons} if seasons else None
+    files = []
+    for sport_dir in sorted(os.listdir(base)):
+        sport = sport_dir.partition("=")[2]
+        if not sport_dir.startswith("sport=") or (wanted_sports and sport not in wanted_sports):
+            continue
+        for season_dir in sorted(os.listdir(os.path.join(base, sport_dir))):
+            season = int(season_dir.partition("=")[2])
+            if wanted_seasons and season not in wanted_seasons:
+                continue
+            part_dir = os.path.join(base, sport_dir, season_dir)
+            for f in sorted(os.listdir(part_dir)):
+                if f.endswith(".parquet"):
+                    files.append((sport, season, os.path.join(part_dir, f)))
+    return files
+
+
+def load(dataset, columns=None, sports=None, seasons=None, root=PARQUET_DIR):
+    """Arrow table of `columns` (default: all) from the requested partitions.
+
+    Only the selected partition files are opened and only the selected
+    column chunks are read. `sport` and `season` columns are always added.
+    Columns a sport does not have come back as nulls.
+    """
+    tables = []
+    for sport, season, path in partition_files(dataset, sports, seasons, root):
+        present = pq.read_schema(path).names
+        cols = present if columns is None else [c for c in columns if c in present]
+        table = ds.dataset(path, format="parquet").to_table(columns=cols)
+        # Partition values win over same-named source columns (nfl-games has "season")
+        table = table.drop_columns([c for c in ("sport", "season") if c in table.column_names])
+        table = table.append_column("sport", pa.array([sport] * table.num_rows, pa.string()))
+        table = table.append_column("season", pa.array([season] * table.num_rows, pa.int32()))
+        tables.append(table)
+    if not tables:
+        return pa.table({})
+    return pa.concat_tables(unify(tables), promote_options="default")
+
+
+def unify(tables):
+    """Cast columns whose type differs between sports: numeric -> float64, otherwise string."""
+    types = {}
+    for t in tables:
+        for field in t.schema:
+            types.setdefault(field.name, set()).add(field.type)
+    target = {}
+    for name, seen in types.items():
+        if len(seen) > 1:
+            numeric = all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in seen)
+            target[name] = pa.float64() if numeric else pa.string()
+    if not target:
+        return tables
+    return [
+        t.cast(pa.schema([pa.field(f.name, target.get(f.name, f.type)) for f in t.schema]))
+        for t in tables
+    ]
+
+
+def bytes_read(dataset, columns=None, sports=None, seasons=None, root=PARQUET_DIR):
+    """(compressed bytes of the selected column chunks, bytes of the whole export)."""
+    selected = {p for _, _, p in partition_files(dataset, sports, seasons, root)}
+    touched = total = 0
+    for _, _, path in partition_files(dataset, root=root):
+        meta = pq.ParquetFile(path).metadata
+        for rg in range(meta.num_row_groups):
+            group = meta.row_group(rg)
+            for c in range(group.num_columns):
+                chunk = group.column(c)
+                total += chunk.total_compressed_size
+                if path in selected and (columns is None or chunk.path_in_schema in columns):
+                    touched += chunk.total_compressed_size
+    return touched, total
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--force", action="store_true", help="Re-export every source")
+    parser.add_argument("--load", metavar="DATASET", help="Load from the export instead (games / kalshi)")
+    parser.add_argument("--columns", help="Comma-separated columns to load")
+    parser.add_argument("--sports", help="Comma-separated sports to load")
+    parser.add_argument("--seasons", help="Comma-separated seasons to load")
+    args = parser.parse_args()
+
+    if not args.load:
+        print("=" * 70)
+        print("PARQUET EXPORT")
+        print("=" * 70)
+        export_all(force=args.force)
+        print(f"\n✅ Done! {PARQUET_DIR}")
+        return
+
+    split = lambda s: s.split(",") if s else None
+    columns, sports, seasons = split(args.columns), split(args.sports), split(args.seasons)
+    table = load(args.load, columns, sports, seasons)
+    touched, total = bytes_read(args.load, columns, sports, seasons)
+    print(f"  {table.num_rows} rows × {table.num_columns} columns")
+    print(f"  Read {touched / 1024:,.1f} KB of {total / 1024:,.1f} KB "
+          f"({100 * touched / total if total else 0:.1f}% of the export)")
+    print(table.slice(0, 5))
+
+
+if __name__ == "__main__":
+    main()
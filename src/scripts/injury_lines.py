@@ -0,0 +1,200 @@
+"""
+Injury-Adjusted NCAA Lines
+===========================
+Applies betting-lines/injuries.json to the unplayed games in games.json,
+re-pricing only the games whose teams' injury lists changed since the last
+run.
+
+Injury → rating:
+  minutes lost   sum of avg_minutes × STATUS_WEIGHTS[status] over a team's
+                 list (unknown minutes count DEFAULT_MINUTES, as on the
+                 Today's Picks page)
+  share          minutes lost / TEAM_MINUTES (200 = 5 players × 40)
+  margin points  share × POINTS_PER_SHARE (a 30-minute starter ≈ 3 points)
+  bbmi delta     -margin points / ncaa_lines.LINE_PER_BBMI
+
+The adjusted ratings go through ncaa_lines.Pricer, so bbmiHomeLine, the
+point projections, bbmiTotal, totalEdge and totalPick stay consistent with
+the line engine.
+
+Each team's injury list is hashed, and the hashes are kept in
+src/data/.injury-lines-state.json together with the fitted points model and
+the prices last written per game. A run re-prices only:
+  - unplayed games involving a team whose hash changed (including teams that
+    dropped off the list), and
+  - unplayed games whose prices no longer match what this script wrote
+    (e.g. ncaa_lines.py --write ran in between)
+The points model is refitted only when ncaa-scores.json changes, so an injury
+update touches a handful of rows and the re-pricing costs milliseconds.
+
+USAGE:
+  python src/scripts/injury_lines.py              # re-price affected games and write games.json
+  python src/scripts/injury_lines.py --dry-run    # show the affected games only
+  python src/scripts/injury_lines.py --all        # re-price every unplayed game
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from artifact_writer import write_json
+from ncaa_lines import LINE_PER_BBMI, LINES_FILE, RANKINGS_FILE, PointsModel, Pricer, apply_prices
+from ncaa_ratings import SCORES_FILE, load_scores
+from team_registry import load_registry
+
+BASE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA = os.path.join(BASE, "src", "data")
+INJURIES_FILE = os.path.join(DATA, "betting-lines", "injuries.json")
+STATE_FILE = os.path.join(DATA, ".injury-lines-state.json")
+
+STATUS_WEIGHTS = {"out": 1.0, "doubtful": 1.0}
+DEFAULT_MINUTES = 3.0
+TEAM_MINUTES = 200.0
+POINTS_PER_SHARE = 20.0
+
+PRICE_FIELDS = ("bbmiHomeLine", "bbmiTotal", "homePtsProj", "awayPtsProj", "totalEdge", "totalPick")
+
+
+def team_hash(players):
+    return hashlib.sha1(json.dumps(players, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def minutes_lost(players):
+    return sum(STATUS_WEIGHTS.get(str(p.get("status", "")).lower(), 0.0)
+               * (p["avg_minutes"] if p.get("avg_minutes") is not None else DEFAULT_MINUTES)
+               for p in players)
+
+
+def injury_adjustment(players):
+    """bbmi delta for a team's injury list (0 when nobody relevant is out)."""
+    points = minutes_lost(players) / TEAM_MINUTES * POINTS_PER_SHARE
+    return -points / LINE_PER_BBMI
+
+
+def game_key(row):
+    return f"{row['date']}|{row['home']}|{row['away']}"
+
+
+def _signature(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+# ── State ─────────────────────────────────────────────────────────
+
+def load_state(path=STATE_FILE):
+    if os.path.exists(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    return {}
+
+
+def save_state(state, path=STATE_FILE):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def points_model(state):
+    """PointsModel from the state unless ncaa-scores.json changed since it was fitted."""
+    signature = _signature(SCORES_FILE)
+    cached = state.get("model")
+    if cached and cached.get("source") == signature:
+        return PointsModel(cached["teams"], np.array(cached["x"]))
+    model = PointsModel.fit(load_scores())
+    x = np.concatenate([model.off, model.dfn, [model.mu, model.home]])
+    state["model"] = {"source": signature, "teams": model.teams, "x": x.tolist()}
+    return model
+
+
+def changed_teams(injuries, registry, old_hashes):
+    """(new hashes, team ids whose injury list changed or disappeared)."""
+    hashes = {team: team_hash(players) for team, players in injuries.items()}
+    names = {team for team in set(hashes) | set(old_hashes) if hashes.get(team) != old_hashes.get(team)}
+    ids = {registry.resolve(team, fuzzy=False) for team in names}
+    ids.discard(None)
+    return hashes, ids
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--all", action="store_true", help="Re-price every unplayed game")
+    parser.add_argument("--dry-run", action="store_true", help="Report the affected games without writing")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  INJURY-ADJUSTED LINES")
+    print("=" * 60)
+    started = time.perf_counter()
+    with open(LINES_FILE, encoding="utf-8") as f:
+        rows = json.load(f)
+    with open(INJURIES_FILE, encoding="utf-8") as f:
+        injuries = json.load(f)
+    with open(RANKINGS_FILE, encoding="utf-8") as f:
+        rankings = json.load(f)
+    state = load_state()
+    registry = load_registry()
+    model = points_model(state)
+    pricer = Pricer(rankings, model, registry)
+    loaded = time.perf_counter()
+
+    hashes, changed = changed_teams(injuries, registry, state.get("teams", {}))
+    written = state.get("rows", {})
+    adjustments = {}
+    for team, players in injuries.items():
+        team_id = registry.resolve(team, fuzzy=False)
+        if team_id is not None:
+            adjustments[team_id] = injury_adjustment(players)
+
+    unplayed = [r for r in rows if r.get("actualHomeScore") is None and r.get("actualAwayScore") is None]
+    affected = []
+    for r in unplayed:
+        if args.all or game_key(r) not in written:
+            affected.append(r)
+            continue
+        ids = {registry.resolve(r["home"], fuzzy=False), registry.resolve(r["away"], fuzzy=False)}
+        if ids & changed or any(r.get(k) != v for k, v in written[game_key(r)].items()):
+            affected.append(r)
+
+    slate = pricer.slate(affected, adjustments)
+    prices = pricer.price(slate)
+    updated = apply_prices(affected, prices, slate["ok"]) if affected else 0
+    priced = time.perf_counter()
+
+    print(f"  Injury lists: {len(injuries)} teams, {len(changed)} changed since last run")
+    print(f"  Unplayed games: {len(unplayed)}, re-priced: {len(affected)}, updated: {updated}")
+    print(f"  Time: {1000 * (priced - loaded):.1f} ms to re-price "
+          f"({1000 * (loaded - started):.0f} ms loading inputs)")
+    for i, r in enumerate(affected[:25]):
+        if not slate["ok"][i]:
+            continue
+        h_adj = adjustments.get(registry.resolve(r["home"], fuzzy=False), 0.0) * LINE_PER_BBMI
+        a_adj = adjustments.get(registry.resolve(r["away"], fuzzy=False), 0.0) * LINE_PER_BBMI
+        print(f"  {r['date']}  {r['away'][:20]:>20s} ({a_adj:+.1f}) @ {r['home'][:20]:<20s} ({h_adj:+.1f})  "
+              f"line {r['bbmiHomeLine']:+.1f}")
+
+    if args.dry_run:
+        print("\n  Dry run: nothing written")
+        return
+    if updated:
+        write_json(LINES_FILE, rows)
+    unplayed_keys = {game_key(r) for r in unplayed}
+    state["teams"] = hashes
+    state["rows"] = {key: v for key, v in written.items() if key in unplayed_keys}
+    for r in affected:
+        state["rows"][game_key(r)] = {k: r.get(k) for k in PRICE_FIELDS}
+    save_state(state)
+    print(f"\n✅ {updated} game(s) updated in {LINES_FILE}" if updated else "\n✅ Lines already current")
+
+
+if __name__ == "__main__":
+    main()
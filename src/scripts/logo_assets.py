@@ -0,0 +1,60 @@
+"""
+Logo Page Assets
+=================
+Per-page manifests of built logo assets, written by build-logo-assets.py and
+imported by the page that renders them (passed to NCAALogo / TeamLogo as
+`assets`). The logo mappings keep only filename / path, so pages that don't
+use built assets don't ship them.
+
+src/data/logo-assets/<league>-<page>.json:
+  {"build": "/logos/ncaa/build", "sizes": [32, 64, 128, 256],
+   "sprite": {"sheet": url, "cell": 64, "width": w, "height": h},
+   "logos": {key: {"file": "duke.png", "hash": "1a2b3c4d5e", "x": 0, "y": 0}}}
+
+A logo's variant URL is <build>/<file stem>-<size>.<hash>.png, so an entry
+only carries its hash and sprite cell.
+
+USAGE:
+  sys.path.insert(0, os.path.join(BASE, "src", "scripts"))
+  from logo_assets import drop_logos
+
+  drop_logos("ncaa", ["Duke"])   # logo replaced: pages show its path until the next build
+"""
+import glob
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from artifact_writer import write_json
+
+BASE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PAGE_ASSETS_DIR = os.path.join(BASE, "src", "data", "logo-assets")
+
+
+def manifest_path(league, page):
+    return os.path.join(PAGE_ASSETS_DIR, f"{league}-{page}.json")
+
+
+def load_page_assets(path):
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def drop_logos(league, keys):
+    """Remove `keys` from every page manifest of `league`; returns the number of entries dropped."""
+    keys = set(keys)
+    dropped = 0
+    for path in sorted(glob.glob(manifest_path(league, "*"))):
+        assets = load_page_assets(path)
+        logos = assets.get("logos", {})
+        stale = keys & set(logos)
+        if not stale:
+            continue
+        for key in stale:
+            del logos[key]
+        write_json(path, assets, quiet=True)
+        dropped += len(stale)
+    return dropped
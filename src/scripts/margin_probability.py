@@ -0,0 +1,230 @@
+"""
+Margin Probability Engine
+==========================
+Turns model margins into home win probability and home cover probability
+against the Vegas line, for whole slates at once.
+
+The margin distribution of each sport is fitted from its own history: the
+residuals (actual home margin - model margin) of completed games, summarised
+with bbmi_metrics.error_report exactly as compute_rmse.py does. The actual
+margin is modelled as Normal(model margin - bias, sd) with
+sd = sqrt(rmse² - bias²); the residuals of all three sports have kurtosis
+≈ 3.3, close enough to normal for pricing.
+
+  win probability    P(margin > 0)
+  cover probability  P(margin + vegas home line > 0), with the integer
+                     margin treated discretely: a whole-number line can push,
+                     and the push probability is returned separately
+
+Fitted distributions are cached per sport in src/data/.margin-distributions.json
+and refitted only when the sport's source file changes.
+
+USAGE:
+  python src/scripts/margin_probability.py                       # fit / load every sport, price upcoming games
+  python src/scripts/margin_probability.py --sport football
+  python src/scripts/margin_probability.py --refit               # ignore the cache
+
+  sys.path.insert(0, os.path.join(BASE, "src", "scripts"))
+  from margin_probability import load_distribution
+  dist = load_distribution("basketball")
+  win = dist.win_prob(margins)
+  cover, push = dist.cover_prob(margins, vegas_home_lines)
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bbmi_metrics import brier, error_report
+
+BASE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA = os.path.join(BASE, "src", "data")
+LINES_DIR = os.path.join(DATA, "betting-lines")
+CACHE_FILE = os.path.join(DATA, ".margin-distributions.json")
+
+# Per sport: source file, field names, and the sign that turns the model field
+# into a home margin (lines are negative when the home side is favoured).
+SPORTS = {
+    "basketball": {"file": "games.json", "model": "bbmiHomeLine", "sign": -1,
+                   "line": "vegasHomeLine", "win": "bbmiWinProb"},
+    "football": {"file": "football-games.json", "model": "bbmiHomeLine", "sign": -1,
+                 "line": "vegasHomeLine", "win": "homeWinPct"},
+    "mlb": {"file": "mlb-games.json", "model": "bbmiMargin", "sign": 1,
+            "line": "vegasRunLine", "win": "homeWinPct"},
+}
+
+
+def normal_cdf(z):
+    """Standard normal CDF, vectorized (Abramowitz & Stegun 7.1.26, |error| < 1.5e-7)."""
+    z = np.asarray(z, dtype=float)
+    x = np.abs(z) / np.sqrt(2)
+    t = 1 / (1 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1 - poly * np.exp(-x * x)
+    return 0.5 * (1 + np.sign(z) * erf)
+
+
+class MarginDistribution:
+    """Normal residual model for one sport: actual margin ~ N(model margin + shift, sd)."""
+
+    def __init__(self, shift, sd, n=0):
+        self.shift = float(shift)
+        self.sd = float(sd)
+        self.n = int(n)
+
+    @classmethod
+    def fit(cls, model_margin, actual_margin):
+        report = error_report(model_margin, actual_margin)
+        sd = np.sqrt(max(report["rmse"] ** 2 - report["bias"] ** 2, 1e-12))
+        return cls(-report["bias"], sd, report["n"])
+
+    def to_dict(self):
+        return {"shift": self.shift, "sd": self.sd, "n": self.n}
+
+    def cdf(self, margin, x):
+        """P(actual margin <= x) given the model margin (arrays broadcast)."""
+        return normal_cdf((np.asarray(x, dtype=float) - np.asarray(margin, dtype=float) - self.shift) / self.sd)
+
+    def win_prob(self, margin):
+        """P(home wins) for model home margins."""
+        return 1 - self.cdf(margin, 0.0)
+
+    def cover_prob(self, margin, home_line):
+        """(P(home covers), P(push)) against vegas home lines; NaN lines give NaN."""
+        need = -np.asarray(home_line, dtype=float)  # home covers when margin > need
+        # Margins are whole numbers: covering means margin >= floor(need) + 1
+        threshold = np.floor(need) + 0.5
+        cover = 1 - self.cdf(margin, threshold)
+        whole = need == np.floor(need)
+        push = np.where(whole, self.cdf(margin, need + 0.5) - self.cdf(margin, need - 0.5), 0.0)
+        return cover, np.where(np.isnan(need), np.nan, push)
+
+
+# ── Per-sport fitting and cache ───────────────────────────────────
+
+def _source(sport):
+    return os.path.join(LINES_DIR, SPORTS[sport]["file"])
+
+
+def _signature(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _load_rows(sport):
+    with open(_source(sport), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def model_margins(sport, rows):
+    """Model home margin for each row (NaN where the model field is missing)."""
+    spec = SPORTS[sport]
+    return np.array([spec["sign"] * float(r[spec["model"]]) if r.get(spec["model"]) is not None else np.nan
+                     for r in rows])
+
+
+def fit_sport(sport, rows=None):
+    rows = _load_rows(sport) if rows is None else rows
+    spec = SPORTS[sport]
+    done = [r for r in rows if r.get("actualHomeScore") is not None and r.get("actualAwayScore") is not None
+            and r.get(spec["model"]) is not None]
+    if not done:
+        raise ValueError(f"No completed {sport} games with {spec['model']} to fit")
+    actual = np.array([r["actualHomeScore"] - r["actualAwayScore"] for r in done], dtype=float)
+    return MarginDistribution.fit(model_margins(sport, done), actual)
+
+
+def _read_cache():
+    if os.path.exists(CACHE_FILE):
+        try:
+            with open(CACHE_FILE, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    return {}
+
+
+def load_distribution(sport, refit=False):
+    """Fitted MarginDistribution for a sport, from the cache unless the source file changed."""
+    if sport not in SPORTS:
+        raise ValueError(f"Unknown sport {sport!r} (expected one of {', '.join(SPORTS)})")
+    cache = _read_cache()
+    signature = _signature(_source(sport))
+    entry = cache.get(sport)
+    if not refit and entry and entry.get("source") == signature:
+        return MarginDistribution(entry["shift"], entry["sd"], entry.get("n", 0))
+
+    dist = fit_sport(sport)
+    cache[sport] = {**dist.to_dict(), "source": signature}
+    tmp = CACHE_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp, CACHE_FILE)
+    return dist
+
+
+def price_rows(sport, rows, dist=None):
+    """{"margin", "win", "cover", "push"} arrays for a list of rows of a sport's games file."""
+    dist = dist or load_distribution(sport)
+    line_field = SPORTS[sport]["line"]
+    margin = model_margins(sport, rows)
+    line = np.array([float(r[line_field]) if r.get(line_field) is not None else np.nan for r in rows])
+    cover, push = dist.cover_prob(margin, line)
+    return {"margin": margin, "win": dist.win_prob(margin), "cover": cover, "push": push}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sport", choices=list(SPORTS), help="Only this sport (default: all)")
+    parser.add_argument("--refit", action="store_true", help="Refit the distributions, ignoring the cache")
+    parser.add_argument("--show", type=int, default=10, help="Upcoming games to list per sport")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  MARGIN PROBABILITY ENGINE")
+    print("=" * 60)
+    for sport in [args.sport] if args.sport else SPORTS:
+        spec = SPORTS[sport]
+        started = time.perf_counter()
+        dist = load_distribution(sport, refit=args.refit)
+        load_ms = 1000 * (time.perf_counter() - started)
+        rows = _load_rows(sport)
+
+        started = time.perf_counter()
+        priced = price_rows(sport, rows, dist)
+        price_ms = 1000 * (time.perf_counter() - started)
+
+        print(f"\n📊 {sport}: residual sd {dist.sd:.2f}, shift {dist.shift:+.2f} "
+              f"from {dist.n:,} games ({load_ms:.1f} ms to load/fit)")
+        print(f"   Priced {len(rows):,} rows in {price_ms:.2f} ms")
+
+        # How the engine's win probability compares with the spreadsheet's on played games
+        done = np.array([r.get("actualHomeScore") is not None and r.get("actualAwayScore") is not None
+                         and r.get(spec["win"]) is not None for r in rows]) & np.isfinite(priced["win"])
+        if done.any():
+            played = [r for r, d in zip(rows, done) if d]
+            outcome = np.array([r["actualHomeScore"] > r["actualAwayScore"] for r in played], dtype=float)
+            sheet = np.array([float(r[spec["win"]]) for r in played])
+            sheet = sheet / 100 if sheet.max() > 1 else sheet
+            print(f"   Brier on {len(played):,} played games: engine {brier(priced['win'][done], outcome):.4f}, "
+                  f"{spec['win']} {brier(sheet, outcome):.4f}")
+
+        upcoming = [i for i, r in enumerate(rows) if r.get("actualHomeScore") is None
+                    and np.isfinite(priced["margin"][i])][:args.show]
+        for i in upcoming:
+            r = rows[i]
+            home = r.get("home") or r.get("homeTeam")
+            away = r.get("away") or r.get("awayTeam")
+            date = r.get("date") or r.get("gameDate")
+            cover = priced["cover"][i]
+            cover_txt = "" if np.isnan(cover) else f"cover {cover:.3f} @ {r[spec['line']]:+g}"
+            print(f"   {date}  {away[:20]:>20s} @ {home[:20]:<20s} margin {priced['margin'][i]:+6.2f}  "
+                  f"win {priced['win'][i]:.3f}  {cover_txt}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,10 @@ USAGE:
   cd c:/Users/andre/dev/my-app
   python -X utf8 -u src/scripts/ml_diagnostics_all_sports.py
 """
-import json, numpy as np, os
+import json, numpy as np, os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bbmi_metrics import calibration_table, pick_side, probability_report, threshold_sweep
 
 BASE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 DATA = os.path.join(BASE, "src", "data", "betting-lines")
@@ -15,7 +18,7 @@ DATA = os.path.join(BASE, "src", "data", "betting-lines")
 
 def calibration_check(games, prob_field, label):
     """Check win probability calibration: model prob vs actual win rate."""
-    valid = []
+    rows = []
     for g in games:
         prob = g.get(prob_field)
         hs = g.get("actualHomeScore")
@@ -24,128 +27,94 @@ def calibration_check(games, prob_field, label):
             continue
         if hs == as_:
             continue
-        # Normalize prob to 0-1 range
-        p = float(prob)
-        if p > 1:
-            p = p / 100  # convert percentage to decimal
-        home_won = hs > as_
-        # Use the picked side (whichever > 50%)
-        if p >= 0.5:
-            pick_prob = p
-            pick_won = home_won
-        else:
-            pick_prob = 1 - p
-            pick_won = not home_won
-        valid.append({"prob": pick_prob, "won": pick_won, "home_won": home_won, "raw_prob": p})
-
-    print(f"\n  {label}: {len(valid)} games with win prob + results")
-
-    if len(valid) < 50:
+        rows.append((float(prob), hs > as_))
+
+    print(f"\n  {label}: {len(rows)} games with win prob + results")
+
+    if len(rows) < 50:
         print("  Insufficient data")
-        return valid
+        return None
+
+    raw = np.array([r[0] for r in rows])
+    home_won = np.array([r[1] for r in rows], dtype=float)
+    # Normalize prob to 0-1 range (convert percentage to decimal)
+    p = np.where(raw > 1, raw / 100, raw)
+    # Use the picked side (whichever > 50%)
+    pick_prob, pick_won = pick_side(p, home_won)
 
     # Calibration by bucket
     print(f"  {'Bucket':>10s} {'N':>5s} {'Model':>7s} {'Actual':>8s} {'Gap':>7s}")
     print(f"  {'-'*40}")
-    for lo in range(50, 95, 5):
-        hi = lo + 5
-        bucket = [v for v in valid if lo <= v["prob"] * 100 < hi]
-        if len(bucket) < 10:
-            continue
-        model_avg = np.mean([v["prob"] for v in bucket]) * 100
-        actual = sum(1 for v in bucket if v["won"]) / len(bucket) * 100
+    edges = np.arange(50, 100, 5)
+    for row in calibration_table(pick_prob * 100, pick_won, edges=edges, min_count=10):
+        lo, hi = int(row["lo"]), int(row["hi"])
+        model_avg = row["model"]
+        actual = row["actual"] * 100
         gap = actual - model_avg
-        print(f"  {lo}-{hi}%  {len(bucket):>5d} {model_avg:>6.1f}% {actual:>7.1f}% {gap:>+6.1f}")
+        print(f"  {lo}-{hi}%  {row['n']:>5d} {model_avg:>6.1f}% {actual:>7.1f}% {gap:>+6.1f}")
 
     # Overall
-    total_w = sum(1 for v in valid if v["won"])
-    print(f"\n  Overall pick rate: {total_w}/{len(valid)} = {total_w/len(valid)*100:.1f}%")
+    report = probability_report(p, home_won, edges=np.linspace(0.5, 1.0, 11))
+    total_w = int(pick_won.sum())
+    print(f"\n  Overall pick rate: {total_w}/{len(rows)} = {total_w/len(rows)*100:.1f}%")
+    print(f"  Brier: {report['brier']:.4f}  Log loss: {report['log_loss']:.4f}  "
+          f"ECE: {report['ece']*100:.1f}%  Pick-side AUC: {report['pick_auc']:.3f}")
 
-    return valid
+    return report
+
+
+def american_to_prob(ml):
+    """Implied probability of American odds (0 = even)."""
+    risk = np.abs(ml) + 100
+    return np.where(ml > 0, 100 / risk, np.where(ml < 0, np.abs(ml) / risk, 0.5))
+
+
+def american_to_decimal(ml):
+    """Decimal odds of American odds (0 = even)."""
+    safe = np.where(ml == 0, 1.0, ml)
+    return np.where(ml > 0, safe / 100 + 1, np.where(ml < 0, 100 / -safe + 1, 2.0))
 
 
 def ml_edge_sweep(games, prob_field, ml_home_field, ml_away_field, label):
     """Full ML edge sweep with actual odds (only for sports with ML data)."""
-    valid = []
-    for g in games:
-        prob = g.get(prob_field)
-        hs = g.get("actualHomeScore")
-        as_ = g.get("actualAwayScore")
-        ml_h = g.get(ml_home_field)
-        ml_a = g.get(ml_away_field)
-        if any(v is None for v in [prob, hs, as_, ml_h, ml_a]):
-            continue
-        if hs == as_:
-            continue
-
-        p = float(prob)
-        if p > 1:
-            p = p / 100
-
-        # Convert American ML to implied prob
-        def ml_to_prob(ml):
-            ml = float(ml)
-            if ml > 0:
-                return 100 / (ml + 100)
-            elif ml < 0:
-                return abs(ml) / (abs(ml) + 100)
-            return 0.5
-
-        def ml_to_decimal(ml):
-            ml = float(ml)
-            if ml > 0:
-                return (ml / 100) + 1
-            elif ml < 0:
-                return (100 / abs(ml)) + 1
-            return 2.0
-
-        v_hp = ml_to_prob(ml_h)
-        v_ap = ml_to_prob(ml_a)
-        vig = v_hp + v_ap
-        v_hf = v_hp / vig
-        v_af = v_ap / vig
-
-        home_edge = p - v_hf
-        away_edge = (1 - p) - v_af
-        home_won = hs > as_
-
-        if home_edge > away_edge:
-            pick = "HOME"
-            edge = home_edge
-            pick_won = home_won
-            pick_odds_dec = ml_to_decimal(ml_h)
-            pick_odds_am = ml_h
-        else:
-            pick = "AWAY"
-            edge = away_edge
-            pick_won = not home_won
-            pick_odds_dec = ml_to_decimal(ml_a)
-            pick_odds_am = ml_a
-
-        valid.append({
-            "edge": edge, "won": pick_won,
-            "odds_dec": pick_odds_dec, "odds_am": pick_odds_am,
-            "prob": p if pick == "HOME" else 1 - p,
-        })
-
-    print(f"\n  {label} — ML Edge Sweep: {len(valid)} games")
-
-    if len(valid) < 50:
+    rows = [(g[prob_field], g["actualHomeScore"], g["actualAwayScore"], g[ml_home_field], g[ml_away_field])
+            for g in games
+            if all(g.get(k) is not None for k in (prob_field, "actualHomeScore", "actualAwayScore",
+                                                   ml_home_field, ml_away_field))
+            and g["actualHomeScore"] != g["actualAwayScore"]]
+    print(f"\n  {label} — ML Edge Sweep: {len(rows)} games")
+
+    if len(rows) < 50:
         print("  Insufficient ML data")
-        return
+        return None
+
+    raw, hs, as_, ml_h, ml_a = np.array(rows, dtype=float).T
+    p = np.where(raw > 1, raw / 100, raw)
+    home_won = hs > as_
+
+    # Vig-free market probabilities from the two American prices
+    v_hp, v_ap = american_to_prob(ml_h), american_to_prob(ml_a)
+    vig = v_hp + v_ap
+    home_edge = p - v_hp / vig
+    away_edge = (1 - p) - v_ap / vig
+
+    pick_home = home_edge > away_edge
+    edge = np.where(pick_home, home_edge, away_edge)
+    won = np.where(pick_home, home_won, ~home_won)
+    odds_dec = american_to_decimal(np.where(pick_home, ml_h, ml_a))
+    profit = np.where(won, odds_dec - 1, -1.0)
 
     print(f"  {'Edge':>6s} {'N':>5s} {'Win%':>7s} {'ROI':>7s}")
     print(f"  {'-'*28}")
 
-    for pct in [1, 2, 3, 5, 7, 10, 15, 20]:
-        thresh = pct / 100
-        picks = [v for v in valid if v["edge"] >= thresh]
-        if len(picks) < 10:
+    pcts = [1, 2, 3, 5, 7, 10, 15, 20]
+    sweep = threshold_sweep(edge, won, profit, [pct / 100 for pct in pcts])
+    for pct, row in zip(pcts, sweep):
+        n = row["n"]
+        if n < 10:
             continue
-        w = sum(1 for v in picks if v["won"])
-        n = len(picks)
-        profit = sum((v["odds_dec"] - 1) if v["won"] else -1 for v in picks)
-        print(f"  {pct:>5d}% {n:>5d} {w/n*100:>6.1f}% {profit/n*100:>+6.1f}%")
+        print(f"  {pct:>5d}% {n:>5d} {row['wins']/n*100:>6.1f}% {row['profit']/n*100:>+6.1f}%")
+    return sweep
 
 
 def main():
@@ -0,0 +1,475 @@
+"""
+MLB Playoff Simulator — Incremental
+=====================================
+Monte Carlo season + postseason simulation that writes mlb-playoff-probs.json.
+
+The sampled outcome of every remaining game is kept in a bit-packed
+games x sims matrix (src/data/.mlb-playoff-sim-cache.npz) together with the
+per-sim win totals. On the next run:
+  - games that went final are conditioned on by flipping only the sims whose
+    sampled winner disagrees with the actual winner,
+  - finals the matrix never sampled (added to the schedule and played between
+    runs) are counted as a fixed win in every sim, and a corrected final score
+    swaps the fixed win to the new winner,
+  - games whose win probability moved are resampled column by column,
+  - new / cancelled games are added / removed,
+so a refresh after a handful of finals costs O(sims x changed games) instead
+of re-simulating the whole schedule. The postseason is re-drawn each run from
+the updated win totals (it is cheap and fully vectorized).
+
+USAGE:
+  cd c:/Users/andre/dev/my-app
+  python -X utf8 -u src/scripts/mlb_playoff_sim.py
+  python -X utf8 -u src/scripts/mlb_playoff_sim.py --sims 1000000
+  python -X utf8 -u src/scripts/mlb_playoff_sim.py --rebuild
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from artifact_writer import write_json
+
+BASE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA = os.path.join(BASE, "src", "data")
+GAMES_FILE = os.path.join(DATA, "betting-lines", "mlb-games.json")
+RANKINGS_FILE = os.path.join(DATA, "rankings", "mlb-rankings.json")
+OUTPUT_FILE = os.path.join(DATA, "mlb-playoff-probs.json")
+CACHE_FILE = os.path.join(DATA, ".mlb-playoff-sim-cache.npz")
+
+DEFAULT_SIMS = 10000
+SEED = 20260325
+
+# logit(homeWinPct) ~ HOME_LOGIT + RATING_LOGIT_SCALE * (home bbmi_score - away bbmi_score)
+# Fitted on the 2026 games that carry a model homeWinPct.
+HOME_LOGIT = 0.046
+RATING_LOGIT_SCALE = 0.016
+
+# Probability changes smaller than this keep the cached column as-is
+PROB_TOLERANCE = 0.005
+
+# Schedule names that differ from mlb-rankings.json keys
+TEAM_ALIASES = {
+    "Athletics": "Oakland Athletics",
+}
+
+DIVISIONS = {
+    "AL East":    ["Baltimore Orioles", "Boston Red Sox", "New York Yankees", "Tampa Bay Rays", "Toronto Blue Jays"],
+    "AL Central": ["Chicago White Sox", "Cleveland Guardians", "Detroit Tigers", "Kansas City Royals", "Minnesota Twins"],
+    "AL West":    ["Houston Astros", "Los Angeles Angels", "Oakland Athletics", "Seattle Mariners", "Texas Rangers"],
+    "NL East":    ["Atlanta Braves", "Miami Marlins", "New York Mets", "Philadelphia Phillies", "Washington Nationals"],
+    "NL Central": ["Chicago Cubs", "Cincinnati Reds", "Milwaukee Brewers", "Pittsburgh Pirates", "St. Louis Cardinals"],
+    "NL West":    ["Arizona Diamondbacks", "Colorado Rockies", "Los Angeles Dodgers", "San Diego Padres", "San Francisco Giants"],
+}
+
+TEAMS = sorted(t for teams in DIVISIONS.values() for t in teams)
+TEAM_INDEX = {t: i for i, t in enumerate(TEAMS)}
+TEAM_DIVISION = {t: div for div, teams in DIVISIONS.items() for t in teams}
+
+
+def canonical(team):
+    return TEAM_ALIASES.get(team, team)
+
+
+# ── Inputs ────────────────────────────────────────────────────────
+
+def load_inputs(games_path=GAMES_FILE):
+    with open(games_path) as f:
+        games = json.load(f)
+    with open(RANKINGS_FILE) as f:
+        rankings = json.load(f)
+    ratings = np.array([float(rankings[t]["bbmi_score"]) for t in TEAMS])
+    return games, ratings
+
+
+def game_home_prob(g, ratings):
+    """Model home win probability, falling back to the rating logit."""
+    p = g.get("homeWinPct")
+    if p is not None:
+        p = float(p)
+        return p / 100 if p > 1 else p
+    h = TEAM_INDEX[canonical(g["homeTeam"])]
+    a = TEAM_INDEX[canonical(g["awayTeam"])]
+    return 1.0 / (1.0 + np.exp(-(HOME_LOGIT + RATING_LOGIT_SCALE * (ratings[h] - ratings[a]))))
+
+
+def split_schedule(games, ratings):
+    """Return current W/L arrays, finals by gameId as (home, away, home_won) and remaining games."""
+    wins = np.zeros(len(TEAMS), dtype=np.int32)
+    losses = np.zeros(len(TEAMS), dtype=np.int32)
+    finals = {}
+    remaining = {}
+    for g in games:
+        h = TEAM_INDEX.get(canonical(g.get("homeTeam", "")))
+        a = TEAM_INDEX.get(canonical(g.get("awayTeam", "")))
+        if h is None or a is None:
+            continue
+        gid = str(g["gameId"])
+        hs, as_ = g.get("actualHomeScore"), g.get("actualAwayScore")
+        if hs is not None and as_ is not None:
+            if hs == as_:
+                continue
+            home_won = hs > as_
+            finals[gid] = (h, a, home_won)
+            w, l = (h, a) if home_won else (a, h)
+            wins[w] += 1
+            losses[l] += 1
+        else:
+            remaining[gid] = (h, a, game_home_prob(g, ratings))
+    return wins, losses, finals, remaining
+
+
+# ── Outcome matrix ────────────────────────────────────────────────
+
+class OutcomeMatrix:
+    """Sampled home-win bits for every pending game, plus per-sim win totals.
+
+    bits[j] holds np.packbits of the n_sims booleans for game j, so a single
+    game's outcomes can be read or replaced without touching the rest.
+    sim_wins[t, s] is team t's simulated final win total in sim s.
+    finals maps every final already counted in sim_wins to (home, away, home_won).
+    """
+
+    def __init__(self, n_sims, game_ids, home, away, probs, bits, sim_wins, jitter, finals):
+        self.n_sims = n_sims
+        self.game_ids = list(game_ids)
+        self.slot = {gid: j for j, gid in enumerate(self.game_ids)}
+        self.home = np.asarray(home, dtype=np.int16)
+        self.away = np.asarray(away, dtype=np.int16)
+        self.probs = np.asarray(probs, dtype=np.float64)
+        self.bits = bits
+        self.sim_wins = sim_wins
+        self.jitter = jitter
+        self.finals = dict(finals)
+
+    @classmethod
+    def build(cls, n_sims, base_wins, finals, remaining, rng):
+        game_ids = list(remaining)
+        home = [remaining[g][0] for g in game_ids]
+        away = [remaining[g][1] for g in game_ids]
+        probs = [remaining[g][2] for g in game_ids]
+        bits = np.zeros((len(game_ids), (n_sims + 7) // 8), dtype=np.uint8)
+        sim_wins = np.repeat(base_wins.astype(np.int16)[:, None], n_sims, axis=1)
+        for j, p in enumerate(probs):
+            outcome = rng.random(n_sims) < p
+            bits[j] = np.packbits(outcome)
+            sim_wins[home[j]] += outcome
+            sim_wins[away[j]] += ~outcome
+        # Fixed per-sim tiebreak so seeding ties resolve the same way across refreshes
+        jitter = rng.random((len(TEAMS), n_sims)).astype(np.float32) * 0.5
+        return cls(n_sims, game_ids, home, away, probs, bits, sim_wins, jitter, finals)
+
+    def outcome(self, j):
+        return np.unpackbits(self.bits[j], count=self.n_sims).astype(bool)
+
+    def _apply(self, j, outcome, sign):
+        self.sim_wins[self.home[j]] += sign * outcome
+        self.sim_wins[self.away[j]] += sign * ~outcome
+
+    def condition(self, gid, home_won):
+        """Fix a pending game to its actual result; only disagreeing sims move."""
+        j = self.slot[gid]
+        wrong = self.outcome(j) != home_won
+        winner, loser = (self.home[j], self.away[j]) if home_won else (self.away[j], self.home[j])
+        self.sim_wins[winner] += wrong
+        self.sim_wins[loser] -= wrong
+        self.finals[gid] = (int(self.home[j]), int(self.away[j]), bool(home_won))
+        self._drop(j)
+
+    def fix(self, gid, h, a, home_won):
+        """Count a final the matrix never sampled as a win in every sim."""
+        self.sim_wins[h if home_won else a] += 1
+        self.finals[gid] = (h, a, bool(home_won))
+
+    def unfix(self, gid):
+        """Take a previously counted final back out of every sim."""
+        h, a, home_won = self.finals.pop(gid)
+        self.sim_wins[h if home_won else a] -= 1
+
+    def resample(self, gid, p, rng):
+        j = self.slot[gid]
+        self._apply(j, self.outcome(j), -1)
+        outcome = rng.random(self.n_sims) < p
+        self.bits[j] = np.packbits(outcome)
+        self.probs[j] = p
+        self._apply(j, outcome, 1)
+
+    def remove(self, gid):
+        j = self.slot[gid]
+        self._apply(j, self.outcome(j), -1)
+        self._drop(j)
+
+    def add(self, gid, h, a, p, rng):
+        outcome = rng.random(self.n_sims) < p
+        self.game_ids.append(gid)
+        self.slot[gid] = len(self.game_ids) - 1
+        self.home = np.append(self.home, np.int16(h))
+        self.away = np.append(self.away, np.int16(a))
+        self.probs = np.append(self.probs, p)
+        self.bits = np.vstack([self.bits, np.packbits(outcome)[None, :]])
+        self._apply(len(self.game_ids) - 1, outcome, 1)
+
+    def _drop(self, j):
+        # Mark the slot dead; compact() removes dead rows before saving
+        self.slot.pop(self.game_ids[j])
+        self.game_ids[j] = None
+
+    def compact(self):
+        keep = [j for j, gid in enumerate(self.game_ids) if gid is not None]
+        self.game_ids = [self.game_ids[j] for j in keep]
+        self.slot = {gid: j for j, gid in enumerate(self.game_ids)}
+        self.home = self.home[keep]
+        self.away = self.away[keep]
+        self.probs = self.probs[keep]
+        self.bits = self.bits[keep]
+
+    def save(self, path, rng):
+        self.compact()
+        tmp = path + ".tmp.npz"
+        np.savez(
+            tmp,
+            n_sims=self.n_sims,
+            teams=np.array(TEAMS),
+            game_ids=np.array(self.game_ids, dtype=str),
+            home=self.home, away=self.away, probs=self.probs,
+            bits=self.bits, sim_wins=self.sim_wins, jitter=self.jitter,
+            final_ids=np.array(list(self.finals), dtype=str),
+            finals=np.array(list(self.finals.values()), dtype=np.int16).reshape(-1, 3),
+            rng_state=np.array(json.dumps(rng.bit_generator.state)),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as z:
+            # Caches without the counted finals cannot be refreshed safely
+            if list(z["teams"]) != TEAMS or "final_ids" not in z:
+                return None, None
+            finals = {str(g): (int(h), int(a), bool(w)) for g, (h, a, w) in zip(z["final_ids"], z["finals"])}
+            m = cls(int(z["n_sims"]), [str(g) for g in z["game_ids"]], z["home"], z["away"],
+                    z["probs"], z["bits"].copy(), z["sim_wins"].copy(), z["jitter"].copy(), finals)
+            rng = np.random.default_rng()
+            rng.bit_generator.state = json.loads(str(z["rng_state"]))
+        return m, rng
+
+
+def refresh(matrix, finals, remaining, rng):
+    """Bring a cached matrix in line with the current schedule. Returns change counts."""
+    stats = {"conditioned": 0, "fixed": 0, "corrected": 0, "resampled": 0, "added": 0, "removed": 0}
+    # Counted finals that were corrected, or are no longer final (tie, postponed, dropped)
+    for gid in list(matrix.finals):
+        if finals.get(gid) != matrix.finals[gid]:
+            matrix.unfix(gid)
+            if gid in finals:
+                matrix.fix(gid, *finals[gid])
+                stats["corrected"] += 1
+    for gid in list(matrix.slot):
+        if gid in finals:
+            matrix.condition(gid, finals[gid][2])
+            stats["conditioned"] += 1
+        elif gid not in remaining:
+            matrix.remove(gid)
+            stats["removed"] += 1
+        elif abs(remaining[gid][2] - matrix.probs[matrix.slot[gid]]) > PROB_TOLERANCE:
+            matrix.resample(gid, remaining[gid][2], rng)
+            stats["resampled"] += 1
+    # Finals the matrix never sampled: scheduled and played between runs
+    for gid, (h, a, home_won) in finals.items():
+        if gid not in matrix.finals:
+            matrix.fix(gid, h, a, home_won)
+            stats["fixed"] += 1
+    for gid, (h, a, p) in remaining.items():
+        if gid not in matrix.slot:
+            matrix.add(gid, h, a, p, rng)
+            stats["added"] += 1
+    return stats
+
+
+# ── Postseason ────────────────────────────────────────────────────
+
+def series_win_prob(p, games_needed):
+    """P(team wins a best-of-(2n-1) series) given per-game win probability p."""
+    from math import comb
+    q = 1 - p
+    return sum(comb(games_needed - 1 + k, k) * p ** games_needed * q ** k for k in range(games_needed))
+
+
+def series_table(ratings, games_needed):
+    diff = ratings[:, None] - ratings[None, :]
+    p = 1.0 / (1.0 + np.exp(-RATING_LOGIT_SCALE * diff))
+    return series_win_prob(p, games_needed)
+
+
+def play_series(a, b, table, rng):
+    """Vectorized series: a, b are per-sim team indices; returns winners."""
+    a_wins = rng.random(a.shape[0]) < table[a, b]
+    return np.where(a_wins, a, b)
+
+
+def seed_league(key, league):
+    """Return (n_sims, 6) seeds and division-winner indices for one league."""
+    n = key.shape[1]
+    div_names = [d for d in DIVISIONS if d.startswith(league)]
+    winners = np.empty((len(div_names), n), dtype=np.int64)
+    for i, div in enumerate(div_names):
+        idx = np.array([TEAM_INDEX[t] for t in DIVISIONS[div]])
+        winners[i] = idx[np.argmax(key[idx], axis=0)]
+
+    cols = np.arange(n)
+    win_keys = key[winners, cols]
+    order = np.argsort(-win_keys, axis=0)
+    top3 = winners[order, cols]
+
+    league_idx = np.array([TEAM_INDEX[t] for d in div_names for t in DIVISIONS[d]])
+    wc_key = key[league_idx].copy()
+    is_winner = (league_idx[:, None, None] == winners[None, :, :]).any(axis=1)
+    wc_key[is_winner] = -np.inf
+    wc = league_idx[np.argsort(-wc_key, axis=0)[:3]]
+    return np.vstack([top3, wc]).T, winners
+
+
+def simulate_postseason(matrix, ratings, rng):
+    n = matrix.n_sims
+    key = matrix.sim_wins.astype(np.float32) + matrix.jitter
+    bo3, bo5, bo7 = (series_table(ratings, k) for k in (2, 3, 4))
+
+    counts = {k: np.zeros(len(TEAMS), dtype=np.int64) for k in
+              ("playoff", "division", "wildcard", "lds", "lcs", "ws", "champion")}
+    seed_counts = {}
+    pennant = {}
+    for league in ("AL", "NL"):
+        seeds, winners = seed_league(key, league)
+        seed_counts[league] = seeds
+        np.add.at(counts["division"], winners.ravel(), 1)
+        np.add.at(counts["playoff"], seeds.ravel(), 1)
+        np.add.at(counts["wildcard"], seeds[:, 3:].ravel(), 1)
+
+        wc_a = play_series(seeds[:, 2], seeds[:, 5], bo3, rng)
+        wc_b = play_series(seeds[:, 3], seeds[:, 4], bo3, rng)
+        for t in (seeds[:, 0], seeds[:, 1], wc_a, wc_b):
+            np.add.at(counts["lds"], t, 1)
+        lds_a = play_series(seeds[:, 0], wc_b, bo5, rng)
+        lds_b = play_series(seeds[:, 1], wc_a, bo5, rng)
+        np.add.at(counts["lcs"], lds_a, 1)
+        np.add.at(counts["lcs"], lds_b, 1)
+        pennant[league] = play_series(lds_a, lds_b, bo7, rng)
+        np.add.at(counts["ws"], pennant[league], 1)
+
+    champ = play_series(pennant["AL"], pennant["NL"], bo7, rng)
+    np.add.at(counts["champion"], champ, 1)
+    return {k: v / n * 100 for k, v in counts.items()}, seed_counts
+
+
+def bracket_snapshot(seed_counts, pct):
+    """Most likely team in each seed slot (greedy, no repeats)."""
+    snapshot = {}
+    for league, seeds in seed_counts.items():
+        taken = set()
+        out = []
+        for s in range(6):
+            freq = np.bincount(seeds[:, s], minlength=len(TEAMS))
+            for t in np.argsort(-freq, kind="stable"):
+                if t not in taken:
+                    taken.add(t)
+                    out.append(int(t))
+                    break
+        snapshot[league] = {
+            "seeds": [TEAMS[t] for t in out],
+            "clinched": [bool(pct["playoff"][t] >= 99.95) for t in out],
+            "ws_pct": [round(float(pct["ws"][t]), 1) for t in out],
+        }
+    return snapshot
+
+
+# ── Output ────────────────────────────────────────────────────────
+
+def build_results(matrix, wins, losses, pct):
+    pending = np.zeros(len(TEAMS), dtype=np.int32)
+    np.add.at(pending, matrix.home, 1)
+    np.add.at(pending, matrix.away, 1)
+    p10, p90 = np.percentile(matrix.sim_wins, [10, 90], axis=1)
+    mean = matrix.sim_wins.mean(axis=1)
+
+    results = {}
+    for t, name in enumerate(TEAMS):
+        lo, hi = int(round(p10[t])), int(round(p90[t]))
+        division = TEAM_DIVISION[name]
+        results[name] = {
+            "playoff_pct": round(float(pct["playoff"][t]), 1),
+            "division_pct": round(float(pct["division"][t]), 1),
+            "wildcard_pct": round(float(pct["wildcard"][t]), 1),
+            "lds_pct": round(float(pct["lds"][t]), 1),
+            "lcs_pct": round(float(pct["lcs"][t]), 1),
+            "ws_pct": round(float(pct["ws"][t]), 1),
+            "champion_pct": round(float(pct["champion"][t]), 1),
+            "current_wins": int(wins[t]),
+            "current_losses": int(losses[t]),
+            "games_played": int(wins[t] + losses[t]),
+            "games_remaining": int(pending[t]),
+            "projected_wins": round(float(mean[t]), 1),
+            "projected_wins_10th": lo,
+            "projected_wins_90th": hi,
+            "projected_wins_range": f"{lo}\u2013{hi}",
+            "division": division,
+            "league": division[:2],
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sims", type=int, default=None, help=f"Number of simulations (default {DEFAULT_SIMS}, or cached)")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore the cached outcome matrix")
+    parser.add_argument("--games", default=GAMES_FILE, help="Path to mlb-games.json")
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    games, ratings = load_inputs(args.games)
+    wins, losses, finals, remaining = split_schedule(games, ratings)
+
+    matrix = rng = None
+    if not args.rebuild and os.path.exists(CACHE_FILE):
+        matrix, rng = OutcomeMatrix.load(CACHE_FILE)
+        if matrix is not None and args.sims is not None and matrix.n_sims != args.sims:
+            matrix = None
+
+    if matrix is None:
+        n_sims = args.sims or DEFAULT_SIMS
+        rng = np.random.default_rng(SEED)
+        print(f"  Full build: {n_sims:,} sims x {len(remaining)} remaining games")
+        matrix = OutcomeMatrix.build(n_sims, wins, finals, remaining, rng)
+        mode = "full"
+    else:
+        stats = refresh(matrix, finals, remaining, rng)
+        print(f"  Incremental: {matrix.n_sims:,} sims — conditioned {stats['conditioned']}, "
+              f"fixed {stats['fixed']}, corrected {stats['corrected']}, "
+              f"resampled {stats['resampled']}, added {stats['added']}, removed {stats['removed']}")
+        mode = "incremental"
+
+    pct, seed_counts = simulate_postseason(matrix, ratings, rng)
+    matrix.save(CACHE_FILE, rng)
+    elapsed = time.perf_counter() - t0
+
+    last_final = max((g["date"] for g in games if str(g["gameId"]) in finals), default=None)
+    out = {
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        "simulation_date": last_final,
+        "n_simulations": matrix.n_sims,
+        "games_remaining": len(matrix.game_ids),
+        "elapsed_seconds": round(elapsed, 1),
+        "simulation_mode": mode,
+        "results": build_results(matrix, wins, losses, pct),
+        "bracket_snapshot": bracket_snapshot(seed_counts, pct),
+    }
+    write_json(args.output, out)
+    print(f"  Wrote {args.output} in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+NCAA Basketball Line & Total Engine
+====================================
+Prices a slate of games.json rows in one vectorized pass, replacing the
+Excel "Betting Lines" range (AL8:AV3000) for
+
+  bbmiHomeLine  -(LINE_PER_BBMI * (home bbmi - away bbmi) + HOME_LINE if not neutral), to the half point
+  bbmiTotal     projected home + away points, to the half point
+  homePtsProj / awayPtsProj
+                the projected total split by the line, so the projections
+                always agree with bbmiHomeLine
+  totalEdge     bbmiTotal - vegasTotal
+  totalPick     "over" / "under" by the sign of totalEdge (None at 0)
+
+Team strength is the bbmi of rankings.json. Scoring level and pace come
+from an offence / defence points model fitted on ncaa-scores.json:
+
+    home points = mu + off[home] + def[away] + home_pts (not neutral)
+    away points = mu + off[away] + def[home]
+
+solved with the same sparse normal-equation CG as ncaa_ratings.py. There is
+no possession data in the feeds, so off / def are per-game points, i.e.
+tempo is folded into them.
+
+Pricing is a handful of numpy gathers over index arrays, so re-pricing every
+remaining game after a rating change takes well under a millisecond.
+
+USAGE:
+  python src/scripts/ncaa_lines.py                     # price unplayed games, show the slate
+  python src/scripts/ncaa_lines.py --date 2026-04-06   # price one date's slate (played or not)
+  python src/scripts/ncaa_lines.py --write             # write the priced rows into games.json
+  python src/scripts/ncaa_lines.py --calibrate         # refit LINE_PER_BBMI / HOME_LINE on games.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from artifact_writer import write_json
+from ncaa_ratings import NON_D1, conjugate_gradient, load_scores
+from team_registry import load_registry
+
+BASE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA = os.path.join(BASE, "src", "data")
+LINES_FILE = os.path.join(DATA, "betting-lines", "games.json")
+RANKINGS_FILE = os.path.join(DATA, "rankings", "rankings.json")
+
+# bbmiHomeLine ≈ -(LINE_PER_BBMI * Δbbmi + HOME_LINE * home); fitted on the
+# Excel lines since 2026-03-10 against the final 2025-26 bbmi (residual sd 2.4).
+LINE_PER_BBMI = 1.40
+HOME_LINE = 2.39
+CALIBRATE_SINCE = "2026-03-10"
+
+POINTS_RIDGE = 1e-2
+
+
+def half_point(x):
+    return np.round(np.asarray(x) * 2) / 2
+
+
+# ── Points model ──────────────────────────────────────────────────
+
+class PointsModel:
+    """Offence / defence points ratings: x = [off (n), def (n), mu, home_pts]."""
+
+    def __init__(self, teams, x):
+        self.teams = list(teams)
+        self.index = {t: i for i, t in enumerate(self.teams)}
+        n = len(self.teams)
+        self.off, self.dfn = x[:n], x[n:2 * n]
+        self.mu, self.home = float(x[-2]), float(x[-1])
+
+    @classmethod
+    def fit(cls, games, ridge=POINTS_RIDGE):
+        """Least-squares fit on [(date, home, away, home pts, away pts, neutral)]."""
+        teams = sorted({g[1] for g in games} | {g[2] for g in games})
+        index = {t: i for i, t in enumerate(teams)}
+        n = len(teams)
+        h = np.array([index[g[1]] for g in games], dtype=np.int64)
+        a = np.array([index[g[2]] for g in games], dtype=np.int64)
+        s = np.array([0.0 if g[5] else 1.0 for g in games])
+        # Two observations per game: the home side's points, then the away side's
+        scorer = np.concatenate([h, a])
+        defender = np.concatenate([a, h]) + n
+        at_home = np.concatenate([s, np.zeros(len(games))])
+        y = np.array([g[3] for g in games] + [g[4] for g in games])
+        size = 2 * n + 2
+
+        def matvec(x):
+            return x[scorer] + x[defender] + x[-2] + x[-1] * at_home
+
+        def rmatvec(u):
+            out = np.zeros(size)
+            out[:n] = np.bincount(scorer, weights=u, minlength=n)
+            out[n:2 * n] = np.bincount(defender - n, weights=u, minlength=n)
+            out[-2] = u.sum()
+            out[-1] = u @ at_home
+            return out
+
+        def normal(x):
+            out = rmatvec(matvec(x))
+            out[:2 * n] += ridge * x[:2 * n]
+            return out
+
+        diag = np.empty(size)
+        diag[:n] = np.bincount(scorer, minlength=n) + ridge
+        diag[n:2 * n] = np.bincount(defender - n, minlength=n) + ridge
+        diag[-2] = len(y)
+        diag[-1] = max(at_home.sum(), 1.0)
+        x, _ = conjugate_gradient(normal, rmatvec(y), diag)
+        return cls(teams, x)
+
+    def project(self, home_idx, away_idx, at_home):
+        """(home points, away points) for index arrays; -1 = unknown team (pooled Non-D1)."""
+        fallback = self.index.get(NON_D1)
+        off = np.append(self.off, self.off[fallback] if fallback is not None else 0.0)
+        dfn = np.append(self.dfn, self.dfn[fallback] if fallback is not None else 0.0)
+        home_pts = self.mu + off[home_idx] + dfn[away_idx] + self.home * at_home
+        away_pts = self.mu + off[away_idx] + dfn[home_idx]
+        return home_pts, away_pts
+
+
+# ── Slate pricing ─────────────────────────────────────────────────
+
+class Pricer:
+    """bbmi ratings + points model, with team lookups resolved once per slate."""
+
+    def __init__(self, rankings, model, registry=None):
+        self.registry = registry or load_registry()
+        self.model = model
+        self.bbmi = {self.registry.resolve(r["team"], fuzzy=False): float(r["bbmi"])
+                     for r in rankings if r.get("bbmi") not in (None, "")}
+
+    def slate(self, rows, adjustments=None):
+        """Index / rating arrays for games.json rows; rows with an unrated team are masked out.
+
+        `adjustments` ({team id: bbmi delta}, e.g. from injuries) shifts team ratings for this slate only.
+        """
+        adjustments = adjustments or {}
+        home_ids = [self.registry.resolve(r["home"], fuzzy=False) for r in rows]
+        away_ids = [self.registry.resolve(r["away"], fuzzy=False) for r in rows]
+        ok = np.array([h in self.bbmi and a in self.bbmi for h, a in zip(home_ids, away_ids)], dtype=bool)
+
+        def idx(team_id):
+            name = self.registry.name(team_id) if team_id is not None else None
+            return self.model.index.get(name, -1)
+
+        return {
+            "ok": ok,
+            "home_bbmi": np.array([self.bbmi.get(h, np.nan) + adjustments.get(h, 0.0) for h in home_ids]),
+            "away_bbmi": np.array([self.bbmi.get(a, np.nan) + adjustments.get(a, 0.0) for a in away_ids]),
+            "home_idx": np.array([idx(h) for h in home_ids], dtype=np.int64),
+            "away_idx": np.array([idx(a) for a in away_ids], dtype=np.int64),
+            "at_home": np.array([0.0 if r.get("neutralSite") else 1.0 for r in rows]),
+            "vegas_total": np.array([float(r["vegasTotal"]) if r.get("vegasTotal") not in (None, "") else np.nan
+                                     for r in rows]),
+        }
+
+    def price(self, s, line_per_bbmi=LINE_PER_BBMI, home_line=HOME_LINE):
+        """Vectorized prices for a prepared slate."""
+        raw_line = -(line_per_bbmi * (s["home_bbmi"] - s["away_bbmi"]) + home_line * s["at_home"])
+        home_pts, away_pts = self.model.project(s["home_idx"], s["away_idx"], s["at_home"])
+        raw_total = home_pts + away_pts
+        line = half_point(raw_line)
+        total = half_point(raw_total)
+        edge = np.round(total - s["vegas_total"], 1)
+        return {
+            "bbmiHomeLine": line,
+            "bbmiTotal": total,
+            "homePtsProj": np.round((raw_total - raw_line) / 2, 1),
+            "awayPtsProj": np.round((raw_total + raw_line) / 2, 1),
+            "totalEdge": edge,
+        }
+
+
+def apply_prices(rows, prices, ok):
+    """Write priced fields into the rows; returns how many rows changed."""
+    changed = 0
+    for i, row in enumerate(rows):
+        if not ok[i]:
+            continue
+        update = {k: float(prices[k][i]) for k in ("bbmiHomeLine", "bbmiTotal", "homePtsProj", "awayPtsProj")}
+        edge = prices["totalEdge"][i]
+        if np.isfinite(edge):
+            update["totalEdge"] = float(edge)
+            update["totalPick"] = "over" if edge > 0 else "under" if edge < 0 else None
+        if any(row.get(k) != v for k, v in update.items()):
+            row.update(update)
+            changed += 1
+    return changed
+
+
+def calibrate(pricer, rows, since=CALIBRATE_SINCE):
+    """Least-squares (LINE_PER_BBMI, HOME_LINE, residual sd) against the existing bbmiHomeLine values."""
+    hist = [r for r in rows if r["date"] >= since and r.get("bbmiHomeLine") not in (None, "")]
+    s = pricer.slate(hist)
+    ok = s["ok"]
+    X = np.c_[-(s["home_bbmi"] - s["away_bbmi"]), -s["at_home"]][ok]
+    y = np.array([float(r["bbmiHomeLine"]) for r in hist])[ok]
+    coef, *_ = np.linalg.lstsq(X, y, rcond=None)
+    return float(coef[0]), float(coef[1]), float(np.std(y - X @ coef)), int(ok.sum())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--date", help="Price this date's slate instead of the unplayed games")
+    parser.add_argument("--write", action="store_true", help="Write the priced rows into games.json")
+    parser.add_argument("--calibrate", action="store_true", help="Refit LINE_PER_BBMI / HOME_LINE")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("  NCAA LINE & TOTAL ENGINE")
+    print("=" * 70)
+    with open(LINES_FILE, encoding="utf-8") as f:
+        rows = json.load(f)
+    with open(RANKINGS_FILE, encoding="utf-8") as f:
+        rankings = json.load(f)
+
+    started = time.perf_counter()
+    model = PointsModel.fit(load_scores())
+    fitted = time.perf_counter()
+    pricer = Pricer(rankings, model)
+    print(f"  Points model: mu {model.mu:.1f}, home +{model.home:.2f} pts, {len(model.teams)} teams "
+          f"({1000 * (fitted - started):.0f} ms)")
+
+    if args.calibrate:
+        per_bbmi, home, sd, n = calibrate(pricer, rows)
+        print(f"  Calibration on {n} games since {CALIBRATE_SINCE}: LINE_PER_BBMI = {per_bbmi:.2f}, "
+              f"HOME_LINE = {home:.2f} (residual sd {sd:.2f})")
+
+    if args.date:
+        slate = [r for r in rows if r["date"] == args.date]
+    else:
+        slate = [r for r in rows if r.get("actualHomeScore") is None and r.get("actualAwayScore") is None]
+    if not slate:
+        print("  No games to price")
+        return
+
+    s = pricer.slate(slate)
+    t0 = time.perf_counter()
+    prices = pricer.price(s)
+    price_ms = 1000 * (time.perf_counter() - t0)
+    # Re-pricing cost after a rating change: the whole file through the same path
+    everything = pricer.slate(rows)
+    t0 = time.perf_counter()
+    pricer.price(everything)
+    all_ms = 1000 * (time.perf_counter() - t0)
+
+    print(f"  Slate: {len(slate)} games ({int((~s['ok']).sum())} with an unrated team skipped)")
+    print(f"  Pricing: {price_ms:.2f} ms for the slate, {all_ms:.2f} ms for all {len(rows):,} games.json rows\n")
+    print(f"  {'date':10s} {'away':22s} {'home':22s} {'line':>6s} {'total':>6s} {'proj':>11s} {'edge':>5s}")
+    for i, r in enumerate(slate[:40]):
+        if not s["ok"][i]:
+            continue
+        edge = prices["totalEdge"][i]
+        print(f"  {r['date']:10s} {r['away'][:22]:22s} {r['home'][:22]:22s} {prices['bbmiHomeLine'][i]:>+6.1f} "
+              f"{prices['bbmiTotal'][i]:>6.1f} {prices['awayPtsProj'][i]:>5.1f}-{prices['homePtsProj'][i]:<5.1f} "
+              f"{'' if not np.isfinite(edge) else f'{edge:+.1f}':>5s}")
+
+    if args.write:
+        changed = apply_prices(slate, prices, s["ok"])
+        write_json(LINES_FILE, rows)
+        print(f"\n✅ Updated {changed} row(s) in {LINES_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+"""
+NCAA Basketball Rating Engine
+==============================
+Adjusted-margin ratings solved directly from ncaa-scores.json, replacing the
+Excel "My Rankings" recalculation (STEP 1 of the pipeline).
+
+Model, one row per game:
+    homeScore - awayScore = r[home] - r[away] + h * (not neutral) + noise
+
+  - the games × (teams + 1) design matrix is kept sparse as index arrays
+    (two ±1 team entries and one home-court entry per row) and never formed
+    densely; X and Xᵀ products are gathers and bincounts
+  - the normal equations (XᵀX + λI) x = Xᵀy are solved with Jacobi-
+    preconditioned conjugate gradient; the small ridge λ on team terms pins
+    the otherwise free additive constant
+  - neutral sites come from the neutralSite flags in betting-lines/games.json
+  - teams are joined through the team registry (exact names / aliases only);
+    every non-D1 opponent is pooled into one "Non-D1" team
+  - ratings are centred on the D1 mean and mapped onto the bbmi scale of
+    rankings.json with BBMI_OFFSET + BBMI_SCALE * rating
+
+Daily runs are incremental: the team list, the game list, the design's
+index arrays and the last solution are kept in
+src/data/.ncaa-ratings-state.npz. Only the games that differ from the saved
+list (appended, removed or corrected rows) are indexed in Python and spliced
+into the saved arrays; finding them is a few list comparisons in C, and Xᵀy
+and each CG iteration are vectorized passes over all games. CG is warm-started from yesterday's
+ratings, so a day of results costs a few iterations instead of a cold solve.
+
+USAGE:
+  python src/scripts/ncaa_ratings.py                 # solve and compare with rankings.json
+  python src/scripts/ncaa_ratings.py --write         # update bbmi / model_rank in rankings.json
+  python src/scripts/ncaa_ratings.py --calibrate     # refit the bbmi scale against rankings.json
+  python src/scripts/ncaa_ratings.py --rebuild       # ignore the saved state, solve cold
+
+  sys.path.insert(0, os.path.join(BASE, "src", "scripts"))
+  from ncaa_ratings import load_games, solve_ratings, update_ratings
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from artifact_writer import write_json
+from team_registry import load_registry
+
+BASE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA = os.path.join(BASE, "src", "data")
+SCORES_FILE = os.path.join(DATA, "ncaa-team", "ncaa-scores.json")
+LINES_FILE = os.path.join(DATA, "betting-lines", "games.json")
+RANKINGS_FILE = os.path.join(DATA, "rankings", "rankings.json")
+STATE_FILE = os.path.join(DATA, ".ncaa-ratings-state.npz")
+
+NON_D1 = "Non-D1"
+RIDGE = 1e-3          # λ on team ratings (not on the home-court term)
+CG_TOL = 1e-10        # stop when ‖residual‖ / ‖Xᵀy‖ falls below this
+CG_MAX_ITER = 1000
+MAX_HUNKS = 20        # edits spliced into the saved design before re-indexing every game
+RESYNC_WINDOW = 64    # games compared when choosing how to realign after an edit
+
+# bbmi = BBMI_OFFSET + BBMI_SCALE * adjusted margin; fitted against the Excel
+# model's rankings.json (2025-26 season, r = 0.91). Refit with --calibrate.
+BBMI_OFFSET = 18.48
+BBMI_SCALE = 0.470
+
+
+def iso_date(date):
+    """MM/DD/YYYY (ncaa-scores.json) -> YYYY-MM-DD."""
+    if "/" not in date:
+        return date
+    month, day, year = date.split("/")
+    return f"{year}-{int(month):02d}-{int(day):02d}"
+
+
+# ── Inputs ────────────────────────────────────────────────────────
+
+def neutral_games(registry, lines_path=LINES_FILE):
+    """{(date, frozenset of team IDs)} for games flagged neutralSite in games.json."""
+    if not os.path.exists(lines_path):
+        return set()
+    with open(lines_path, encoding="utf-8") as f:
+        lines = json.load(f)
+    return {
+        (g["date"], frozenset((registry.resolve(g["home"], fuzzy=False), registry.resolve(g["away"], fuzzy=False))))
+        for g in lines if g.get("neutralSite")
+    }
+
+
+def load_scores(scores_path=SCORES_FILE, lines_path=LINES_FILE):
+    """Completed games as [(date, home, away, home score, away score, neutral)] with registry team names."""
+    registry = load_registry()
+    neutral = neutral_games(registry, lines_path)
+    with open(scores_path, encoding="utf-8") as f:
+        scores = json.load(f)
+
+    games = []
+    for g in scores:
+        if g.get("homeScore") in (None, "") or g.get("awayScore") in (None, ""):
+            continue
+        home_id = registry.resolve(g["homeTeam"], fuzzy=False)
+        away_id = registry.resolve(g["awayTeam"], fuzzy=False)
+        date = iso_date(g["gameDate"])
+        games.append((
+            date,
+            registry.name(home_id) if home_id is not None else NON_D1,
+            registry.name(away_id) if away_id is not None else NON_D1,
+            float(g["homeScore"]),
+            float(g["awayScore"]),
+            (date, frozenset((home_id, away_id))) in neutral,
+        ))
+    return games
+
+
+def load_games(scores_path=SCORES_FILE, lines_path=LINES_FILE):
+    """Completed games as [(date, home, away, margin, neutral)] with registry team names."""
+    return [(date, home, away, home_score - away_score, neutral)
+            for date, home, away, home_score, away_score, neutral in load_scores(scores_path, lines_path)]
+
+
+# ── Sparse design matrix ──────────────────────────────────────────
+
+class Design:
+    """Sparse games × (teams + 1) design matrix; the last column is home court."""
+
+    def __init__(self, games, teams=None):
+        names = sorted({g[1] for g in games} | {g[2] for g in games}) if teams is None else list(teams)
+        index = {t: i for i, t in enumerate(names)}
+        self._set(names,
+                  np.array([index[g[1]] for g in games], dtype=np.int64),
+                  np.array([index[g[2]] for g in games], dtype=np.int64),
+                  np.array([0.0 if g[4] else 1.0 for g in games]),
+                  np.array([g[3] for g in games], dtype=float))
+
+    @classmethod
+    def from_arrays(cls, teams, home, away, at_home, y):
+        design = cls.__new__(cls)
+        design._set(list(teams), home, away, at_home, y)
+        return design
+
+    def _set(self, teams, home, away, at_home, y):
+        self.teams = teams
+        self.n_teams = len(teams)
+        self.n = self.n_teams + 1
+        self.home, self.away, self.at_home, self.y = home, away, at_home, y
+        self.games_played = (np.bincount(self.home, minlength=self.n_teams)
+                             + np.bincount(self.away, minlength=self.n_teams))
+
+    def splice(self, hunks, part):
+        """Design with each hunk's rows [old start, old stop) replaced by the next rows of `part`.
+
+        `part` holds the hunks' new games in order, indexed with the same teams.
+        """
+        def join(a, b):
+            pieces, prev, taken = [], 0, 0
+            for old_start, old_stop, new_start, new_stop in hunks:
+                pieces += [a[prev:old_start], b[taken:taken + new_stop - new_start]]
+                prev, taken = old_stop, taken + new_stop - new_start
+            return np.concatenate(pieces + [a[prev:]])
+        return Design.from_arrays(self.teams, join(self.home, part.home), join(self.away, part.away),
+                                  join(self.at_home, part.at_home), join(self.y, part.y))
+
+    def matvec(self, x):
+        """X x: predicted margin of every game."""
+        return x[self.home] - x[self.away] + x[-1] * self.at_home
+
+    def rmatvec(self, u):
+        """Xᵀ u."""
+        out = np.empty(self.n)
+        out[:-1] = (np.bincount(self.home, weights=u, minlength=self.n_teams)
+                    - np.bincount(self.away, weights=u, minlength=self.n_teams))
+        out[-1] = u @ self.at_home
+        return out
+
+    def normal_matvec(self, x, ridge=RIDGE):
+        """(XᵀX + λI) x with λ on team columns only."""
+        out = self.rmatvec(self.matvec(x))
+        out[:-1] += ridge * x[:-1]
+        return out
+
+    def normal_diagonal(self, ridge=RIDGE):
+        diag = np.empty(self.n)
+        diag[:-1] = self.games_played + ridge
+        diag[-1] = max(self.at_home @ self.at_home, 1.0)
+        return diag
+
+
+def conjugate_gradient(matvec, b, diag, x0=None, tol=CG_TOL, max_iter=CG_MAX_ITER):
+    """Jacobi-preconditioned CG for a symmetric positive definite system; returns (x, iterations)."""
+    x = np.zeros_like(b) if x0 is None else x0.astype(float).copy()
+    r = b - matvec(x)
+    b_norm = np.linalg.norm(b) or 1.0
+    if np.linalg.norm(r) / b_norm < tol:
+        return x, 0
+    z = r / diag
+    p = z.copy()
+    rz = r @ z
+    for iteration in range(1, max_iter + 1):
+        Ap = matvec(p)
+        alpha = rz / (p @ Ap)
+        x += alpha * p
+        r -= alpha * Ap
+        if np.linalg.norm(r) / b_norm < tol:
+            return x, iteration
+        z = r / diag
+        rz_next = r @ z
+        p = z + (rz_next / rz) * p
+        rz = rz_next
+    return x, max_iter
+
+
+def solve_ratings(games, x0=None, ridge=RIDGE, tol=CG_TOL, design=None, b=None):
+    """Adjusted-margin ratings for `games` (see load_games).
+
+    Returns {"teams", "ratings" (D1-mean-centred), "home", "games",
+    "iterations", "rmse", "solution"}. `x0` is an initial solution vector
+    ordered like a previous result's "solution"/"teams"; `design` / `b`
+    pass in a prebuilt Design and its Xᵀy.
+    """
+    design = Design(games) if design is None else design
+    b = design.rmatvec(design.y) if b is None else b
+    x, iterations = conjugate_gradient(
+        lambda v: design.normal_matvec(v, ridge), b, design.normal_diagonal(ridge), x0=x0, tol=tol)
+
+    residual = design.y - design.matvec(x)
+    rmse = float(np.sqrt(np.mean(residual ** 2))) if len(residual) else 0.0
+    return _result(design.teams, x, design.games_played, iterations, rmse)
+
+
+def _result(teams, x, games_played, iterations, rmse):
+    d1 = np.array([t != NON_D1 for t in teams])
+    return {
+        "teams": list(teams),
+        "ratings": x[:-1] - x[:-1][d1].mean(),
+        "home": float(x[-1]),
+        "games": games_played,
+        "iterations": iterations,
+        "rmse": rmse,
+        "solution": x,
+    }
+
+
+# ── Incremental updates ───────────────────────────────────────────
+
+def game_key(game):
+    date, home, away, margin, neutral = game
+    return f"{date}|{home}|{away}|{margin:g}|{int(neutral)}"
+
+
+def parse_game_key(key):
+    date, home, away, margin, neutral = key.split("|")
+    return date, home, away, float(margin), neutral == "1"
+
+
+def save_state(path, design, x, games, ridge, cold_ms, cold_iterations):
+    tmp = path + ".tmp.npz"
+    np.savez(
+        tmp, teams=np.array(design.teams), ridge=ridge, solution=x,
+        home=design.home, away=design.away, at_home=design.at_home, y=design.y,
+        keys=np.array([game_key(g) for g in games]),
+        cold_ms=cold_ms, cold_iterations=cold_iterations,
+    )
+    os.replace(tmp, path)
+
+
+def load_state(path):
+    """(design, solution, games, ridge, cold ms, cold iterations), or None."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as z:
+            design = Design.from_arrays([str(t) for t in z["teams"]], z["home"], z["away"], z["at_home"], z["y"])
+            return (design, z["solution"], [parse_game_key(str(k)) for k in z["keys"]], float(z["ridge"]),
+                    float(z["cold_ms"]), int(z["cold_iterations"]))
+    except (OSError, KeyError, ValueError) as e:
+        print(f"  ⚠️  Ignoring unreadable state {path}: {e}")
+        return None
+
+
+def _common_prefix(a, b):
+    """Length of the common prefix of two lists (slice comparisons run in C)."""
+    n = min(len(a), len(b))
+    if a[:n] == b[:n]:
+        return n
+    lo, hi = 0, n  # a[:lo] == b[:lo], a[:hi] != b[:hi]
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+def diff_games(old_games, games, max_hunks=MAX_HUNKS):
+    """Hunks [(old start, old stop, new start, new stop)] turning `old_games` into `games`.
+
+    Walks both lists, resynchronising after each one-row edit (corrected,
+    removed or inserted game) at whichever alignment matches longest over
+    the next RESYNC_WINDOW games; the
+    rest of the new list is one final hunk, so an append is a single hunk.
+    Returns None past `max_hunks` edits (e.g. a reordered file).
+    """
+    hunks = []
+    i = j = 0
+    while True:
+        k = _common_prefix(old_games[i:], games[j:])
+        i, j = i + k, j + k
+        if i == len(old_games) or j == len(games):
+            if i < len(old_games) or j < len(games):
+                hunks.append((i, len(old_games), j, len(games)))
+            return hunks
+        if len(hunks) == max_hunks:
+            return None
+        di, dj = max(((1, 1), (1, 0), (0, 1)),
+                     key=lambda d: _common_prefix(old_games[i + d[0]:i + d[0] + RESYNC_WINDOW],
+                                                  games[j + d[1]:j + d[1] + RESYNC_WINDOW]))
+        hunks.append((i, i + di, j, j + dj))
+        i, j = i + di, j + dj
+
+
+def update_ratings(games, state_path=STATE_FILE, rebuild=False, ridge=RIDGE):
+    """Ratings for `games`, warm-started from the saved state when possible.
+
+    Only the games that differ from the saved list are indexed against the
+    saved team list and spliced into the saved design arrays (a corrected
+    score or neutral flag counts as one removed and one added game); CG
+    restarts from the previous solution. More than MAX_HUNKS edits re-index
+    every game but still warm-start. A new team, a changed ridge or
+    --rebuild falls back to a full cold solve. Returns (result, stats);
+    stats["ms"] covers the diff, splice and solve, not reading / writing the
+    state.
+    """
+    state = None if rebuild else load_state(state_path)
+    started = time.perf_counter()
+    result = None
+    if state and state[3] == ridge:
+        saved, x0, old_games, _, cold_ms, cold_iterations = state
+        hunks = diff_games(old_games, games)
+        if hunks is None:
+            hunks = [(0, len(old_games), 0, len(games))]
+        added = [g for _, _, j0, j1 in hunks for g in games[j0:j1]]
+        removed = [g for i0, i1, _, _ in hunks for g in old_games[i0:i1]]
+        index = set(saved.teams)
+        if all(g[1] in index and g[2] in index for g in added):
+            design = saved.splice(hunks, Design(added, saved.teams))
+            result = solve_ratings(games, x0=x0, ridge=ridge, design=design)
+            mode = "incremental"
+    if result is None:
+        design = Design(games)
+        result = solve_ratings(games, ridge=ridge, design=design)
+        mode = "full"
+        added, removed = games, []
+    elapsed_ms = 1000 * (time.perf_counter() - started)
+    if mode == "full":
+        cold_ms, cold_iterations = elapsed_ms, result["iterations"]
+
+    save_state(state_path, design, result["solution"], games, ridge, cold_ms, cold_iterations)
+    stats = {
+        "mode": mode, "added": len(added), "removed": len(removed), "iterations": result["iterations"],
+        "ms": elapsed_ms, "cold_iterations": cold_iterations, "cold_ms": cold_ms,
+    }
+    return result, stats
+
+
+def to_bbmi(ratings, offset=BBMI_OFFSET, scale=BBMI_SCALE):
+    return offset + scale * np.asarray(ratings)
+
+
+# ── Output ────────────────────────────────────────────────────────
+
+def load_rankings(path=RANKINGS_FILE):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def calibrate(result, rankings):
+    """Least-squares (offset, scale, r) mapping ratings onto the current bbmi values."""
+    rating_of = dict(zip(result["teams"], result["ratings"]))
+    pairs = [(rating_of[r["team"]], float(r["bbmi"])) for r in rankings
+             if r["team"] in rating_of and r.get("bbmi") not in (None, "")]
+    x, y = np.array(pairs).T
+    scale, offset = np.polyfit(x, y, 1)
+    return float(offset), float(scale), float(np.corrcoef(x, y)[0, 1])
+
+
+def update_rankings(result, rankings):
+    """Set bbmi / model_rank on every rankings.json row the engine rated; returns rows updated."""
+    bbmi_of = dict(zip(result["teams"], to_bbmi(result["ratings"])))
+    rated = [r for r in rankings if r["team"] in bbmi_of]
+    for r in rated:
+        r["bbmi"] = round(float(bbmi_of[r["team"]]), 2)
+    for rank, r in enumerate(sorted(rated, key=lambda r: -r["bbmi"]), 1):
+        r["model_rank"] = str(rank)
+    rankings.sort(key=lambda r: int(r["model_rank"]) if str(r.get("model_rank", "")).isdigit() else 10 ** 6)
+    return len(rated)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--write", action="store_true", help="Update bbmi / model_rank in rankings.json")
+    parser.add_argument("--calibrate", action="store_true", help="Refit BBMI_OFFSET / BBMI_SCALE against rankings.json")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore the saved solver state and solve cold")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  NCAA RATING ENGINE")
+    print("=" * 60)
+    started = time.perf_counter()
+    games = load_games()
+    loaded = time.perf_counter()
+    result, stats = update_ratings(games, rebuild=args.rebuild)
+
+    n_neutral = sum(g[4] for g in games)
+    d1 = [t for t in result["teams"] if t != NON_D1]
+    print(f"  Games:        {len(games):,} ({n_neutral} neutral)")
+    print(f"  Teams:        {len(d1)} D1 + pooled {NON_D1}")
+    print(f"  Home court:   {result['home']:+.2f} pts")
+    print(f"  Fit RMSE:     {result['rmse']:.2f} pts")
+    if stats["mode"] == "incremental":
+        print(f"  Update:       incremental, +{stats['added']} / -{stats['removed']} games")
+        print(f"  CG:           {stats['iterations']} iterations (cold solve: {stats['cold_iterations']})")
+        print(f"  Time:         load {1000 * (loaded - started):.0f} ms, update {stats['ms']:.1f} ms "
+              f"(cold solve {stats['cold_ms']:.1f} ms, saved {stats['cold_ms'] - stats['ms']:.1f} ms)")
+    else:
+        print(f"  Update:       full solve ({stats['added']:,} games), state saved")
+        print(f"  CG:           {stats['iterations']} iterations")
+        print(f"  Time:         load {1000 * (loaded - started):.0f} ms, solve {stats['ms']:.1f} ms")
+
+    rankings = load_rankings()
+    if args.calibrate:
+        offset, scale, r = calibrate(result, rankings)
+        print(f"\n  Calibration vs rankings.json: BBMI_OFFSET = {offset:.2f}, BBMI_SCALE = {scale:.3f} (r = {r:.3f})")
+
+    bbmi = dict(zip(result["teams"], to_bbmi(result["ratings"])))
+    current = {r["team"]: float(r["bbmi"]) for r in rankings if r.get("bbmi") not in (None, "")}
+    common = [t for t in current if t in bbmi]
+    if common:
+        diff = np.array([bbmi[t] - current[t] for t in common])
+        print(f"  vs rankings.json: {len(common)} teams, mean |Δbbmi| {np.abs(diff).mean():.2f}, "
+              f"max {np.abs(diff).max():.2f}")
+
+    order = sorted(d1, key=lambda t: -bbmi[t])
+    print("\n  Top 25:")
+    for i, t in enumerate(order[:25], 1):
+        was = f"{current[t]:6.2f}" if t in current else "     -"
+        print(f"   {i:>3}. {t:28s} {bbmi[t]:6.2f}  (was {was})")
+
+    if args.write:
+        n = update_rankings(result, rankings)
+        write_json(RANKINGS_FILE, rankings)
+        print(f"\n✅ Updated bbmi / model_rank for {n} teams in {RANKINGS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
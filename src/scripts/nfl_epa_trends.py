@@ -0,0 +1,255 @@
+"""
+NFL Team EPA Trends
+====================
+Builds a team × week EPA matrix for the season and computes exponentially
+weighted and windowed aggregates for every team in one vectorized pass.
+Writes the results to src/data/nfl-teams/<TEAM>.json as "epaTrend"
+(per week) and "epaTrendSummary" (latest values).
+
+Inputs:
+  - nfl-teams/*.json gameLog: season-to-date offEpa / defEpa through each
+    game (the same series weeklyEpa shows one week later)
+  - betting-lines/nfl-games.json: each row carries both teams' EPA entering
+    that week plus the final score once played. New finals are merged into
+    the teams' gameLog / weeklyEpa / record, and the entering EPA fills in the
+    teams' previous game if its EPA was still missing.
+
+Per-game EPA is recovered from the season-to-date series by de-cumulating
+with equal weight per game (n·c_n - (n-1)·c_(n-1)); play counts are not in
+the feeds. Then for every team at once:
+  ewm     exponentially weighted mean of per-game EPA (EWM_HALFLIFE games)
+  lastN   mean of the last WINDOW games
+
+Each team's completed games are hashed into src/data/.nfl-epa-trends-state.json,
+and only the files of teams that played new (or corrected) games since the
+last run are regenerated.
+
+USAGE:
+  python src/scripts/nfl_epa_trends.py              # merge new finals, regenerate changed team files
+  python src/scripts/nfl_epa_trends.py --all        # regenerate every team file
+  python src/scripts/nfl_epa_trends.py --dry-run
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from artifact_writer import write_json
+
+BASE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA = os.path.join(BASE, "src", "data")
+TEAMS_DIR = os.path.join(DATA, "nfl-teams")
+GAMES_FILE = os.path.join(DATA, "betting-lines", "nfl-games.json")
+STATE_FILE = os.path.join(DATA, ".nfl-epa-trends-state.json")
+
+EWM_HALFLIFE = 4.0
+WINDOW = 4
+
+
+def load_teams(teams_dir=TEAMS_DIR):
+    teams = {}
+    for path in sorted(glob.glob(os.path.join(teams_dir, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        teams[data["team"]] = data
+    return teams
+
+
+def games_hash(team):
+    played = [(g["week"], g.get("tmPts"), g.get("oppPts"), g.get("offEpa"), g.get("defEpa"))
+              for g in team.get("gameLog", [])]
+    return hashlib.sha1(json.dumps(played).encode("utf-8")).hexdigest()
+
+
+# ── Merge new finals from nfl-games.json ──────────────────────────
+
+def _record(log):
+    wins = sum(g.get("result") == "W" for g in log)
+    losses = sum(g.get("result") == "L" for g in log)
+    ties = sum(g.get("result") == "T" for g in log)
+    return f"{wins}-{losses}" + (f"-{ties}" if ties else "")
+
+
+def merge_games(teams, games):
+    """Fold nfl-games.json rows into the team dicts in place; returns the teams that changed."""
+    changed = set()
+    for g in games:
+        week = g["week"]
+        sides = ((g["homeTeam"], g["awayTeam"], True, "home", "away"),
+                 (g["awayTeam"], g["homeTeam"], False, "away", "home"))
+        for team, opponent, home, us, them in sides:
+            t = teams.get(team)
+            if t is None:
+                continue
+            log = t.setdefault("gameLog", [])
+            off, dfn = g.get(f"{us}OffEpa"), g.get(f"{us}DefEpa")
+            # EPA entering this week = season-to-date through the team's previous game
+            previous = [e for e in log if e["week"] < week]
+            if previous and off is not None and previous[-1].get("offEpa") is None:
+                previous[-1]["offEpa"], previous[-1]["defEpa"] = off, dfn
+                changed.add(team)
+            weekly = t.setdefault("weeklyEpa", [])
+            if off is not None and not any(w["week"] == week for w in weekly):
+                weekly.append({"week": week, "offEpa": off, "defEpa": dfn})
+                weekly.sort(key=lambda w: w["week"])
+                changed.add(team)
+
+            pts, opp_pts = g.get(f"actual{us.title()}Score"), g.get(f"actual{them.title()}Score")
+            if pts is None or opp_pts is None:
+                continue
+            entry = next((e for e in log if e["week"] == week), None)
+            final = {"week": week, "opponent": opponent, "home": home,
+                     "result": "W" if pts > opp_pts else "L" if pts < opp_pts else "T",
+                     "score": f"{pts}-{opp_pts}", "tmPts": pts, "oppPts": opp_pts}
+            if entry is None:
+                log.append({**final, "offEpa": None, "defEpa": None})
+                log.sort(key=lambda e: e["week"])
+            elif any(entry.get(k) != v for k, v in final.items()):
+                entry.update(final)
+            else:
+                continue
+            t["record"] = _record(log)
+            changed.add(team)
+    return changed
+
+
+# ── Vectorized trends ─────────────────────────────────────────────
+
+def epa_matrix(teams, order):
+    """(weeks, season-to-date off / def EPA matrices: teams × weeks, NaN where no game / no EPA)."""
+    weeks = sorted({g["week"] for t in teams.values() for g in t.get("gameLog", [])})
+    col = {w: j for j, w in enumerate(weeks)}
+    off = np.full((len(order), len(weeks)), np.nan)
+    dfn = np.full((len(order), len(weeks)), np.nan)
+    for i, team in enumerate(order):
+        for g in teams[team].get("gameLog", []):
+            if g.get("offEpa") is not None:
+                off[i, col[g["week"]]] = g["offEpa"]
+            if g.get("defEpa") is not None:
+                dfn[i, col[g["week"]]] = g["defEpa"]
+    return weeks, off, dfn
+
+
+def per_game(cumulative):
+    """Per-game values from a season-to-date mean matrix (equal weight per game)."""
+    valid = np.isfinite(cumulative)
+    n = np.cumsum(valid, axis=1)
+    # Previous valid season-to-date value per cell (forward fill, shifted by one game)
+    cols = np.where(valid, np.arange(cumulative.shape[1]), -1)
+    last = np.maximum.accumulate(cols, axis=1)
+    prev_col = np.concatenate([np.full((len(cumulative), 1), -1), last[:, :-1]], axis=1)
+    rows = np.arange(len(cumulative))[:, None]
+    prev = np.where(prev_col >= 0, cumulative[rows, np.maximum(prev_col, 0)], 0.0)
+    return np.where(valid, n * np.nan_to_num(cumulative) - (n - 1) * prev, np.nan)
+
+
+def ewm(values, halflife=EWM_HALFLIFE):
+    """Exponentially weighted mean along weeks, skipping NaN (normalised by the weight sum)."""
+    alpha = 1 - 0.5 ** (1 / halflife)
+    total = np.zeros(len(values))
+    weight = np.zeros(len(values))
+    out = np.full(values.shape, np.nan)
+    for j in range(values.shape[1]):
+        valid = np.isfinite(values[:, j])
+        total = np.where(valid, (1 - alpha) * total + alpha * np.nan_to_num(values[:, j]), total)
+        weight = np.where(valid, (1 - alpha) * weight + alpha, weight)
+        out[:, j] = np.where(valid, total / np.where(weight > 0, weight, 1), np.nan)
+    return out
+
+
+def window_mean(values, window=WINDOW):
+    """Mean of the last `window` games (not weeks) at every game, NaN elsewhere."""
+    valid = np.isfinite(values)
+    # Compact each team's games to the left, keeping their order
+    order = np.argsort(~valid, axis=1, kind="stable")
+    compact = np.take_along_axis(np.where(valid, values, 0.0), order, axis=1)
+    counts = valid.sum(axis=1)
+    csum = np.concatenate([np.zeros((len(values), 1)), np.cumsum(compact, axis=1)], axis=1)
+    k = np.arange(1, values.shape[1] + 1)
+    lo = np.maximum(k - window, 0)
+    means = (csum[:, k] - csum[:, lo]) / (k - lo)
+    means = np.where(k[None, :] <= counts[:, None], means, np.nan)
+    # Back to week columns: game index of each valid cell
+    game_idx = np.cumsum(valid, axis=1) - 1
+    return np.where(valid, np.take_along_axis(means, np.maximum(game_idx, 0), axis=1), np.nan)
+
+
+def compute_trends(teams):
+    """{team: (epaTrend rows, summary)} for every team in one pass over the matrices."""
+    order = sorted(teams)
+    weeks, off_cum, def_cum = epa_matrix(teams, order)
+    off, dfn = per_game(off_cum), per_game(def_cum)
+    stats = {"offEpa": off, "defEpa": dfn, "ewmOffEpa": ewm(off), "ewmDefEpa": ewm(dfn),
+             f"last{WINDOW}OffEpa": window_mean(off), f"last{WINDOW}DefEpa": window_mean(dfn)}
+    out = {}
+    for i, team in enumerate(order):
+        rows = []
+        for j, week in enumerate(weeks):
+            if not np.isfinite(off[i, j]):
+                continue
+            rows.append({"week": week, **{k: round(float(v[i, j]), 3) for k, v in stats.items()}})
+        summary = {k: v for k, v in rows[-1].items() if k not in ("week", "offEpa", "defEpa")} if rows else {}
+        if rows:
+            summary["throughWeek"] = rows[-1]["week"]
+        out[team] = (rows, summary)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--all", action="store_true", help="Regenerate every team file")
+    parser.add_argument("--dry-run", action="store_true", help="Report without writing")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  NFL EPA TRENDS")
+    print("=" * 60)
+    started = time.perf_counter()
+    teams = load_teams()
+    games = []
+    if os.path.exists(GAMES_FILE):
+        with open(GAMES_FILE, encoding="utf-8") as f:
+            games = json.load(f)
+    state = {}
+    if os.path.exists(STATE_FILE):
+        with open(STATE_FILE, encoding="utf-8") as f:
+            state = json.load(f)
+
+    merged = merge_games(teams, games)
+    hashes = {team: games_hash(t) for team, t in teams.items()}
+    dirty = set(teams) if args.all else {team for team in teams if hashes[team] != state.get(team)} | merged
+
+    t0 = time.perf_counter()
+    trends = compute_trends(teams)
+    compute_ms = 1000 * (time.perf_counter() - t0)
+    print(f"  Teams: {len(teams)}, {len(merged)} with merged nfl-games.json updates, "
+          f"{len(dirty)} to regenerate")
+    print(f"  Matrix + EWM / last-{WINDOW} aggregates: {compute_ms:.2f} ms")
+    for team in sorted(dirty)[:8]:
+        s = trends[team][1]
+        if s:
+            print(f"   {team:4s} thru wk {s['throughWeek']:2d}: ewm off {s['ewmOffEpa']:+.3f} def {s['ewmDefEpa']:+.3f}  "
+                  f"last{WINDOW} off {s[f'last{WINDOW}OffEpa']:+.3f} def {s[f'last{WINDOW}DefEpa']:+.3f}")
+
+    if args.dry_run:
+        print("\n  Dry run: nothing written")
+        return
+    for team in sorted(dirty):
+        data = teams[team]
+        data["epaTrend"], data["epaTrendSummary"] = trends[team]
+        write_json(os.path.join(TEAMS_DIR, f"{team}.json"), data)
+    tmp = STATE_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(hashes, f)
+    os.replace(tmp, STATE_FILE)
+    print(f"\n✅ Regenerated {len(dirty)} team file(s) in {1000 * (time.perf_counter() - started):.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
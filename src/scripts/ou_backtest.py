@@ -0,0 +1,235 @@
+"""
+Basketball Totals Backtest
+===========================
+Regenerates src/data/betting-lines/basketball-ou-backtest.json, the
+over/under record the About page shows. The output keeps the site's schema:
+label, overall, buckets ("2-4 pts" … "10+ pts") and history.
+
+Sources:
+  - 2025-26 Live: completed games.json rows since LIVE_SINCE that have
+    vegasTotal / bbmiTotal / actualTotal, using the bbmiTotal published at
+    the time
+  - 2024-25 Walk-Forward: the walk-forward rows already in the file, carried
+    over unchanged (the 2024-25 lines and scores are not in this repo)
+
+Each game is a bet on the side bbmiTotal points to (over when bbmiTotal >
+vegasTotal). Zero-edge games and pushes are left out. A game counts in the
+record once its edge reaches MIN_EDGE. ROI uses overOdds / underOdds where a
+row has them and -110 otherwise. All buckets come from one np.digitize +
+np.bincount pass.
+
+--walk-forward replaces the published totals with a walk-forward replay of
+the points model from ncaa_lines.py. For each WINDOW_DAYS window the model
+is fitted only on scores before the window opens, then prices the window's
+games. The windows are independent, so they are fitted in parallel worker
+processes.
+
+USAGE:
+  python src/scripts/ou_backtest.py                      # rewrite basketball-ou-backtest.json
+  python src/scripts/ou_backtest.py --dry-run            # report only
+  python src/scripts/ou_backtest.py --walk-forward       # 2025-26 totals from a walk-forward model replay
+  python src/scripts/ou_backtest.py --walk-forward --workers 4 --dry-run
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from artifact_writer import write_json
+
+BASE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA = os.path.join(BASE, "src", "data")
+LINES_FILE = os.path.join(DATA, "betting-lines", "games.json")
+OUTPUT_FILE = os.path.join(DATA, "betting-lines", "basketball-ou-backtest.json")
+
+LIVE_SEASON = "2025-26"
+LIVE_SINCE = "2026-01-03"
+MIN_EDGE = 2.0
+BUCKET_EDGES = [2, 4, 6, 8, 10]
+DEFAULT_ODDS = -110
+WINDOW_DAYS = 7
+
+
+def bucket_names(edges=BUCKET_EDGES):
+    names = [f"{lo}-{hi} pts" for lo, hi in zip(edges, edges[1:])]
+    return names + [f"{edges[-1]}+ pts"]
+
+
+def decimal_odds(odds):
+    """Decimal payout for American (-110) or decimal (1.91) odds; None → DEFAULT_ODDS."""
+    if odds in (None, ""):
+        odds = DEFAULT_ODDS
+    odds = float(odds)
+    if abs(odds) >= 100:
+        return 1 + (100 / -odds if odds < 0 else odds / 100)
+    return odds
+
+
+# ── History rows ──────────────────────────────────────────────────
+
+def live_rows(games, totals=None, since=LIVE_SINCE, season=LIVE_SEASON):
+    """History rows for completed games.json rows; `totals` overrides bbmiTotal by row index."""
+    rows = []
+    for i, g in enumerate(games):
+        if g["date"] < since:
+            continue
+        vegas, actual = g.get("vegasTotal"), g.get("actualTotal")
+        bbmi = totals.get(i) if totals is not None else g.get("bbmiTotal")
+        if vegas in (None, "") or bbmi is None or actual is None:
+            continue
+        if bbmi == vegas or actual == vegas:  # no pick, or a push
+            continue
+        pick = "over" if bbmi > vegas else "under"
+        result = "over" if actual > vegas else "under"
+        rows.append({
+            "date": g["date"], "away": g["away"], "home": g["home"],
+            "vegasTotal": vegas, "bbmiTotal": bbmi, "actualTotal": actual,
+            "awayScore": g.get("actualAwayScore"), "homeScore": g.get("actualHomeScore"),
+            "edge": round(abs(bbmi - vegas), 1), "pick": pick, "result": result,
+            "correct": pick == result, "season": season,
+            # Payout of the picked side; dropped before writing
+            "_odds": decimal_odds(g.get("overOdds") if pick == "over" else g.get("underOdds")),
+        })
+    return rows
+
+
+def carried_rows(path, keep_season):
+    """History rows of one season from the existing backtest file (default -110 payout)."""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        history = json.load(f).get("history", [])
+    return [{**r, "_odds": decimal_odds(None)} for r in history if r.get("season") == keep_season]
+
+
+# ── Summary ───────────────────────────────────────────────────────
+
+def summarize(rows, edges=BUCKET_EDGES, min_edge=MIN_EDGE):
+    """(overall, buckets) for rows with edge >= min_edge, in one vectorized pass."""
+    edge = np.array([r["edge"] for r in rows], dtype=float)
+    won = np.array([r["correct"] for r in rows], dtype=bool)
+    odds = np.array([r["_odds"] for r in rows], dtype=float)
+    counted = edge >= min_edge
+    idx = np.digitize(edge[counted], edges) - 1          # 0 … len(edges)-1; below edges[0] → -1
+    ok = idx >= 0
+    idx, w, o = idx[ok], won[counted][ok], odds[counted][ok]
+    nb = len(edges)
+    games = np.bincount(idx, minlength=nb)
+    wins = np.bincount(idx, weights=w, minlength=nb).astype(int)
+    profit = np.bincount(idx, weights=np.where(w, o - 1, -1.0), minlength=nb)
+
+    def entry(n, k, p):
+        n, k = int(n), int(k)
+        return {"games": n, "wins": k, "losses": n - k,
+                "winPct": round(100 * k / n, 1) if n else 0,
+                "roi": round(100 * p / n, 1) if n else 0}
+
+    overall = entry(games.sum(), wins.sum(), profit.sum())
+    buckets = [{"name": name, **entry(games[b], wins[b], profit[b])}
+               for b, name in enumerate(bucket_names(edges))]
+    return overall, buckets
+
+
+# ── Walk-forward model replay ─────────────────────────────────────
+
+def _window_totals(task):
+    """Worker: fit the points model on scores before `start`, price the window's games."""
+    start, scores, window = task
+    from ncaa_lines import PointsModel, half_point
+    from team_registry import load_registry
+
+    registry = load_registry()
+    model = PointsModel.fit([s for s in scores if s[0] < start])
+
+    def idx(name):
+        team_id = registry.resolve(name, fuzzy=False)
+        return model.index.get(registry.name(team_id), -1) if team_id is not None else -1
+
+    home = np.array([idx(g["home"]) for _, g in window], dtype=np.int64)
+    away = np.array([idx(g["away"]) for _, g in window], dtype=np.int64)
+    at_home = np.array([0.0 if g.get("neutralSite") else 1.0 for _, g in window])
+    home_pts, away_pts = model.project(home, away, at_home)
+    return {i: float(t) for (i, _), t in zip(window, half_point(home_pts + away_pts))}
+
+
+def walk_forward_totals(games, since=LIVE_SINCE, window_days=WINDOW_DAYS, workers=None):
+    """{games.json index: walk-forward total} for completed games from `since` on."""
+    from ncaa_ratings import load_scores
+
+    scores = load_scores()
+    start = date.fromisoformat(since)
+    windows = {}
+    for i, g in enumerate(games):
+        if g["date"] >= since and g.get("vegasTotal") not in (None, "") and g.get("actualTotal") is not None:
+            k = (date.fromisoformat(g["date"]) - start).days // window_days
+            windows.setdefault(k, []).append((i, g))
+    tasks = [((start + timedelta(days=k * window_days)).isoformat(), scores, window)
+             for k, window in sorted(windows.items())]
+    totals = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(_window_totals, tasks):
+            totals.update(part)
+    return totals, len(tasks)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--walk-forward", action="store_true",
+                        help="Replay the points model walk-forward instead of using the published bbmiTotal")
+    parser.add_argument("--window-days", type=int, default=WINDOW_DAYS)
+    parser.add_argument("--workers", type=int, help="Worker processes for --walk-forward (default: CPU count)")
+    parser.add_argument("--dry-run", action="store_true", help="Report without writing")
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  BASKETBALL TOTALS BACKTEST")
+    print("=" * 60)
+    with open(LINES_FILE, encoding="utf-8") as f:
+        games = json.load(f)
+
+    started = time.perf_counter()
+    totals = None
+    live_label = "Live"
+    if args.walk_forward:
+        totals, windows = walk_forward_totals(games, window_days=args.window_days, workers=args.workers)
+        live_label = "Walk-Forward"
+        print(f"  Walk-forward: {windows} windows of {args.window_days} days, "
+              f"{len(totals):,} games priced ({time.perf_counter() - started:.1f}s)")
+
+    live = live_rows(games, totals)
+    carried = carried_rows(OUTPUT_FILE, "2024-25")
+    history = sorted(carried + live, key=lambda r: r["date"], reverse=True)
+    overall, buckets = summarize(history)
+    label = " + ".join(part for part in [
+        "2024-25 Walk-Forward" if carried else "",
+        f"{LIVE_SEASON} {live_label}",
+    ] if part)
+
+    print(f"  {label}: {len(live):,} {LIVE_SEASON} games + {len(carried):,} carried 2024-25 games")
+    print(f"\n  {'Edge':10s} {'Games':>6s} {'W-L':>11s} {'Win%':>6s} {'ROI':>6s}")
+    for b in buckets + [{"name": "Overall", **overall}]:
+        print(f"  {b['name']:10s} {b['games']:6d} {b['wins']:5d}-{b['losses']:<5d} {b['winPct']:6.1f} {b['roi']:+6.1f}")
+    print(f"\n  Time: {1000 * (time.perf_counter() - started):.0f} ms")
+
+    if args.dry_run:
+        print("\n  Dry run: nothing written")
+        return
+    output = {
+        "label": label,
+        "overall": overall,
+        "buckets": buckets,
+        "history": [{k: v for k, v in r.items() if not k.startswith("_")} for r in history],
+    }
+    write_json(args.output, output)
+    print(f"\n✅ Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
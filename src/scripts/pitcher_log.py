@@ -0,0 +1,346 @@
+"""
+Pitcher Game-Log Store
+=======================
+Flattens mlb-boxscores.json ("date|home team" → homePitchers / awayPitchers)
+into an indexed pitcher-appearance table, so questions like "last 5 starts
+for Logan Webb" are index lookups instead of a scan of every boxscore.
+
+SQLite store (src/data/.pitcher-log.sqlite, rebuilt from the JSON at will):
+  appearances  one row per pitcher per game: date, team, opponent, home,
+               starter flag, outs (ip as thirds), h, r, er, bb, k, decision,
+               plus running per-pitcher totals (cum_*) in game order
+               indexes: (pitcher, date) and (date)
+  pitchers     season totals per pitcher (= the latest running totals)
+  boxscores    content hash per boxscore key, to find new / changed games
+
+Syncing is incremental: only boxscores whose hash changed are (re)written.
+An appearance dated after a pitcher's last one extends the running totals
+in O(1). A back-filled or corrected game re-accumulates only that
+pitcher's later rows. Any window aggregate (last N appearances, innings
+over the last D days) is then the difference of two running-total rows.
+
+The boxscores carry no home runs, so the FIP-like component is
+(3·BB - 2·K) / IP + FIP_CONSTANT, i.e. FIP without its 13·HR term.
+Opponents come from mlb-games.json (the boxscore key only names the home team).
+
+USAGE:
+  python src/scripts/pitcher_log.py                           # sync the store from mlb-boxscores.json
+  python src/scripts/pitcher_log.py --pitcher "Logan Webb"    # last 5 starts + rolling aggregates
+  python src/scripts/pitcher_log.py --pitcher "Logan Webb" --last 3 --all-appearances
+  python src/scripts/pitcher_log.py --date 2026-04-12         # every appearance on a date
+  python src/scripts/pitcher_log.py --rebuild
+
+  sys.path.insert(0, os.path.join(BASE, "src", "scripts"))
+  from pitcher_log import PitcherLog
+  with PitcherLog() as log:
+      log.sync()
+      starts = log.appearances("Logan Webb", last=5, starts_only=True)
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+BASE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA = os.path.join(BASE, "src", "data")
+BOXSCORES_FILE = os.path.join(DATA, "mlb-boxscores.json")
+GAMES_FILE = os.path.join(DATA, "betting-lines", "mlb-games.json")
+STORE_FILE = os.path.join(DATA, ".pitcher-log.sqlite")
+
+FIP_CONSTANT = 3.10
+STATS = ("outs", "h", "r", "er", "bb", "k")
+CUMULATIVE = ("apps", "starts") + STATS
+
+
+def ip_to_outs(ip):
+    """Innings pitched → outs; accepts 6.33 / 6.67 thirds and 6.1 / 6.2 box notation."""
+    if ip is None:
+        return 0
+    whole = int(ip)
+    tenths = round((ip - whole) * 100)
+    return 3 * whole + {0: 0, 10: 1, 20: 2, 33: 1, 67: 2}.get(tenths, round((ip - whole) * 3))
+
+
+def derived(totals):
+    """Rate stats for a dict of summed components (outs, h, er, bb, k, ...)."""
+    ip = totals["outs"] / 3
+    if not ip:
+        return {"ip": 0.0, "era": None, "whip": None, "k9": None, "bb9": None, "kbb_fip": None}
+    return {
+        "ip": round(ip, 2),
+        "era": round(9 * totals["er"] / ip, 2),
+        "whip": round((totals["h"] + totals["bb"]) / ip, 2),
+        "k9": round(9 * totals["k"] / ip, 2),
+        "bb9": round(9 * totals["bb"] / ip, 2),
+        "kbb_fip": round((3 * totals["bb"] - 2 * totals["k"]) / ip + FIP_CONSTANT, 2),
+    }
+
+
+def load_opponents(path=GAMES_FILE):
+    """{(date, home team): away team} from mlb-games.json."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return {(g["date"], g["homeTeam"]): g["awayTeam"] for g in json.load(f)}
+
+
+def flatten(key, box, opponents):
+    """Appearance rows for one boxscore entry."""
+    date, home_team = key.split("|", 1)
+    away_team = opponents.get((date, home_team))
+    rows = []
+    for home, side in ((1, "homePitchers"), (0, "awayPitchers")):
+        team, opponent = (home_team, away_team) if home else (away_team, home_team)
+        for seq, p in enumerate(box.get(side) or []):
+            rows.append({
+                "game_key": key, "home": home, "seq": seq, "date": date, "team": team, "opponent": opponent,
+                "pitcher": p["name"], "is_starter": int(bool(p.get("isStarter"))),
+                "outs": ip_to_outs(p.get("ip")), "h": p.get("h") or 0, "r": p.get("r") or 0,
+                "er": p.get("er") or 0, "bb": p.get("bb") or 0, "k": p.get("k") or 0,
+                "decision": p.get("decision"),
+            })
+    return rows
+
+
+def box_hash(box):
+    pitchers = {"home": box.get("homePitchers"), "away": box.get("awayPitchers")}
+    return hashlib.sha1(json.dumps(pitchers, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class PitcherLog:
+    def __init__(self, path=STORE_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        cum = ", ".join(f" cum_{c} INTEGER NOT NULL DEFAULT 0" for c in CUMULATIVE)
+        totals = ", ".join(f" {c} INTEGER NOT NULL DEFAULT 0" for c in CUMULATIVE)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS appearances ("
+                " game_key TEXT NOT NULL, home INTEGER NOT NULL, seq INTEGER NOT NULL,"
+                " date TEXT NOT NULL, team TEXT, opponent TEXT, pitcher TEXT NOT NULL,"
+                " is_starter INTEGER NOT NULL, outs INTEGER NOT NULL, h INTEGER NOT NULL, r INTEGER NOT NULL,"
+                " er INTEGER NOT NULL, bb INTEGER NOT NULL, k INTEGER NOT NULL, decision TEXT,"
+                f"{cum},"
+                " PRIMARY KEY (game_key, home, seq))"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS appearances_pitcher ON appearances (pitcher, date, game_key)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS appearances_date ON appearances (date)")
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS pitchers (pitcher TEXT PRIMARY KEY,{totals},"
+                              " last_date TEXT)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS boxscores (game_key TEXT PRIMARY KEY, hash TEXT NOT NULL)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    # ── Sync ──────────────────────────────────────────────────────
+
+    def sync(self, boxscores=None, opponents=None):
+        """Bring the store up to date with mlb-boxscores.json. Returns {"added", "changed", "removed", "pitchers"}."""
+        if boxscores is None:
+            with open(BOXSCORES_FILE, encoding="utf-8") as f:
+                boxscores = json.load(f)
+        opponents = load_opponents() if opponents is None else opponents
+        known = dict(self.conn.execute("SELECT game_key, hash FROM boxscores"))
+        hashes = {key: box_hash(box) for key, box in boxscores.items()}
+        added = [k for k in hashes if k not in known]
+        changed = [k for k in hashes if k in known and known[k] != hashes[k]]
+        removed = [k for k in known if k not in hashes]
+
+        touched = {}  # pitcher → earliest date whose running totals must be re-accumulated
+        with self.conn:
+            for key in changed + removed:
+                for row in self.conn.execute("SELECT pitcher, date FROM appearances WHERE game_key = ?", (key,)):
+                    touched[row["pitcher"]] = min(row["date"], touched.get(row["pitcher"], row["date"]))
+                self.conn.execute("DELETE FROM appearances WHERE game_key = ?", (key,))
+                self.conn.execute("DELETE FROM boxscores WHERE game_key = ?", (key,))
+            for key in sorted(added + changed):  # date order keeps most appends O(1)
+                for row in flatten(key, boxscores[key], opponents):
+                    self._append(row, touched)
+                self.conn.execute("INSERT INTO boxscores VALUES (?, ?)", (key, hashes[key]))
+            for pitcher, since in touched.items():
+                self._reaccumulate(pitcher, since)
+        return {"added": len(added), "changed": len(changed), "removed": len(removed), "pitchers": len(touched)}
+
+    def _append(self, row, touched):
+        last = self.conn.execute("SELECT * FROM pitchers WHERE pitcher = ?", (row["pitcher"],)).fetchone()
+        in_order = last is None or (last["last_date"] < row["date"] and row["pitcher"] not in touched)
+        base = {c: (last[c] if last is not None else 0) for c in CUMULATIVE}
+        own = {"apps": 1, "starts": row["is_starter"], **{s: row[s] for s in STATS}}
+        cum = {c: base[c] + own[c] for c in CUMULATIVE}
+        columns = list(row) + [f"cum_{c}" for c in CUMULATIVE]
+        self.conn.execute(f"INSERT INTO appearances ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                          list(row.values()) + [cum[c] for c in CUMULATIVE])
+        if in_order:
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO pitchers (pitcher, {', '.join(CUMULATIVE)}, last_date) "
+                f"VALUES (?, {', '.join('?' * len(CUMULATIVE))}, ?)",
+                [row["pitcher"]] + [cum[c] for c in CUMULATIVE] + [row["date"]])
+        else:
+            # Back-filled game: its running totals and everything after it are redone in sync()
+            touched[row["pitcher"]] = min(row["date"], touched.get(row["pitcher"], row["date"]))
+
+    def _reaccumulate(self, pitcher, since):
+        """Recompute running totals for a pitcher's appearances on/after `since`."""
+        prev = self.conn.execute(
+            f"SELECT {', '.join('cum_' + c for c in CUMULATIVE)} FROM appearances"
+            " WHERE pitcher = ? AND date < ? ORDER BY date DESC, game_key DESC LIMIT 1", (pitcher, since)).fetchone()
+        running = {c: (prev[f"cum_{c}"] if prev else 0) for c in CUMULATIVE}
+        rows = self.conn.execute(
+            "SELECT rowid, date, is_starter, outs, h, r, er, bb, k FROM appearances"
+            " WHERE pitcher = ? AND date >= ? ORDER BY date, game_key", (pitcher, since)).fetchall()
+        last_date = None
+        for r in rows:
+            running["apps"] += 1
+            running["starts"] += r["is_starter"]
+            for s in STATS:
+                running[s] += r[s]
+            self.conn.execute(f"UPDATE appearances SET {', '.join(f'cum_{c} = ?' for c in CUMULATIVE)} WHERE rowid = ?",
+                              [running[c] for c in CUMULATIVE] + [r["rowid"]])
+            last_date = r["date"]
+        if last_date is None:
+            last_date = self.conn.execute("SELECT MAX(date) FROM appearances WHERE pitcher = ?",
+                                          (pitcher,)).fetchone()[0]
+        if last_date is None:
+            self.conn.execute("DELETE FROM pitchers WHERE pitcher = ?", (pitcher,))
+            return
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO pitchers (pitcher, {', '.join(CUMULATIVE)}, last_date) "
+            f"VALUES (?, {', '.join('?' * len(CUMULATIVE))}, ?)",
+            [pitcher] + [running[c] for c in CUMULATIVE] + [last_date])
+
+    # ── Queries ───────────────────────────────────────────────────
+
+    def appearances(self, pitcher, last=None, starts_only=False, before=None):
+        """A pitcher's appearances, most recent first."""
+        sql = "SELECT * FROM appearances WHERE pitcher = ?"
+        params = [pitcher]
+        if starts_only:
+            sql += " AND is_starter = 1"
+        if before:
+            sql += " AND date < ?"
+            params.append(before)
+        sql += " ORDER BY date DESC, game_key DESC"
+        if last:
+            sql += " LIMIT ?"
+            params.append(last)
+        return [dict(r) for r in self.conn.execute(sql, params)]
+
+    def on_date(self, date):
+        return [dict(r) for r in self.conn.execute(
+            "SELECT * FROM appearances WHERE date = ? ORDER BY game_key, home DESC, seq", (date,))]
+
+    def season(self, pitcher):
+        row = self.conn.execute("SELECT * FROM pitchers WHERE pitcher = ?", (pitcher,)).fetchone()
+        if row is None:
+            return None
+        totals = dict(row)
+        return {**totals, **derived(totals)}
+
+    def _cum_before(self, pitcher, where, params):
+        row = self.conn.execute(
+            f"SELECT {', '.join('cum_' + c for c in CUMULATIVE)} FROM appearances WHERE pitcher = ? AND {where}"
+            " ORDER BY date DESC, game_key DESC LIMIT 1", [pitcher] + params).fetchone()
+        return {c: (row[f"cum_{c}"] if row else 0) for c in CUMULATIVE}
+
+    def rolling(self, pitcher, last=None, days=None, as_of=None):
+        """
+        Aggregates over a pitcher's last `last` appearances or the `days` days
+        before `as_of` (default: after their latest game), from two running-total rows.
+        An unknown pitcher gets zero totals.
+        """
+        end = self._cum_before(pitcher, "date <= ?", [as_of or "9999-12-31"])
+        if last is not None:
+            offset = self.conn.execute(
+                f"SELECT {', '.join('cum_' + c for c in CUMULATIVE)} FROM appearances"
+                " WHERE pitcher = ? AND cum_apps = ?", (pitcher, end["apps"] - last)).fetchone()
+            start = {c: (offset[f"cum_{c}"] if offset else 0) for c in CUMULATIVE}
+        elif days is not None:
+            from datetime import date as _date, timedelta
+            if as_of is None:
+                row = self.conn.execute("SELECT last_date FROM pitchers WHERE pitcher = ?", (pitcher,)).fetchone()
+                as_of = row[0] if row else None
+            if as_of is None:
+                start = end
+            else:
+                anchor = _date.fromisoformat(as_of)
+                start = self._cum_before(pitcher, "date <= ?", [(anchor - timedelta(days=days)).isoformat()])
+        else:
+            start = {c: 0 for c in CUMULATIVE}
+        totals = {c: end[c] - start[c] for c in CUMULATIVE}
+        return {**totals, **derived(totals)}
+
+
+def _fmt_ip(outs):
+    return f"{outs // 3}.{outs % 3}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pitcher", help="Show a pitcher's recent games and rolling aggregates")
+    parser.add_argument("--last", type=int, default=5)
+    parser.add_argument("--all-appearances", action="store_true", help="Include relief appearances")
+    parser.add_argument("--date", help="List every pitching line on a date")
+    parser.add_argument("--rebuild", action="store_true", help="Delete the store and rebuild it")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  PITCHER GAME-LOG STORE")
+    print("=" * 60)
+    if args.rebuild:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(STORE_FILE + suffix):
+                os.remove(STORE_FILE + suffix)
+
+    with PitcherLog() as log:
+        started = time.perf_counter()
+        stats = log.sync()
+        total = log.conn.execute("SELECT COUNT(*) FROM appearances").fetchone()[0]
+        print(f"  Sync: {stats['added']} new, {stats['changed']} changed, {stats['removed']} removed boxscores "
+              f"({stats['pitchers']} pitchers re-accumulated) in {1000 * (time.perf_counter() - started):.0f} ms")
+        print(f"  Store: {total:,} appearances")
+
+        if args.pitcher:
+            started = time.perf_counter()
+            games = log.appearances(args.pitcher, last=args.last, starts_only=not args.all_appearances)
+            season = log.season(args.pitcher)
+            if season is None:
+                print(f"\n  No appearances for {args.pitcher}")
+                return
+            last_n = log.rolling(args.pitcher, last=args.last)
+            recent = log.rolling(args.pitcher, days=14)
+            elapsed = 1000 * (time.perf_counter() - started)
+            kind = "appearances" if args.all_appearances else "starts"
+            print(f"\n  {args.pitcher}: last {len(games)} {kind} ({elapsed:.2f} ms)")
+            for g in games:
+                side = "vs" if g["home"] else "@"
+                print(f"   {g['date']}  {g['team'] or '?':>22s} {side:2s} {g['opponent'] or '?':<22s} "
+                      f"{_fmt_ip(g['outs']):>4s} IP  {g['h']} H  {g['er']} ER  {g['bb']} BB  {g['k']} K"
+                      f"  {g['decision'] or ''}")
+            for label, agg in ((f"Last {args.last} apps", last_n), ("Last 14 days", recent), ("Season", season)):
+                print(f"   {label:14s} {agg['apps']:3d} G {agg['starts']:3d} GS  {_fmt_ip(agg['outs']):>6s} IP  "
+                      f"ERA {agg['era'] if agg['era'] is not None else '-':>5}  WHIP {agg['whip'] if agg['whip'] is not None else '-':>4}  "
+                      f"K/9 {agg['k9'] if agg['k9'] is not None else '-':>5}  FIP* {agg['kbb_fip'] if agg['kbb_fip'] is not None else '-':>5}")
+            print("   (FIP* = FIP without the home-run term; boxscores have no HR)")
+
+        if args.date:
+            rows = log.on_date(args.date)
+            print(f"\n  {args.date}: {len(rows)} pitching lines")
+            for g in rows:
+                tag = "SP" if g["is_starter"] else "RP"
+                print(f"   {g['team'] or '?':>22s} {tag} {g['pitcher']:<24s} {_fmt_ip(g['outs']):>4s} IP  "
+                      f"{g['er']} ER  {g['k']} K")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Local Read API
+===============
+asyncio (aiohttp) service answering filtered queries over the betting-lines
+and rankings artifacts from memory.
+
+  - every artifact is parsed once and indexed by date, team and sport
+  - queries intersect index postings instead of scanning the file
+  - responses carry an ETag derived from the artifact version + query, so a
+    client revalidating with If-None-Match gets a 304 without the server
+    serializing anything; serialized bodies are cached per version
+  - artifacts hot-reload when their file changes (inotify / polling via
+    file_watch); the swap is atomic, in-flight requests finish on the old copy
+
+Endpoints:
+  GET /api/datasets                                  names, row counts, versions
+  GET /api/<dataset>?date=&from=&to=&team=&sport=&limit=
+  GET /api/games?sport=mlb&date=2026-04-18           game datasets by sport
+  GET /health
+
+USAGE:
+  python src/scripts/read_api.py [--host 127.0.0.1] [--port 8765]
+  curl 'http://127.0.0.1:8765/api/ncaab-games?team=Duke'
+  python src/scripts/read_api_loadtest.py --duration 10   # measure requests/sec
+"""
+import argparse
+import asyncio
+import bisect
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from file_watch import watch
+from team_registry import normalize
+
+BASE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA = os.path.join(BASE, "src", "data")
+
+# dataset -> file, record field (if nested) or mapping key (for {name: record} files),
+# date field, team fields, sport (field or constant)
+DATASETS = {
+    "ncaab-games": {"file": "betting-lines/games.json", "date": "date", "teams": ["home", "away"], "sport": "ncaab"},
+    "ncaaf-games": {"file": "betting-lines/football-games.json", "date": "gameDate",
+                    "teams": ["homeTeam", "awayTeam"], "sport": "ncaaf"},
+    "mlb-games": {"file": "betting-lines/mlb-games.json", "date": "date", "teams": ["homeTeam", "awayTeam"],
+                  "sport": "mlb"},
+    "nfl-games": {"file": "betting-lines/nfl-games.json", "date": "date", "teams": ["homeTeam", "awayTeam"],
+                  "sport": "nfl"},
+    "kalshi-trades": {"file": "betting-lines/kalshi-trades.json", "records": "trades", "date": "date",
+                      "teams": ["home_team", "away_team"], "sport_field": "sport"},
+    "rankings": {"file": "rankings/rankings.json", "teams": ["team"], "sport": "ncaab"},
+    "football-rankings": {"file": "rankings/football-rankings.json", "teams": ["team"], "sport": "ncaaf"},
+    "baseball-rankings": {"file": "rankings/baseball-rankings.json", "mapping_key": "team", "teams": ["team"],
+                          "sport": "ncaabb"},
+}
+GAME_DATASETS = ["ncaab-games", "ncaaf-games", "mlb-games", "nfl-games"]
+BODY_CACHE_SIZE = 2048  # serialized responses kept per process
+DEBOUNCE = 0.3
+
+
+def records(data, cfg):
+    """Row list of a loaded artifact."""
+    if cfg.get("records"):
+        return data.get(cfg["records"], [])
+    if cfg.get("mapping_key"):
+        return [{cfg["mapping_key"]: k, **v} for k, v in data.items()]
+    return data
+
+
+class Artifact:
+    """One loaded file: rows plus date / team / sport posting lists (row indices)."""
+
+    def __init__(self, name, cfg):
+        self.name = name
+        self.path = os.path.join(DATA, cfg["file"])
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        self.version = hashlib.sha256(raw).hexdigest()[:16]
+        self.loaded = time.time()
+        data = json.loads(raw)
+        self.rows = records(data, cfg)
+
+        self.by_date, self.by_team, self.by_sport = {}, {}, {}
+        date_field = cfg.get("date")
+        for i, r in enumerate(self.rows):
+            if date_field and r.get(date_field):
+                self.by_date.setdefault(str(r[date_field])[:10], []).append(i)
+            for f in cfg.get("teams", []):
+                if r.get(f):
+                    postings = self.by_team.setdefault(normalize(str(r[f])), [])
+                    if not postings or postings[-1] != i:
+                        postings.append(i)
+            sport = r.get(cfg["sport_field"]) if cfg.get("sport_field") else cfg.get("sport")
+            if sport:
+                self.by_sport.setdefault(str(sport).lower(), []).append(i)
+        self.dates = sorted(self.by_date)
+
+    def select(self, date=None, date_from=None, date_to=None, team=None, sport=None):
+        """Row indices matching every given filter, in file order (None = all rows)."""
+        sets = []
+        if date:
+            sets.append(self.by_date.get(date[:10], []))
+        if date_from or date_to:
+            lo = bisect.bisect_left(self.dates, date_from or "")
+            hi = bisect.bisect_right(self.dates, date_to or "9999")
+            sets.append([i for d in self.dates[lo:hi] for i in self.by_date[d]])
+        if team:
+            sets.append(self.by_team.get(normalize(team), []))
+        if sport:
+            sets.append(self.by_sport.get(sport.lower(), []))
+        if not sets:
+            return None
+        sets.sort(key=len)
+        result = set(sets[0])
+        for s in sets[1:]:
+            result.intersection_update(s)
+            if not result:
+                break
+        return sorted(result)
+
+
+class Store:
+    """All artifacts; reload() swaps one in atomically."""
+
+    def __init__(self):
+        self.artifacts = {}
+        self.bodies = OrderedDict()
+        for name, cfg in DATASETS.items():
+            if os.path.exists(os.path.join(DATA, cfg["file"])):
+                self.artifacts[name] = Artifact(name, cfg)
+
+    def reload(self, path):
+        for name, cfg in DATASETS.items():
+            if os.path.normpath(os.path.join(DATA, cfg["file"])) == os.path.normpath(path):
+                try:
+                    artifact = Artifact(name, cfg)
+                except (OSError, ValueError) as e:
+                    print(f"  ⚠️  reload of {name} failed, keeping previous version: {e}")
+                    return
+                old = self.artifacts.get(name)
+                self.artifacts[name] = artifact
+                if not old or old.version != artifact.version:
+                    print(f"  🔄 {name} reloaded ({len(artifact.rows)} rows, version {artifact.version})")
+
+    def body(self, key, build):
+        cached = self.bodies.get(key)
+        if cached is not None:
+            self.bodies.move_to_end(key)
+            return cached
+        body = build()
+        self.bodies[key] = body
+        if len(self.bodies) > BODY_CACHE_SIZE:
+            self.bodies.popitem(last=False)
+        return body
+
+
+# ── HTTP ──────────────────────────────────────────────────────────
+
+QUERY_PARAMS = ("date", "from", "to", "team", "sport", "limit")
+
+
+def query_of(request):
+    return {k: request.query[k] for k in QUERY_PARAMS if request.query.get(k)}
+
+
+def respond(request, store, artifacts, query):
+    """ETag / 304 handling plus the cached JSON body for `query` over `artifacts`."""
+    if "limit" in query and not query["limit"].isdigit():
+        raise web.HTTPBadRequest(text="limit must be a non-negative integer")
+    versions = "+".join(f"{a.name}@{a.version}" for a in artifacts)
+    canonical = json.dumps(query, sort_keys=True)
+    etag = '"' + hashlib.sha1(f"{versions}|{canonical}".encode()).hexdigest()[:20] + '"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in (t.strip() for t in request.headers.get("If-None-Match", "").split(",")):
+        return web.Response(status=304, headers=headers)
+
+    def build():
+        rows = []
+        for a in artifacts:
+            idx = a.select(query.get("date"), query.get("from"), query.get("to"),
+                           query.get("team"), query.get("sport"))
+            rows.extend(a.rows if idx is None else [a.rows[i] for i in idx])
+        if query.get("limit"):
+            rows = rows[:int(query["limit"])]
+        payload = {"datasets": [a.name for a in artifacts], "count": len(rows), "rows": rows}
+        return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    body = store.body(etag, build)
+    return web.Response(body=body, content_type="application/json", headers=headers)
+
+
+def make_app(store):
+    routes = web.RouteTableDef()
+
+    @routes.get("/health")
+    async def health(request):
+        return web.json_response({"ok": True, "datasets": len(store.artifacts)})
+
+    @routes.get("/api/datasets")
+    async def datasets(request):
+        return web.json_response({
+            name: {"rows": len(a.rows), "version": a.version, "dates": len(a.dates), "teams": len(a.by_team),
+                   "loaded": a.loaded}
+            for name, a in store.artifacts.items()
+        })
+
+    @routes.get("/api/games")
+    async def games(request):
+        query = query_of(request)
+        sport = query.pop("sport", None)
+        names = [n for n in GAME_DATASETS if n in store.artifacts and (not sport or DATASETS[n]["sport"] == sport.lower())]
+        if not names:
+            raise web.HTTPNotFound(text=f"No game dataset for sport {sport!r}")
+        return respond(request, store, [store.artifacts[n] for n in names], query)
+
+    @routes.get("/api/{dataset}")
+    async def dataset(request):
+        artifact = store.artifacts.get(request.match_info["dataset"])
+        if artifact is None:
+            raise web.HTTPNotFound(text="Unknown dataset; see /api/datasets")
+        return respond(request, store, [artifact], query_of(request))
+
+    app = web.Application()
+    app.add_routes(routes)
+    return app
+
+
+def start_reloader(store, loop, force_poll=False):
+    """Watch the artifact directories on a thread; reload on the event loop."""
+    dirs = sorted({os.path.dirname(os.path.join(DATA, cfg["file"])) for cfg in DATASETS.values()})
+    watched = {os.path.normpath(os.path.join(DATA, cfg["file"])) for cfg in DATASETS.values()}
+
+    def run():
+        for batch in watch(dirs, debounce=DEBOUNCE, force_poll=force_poll):
+            paths = watched if batch is None else {os.path.normpath(p) for p in batch} & watched
+            for path in paths:
+                loop.call_soon_threadsafe(store.reload, path)
+
+    threading.Thread(target=run, name="artifact-watch", daemon=True).start()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--poll", action="store_true", help="Poll for file changes instead of inotify")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    store = Store()
+    print(f"  Loaded {len(store.artifacts)} datasets in {(time.perf_counter() - started) * 1000:.0f} ms:")
+    for name, a in store.artifacts.items():
+        print(f"    {name:18s} {len(a.rows):>6} rows  {len(a.dates):>4} dates  {len(a.by_team):>4} teams")
+
+    async def on_startup(app):
+        start_reloader(store, asyncio.get_running_loop(), args.poll)
+
+    app = make_app(store)
+    app.on_startup.append(on_startup)
+    web.run_app(app, host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
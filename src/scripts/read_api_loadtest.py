@@ -0,0 +1,125 @@
+"""
+Read API Load Test
+===================
+Drives a running read_api.py with concurrent aiohttp clients and reports
+requests/second and latency percentiles.
+
+Queries are sampled from the live data (real dates and team names from
+/api/datasets-listed artifacts), mixing date, team, date-range and
+whole-dataset requests. With --revalidate, each client remembers ETags and
+sends If-None-Match, measuring the 304 path a browser would hit.
+
+USAGE:
+  python src/scripts/read_api.py &
+  python src/scripts/read_api_loadtest.py --duration 10 --concurrency 50
+  python src/scripts/read_api_loadtest.py --revalidate
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+
+import aiohttp
+import numpy as np
+
+from read_api import DATA, DATASETS, records
+
+
+def sample_queries(n, seed=0):
+    """(path, params) pairs drawn from the artifacts on disk."""
+    rng = random.Random(seed)
+    pools = []
+    for name, cfg in DATASETS.items():
+        path = os.path.join(DATA, cfg["file"])
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        rows = records(data, cfg)
+        dates = sorted({str(r[cfg["date"]])[:10] for r in rows if cfg.get("date") and r.get(cfg["date"])})
+        teams = sorted({r[t] for r in rows for t in cfg.get("teams", []) if r.get(t)})
+        pools.append((name, dates, teams))
+
+    queries = []
+    for _ in range(n):
+        name, dates, teams = rng.choice(pools)
+        kind = rng.random()
+        if dates and kind < 0.35:
+            params = {"date": rng.choice(dates)}
+        elif teams and kind < 0.75:
+            params = {"team": rng.choice(teams)}
+        elif len(dates) > 7 and kind < 0.9:
+            i = rng.randrange(len(dates) - 7)
+            params = {"from": dates[i], "to": dates[i + 7]}
+        else:
+            params = {"limit": "50"}
+        queries.append((f"/api/{name}", params))
+    return queries
+
+
+async def worker(session, base, queries, deadline, revalidate, stats):
+    etags = {}
+    i = random.randrange(len(queries))
+    while time.perf_counter() < deadline:
+        path, params = queries[i % len(queries)]
+        i += 1
+        key = (path, tuple(sorted(params.items())))
+        headers = {"If-None-Match": etags[key]} if revalidate and key in etags else {}
+        started = time.perf_counter()
+        try:
+            async with session.get(base + path, params=params, headers=headers) as resp:
+                body = await resp.read()
+                stats["latencies"].append(time.perf_counter() - started)
+                stats["status"][resp.status] = stats["status"].get(resp.status, 0) + 1
+                stats["bytes"] += len(body)
+                if resp.headers.get("ETag"):
+                    etags[key] = resp.headers["ETag"]
+        except aiohttp.ClientError:
+            stats["errors"] += 1
+
+
+async def run(base, duration, concurrency, revalidate, n_queries):
+    queries = sample_queries(n_queries)
+    stats = {"latencies": [], "status": {}, "bytes": 0, "errors": 0}
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async with session.get(base + "/health") as resp:
+            resp.raise_for_status()
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(session, base, queries, deadline, revalidate, stats)
+                               for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return stats, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent clients")
+    parser.add_argument("--queries", type=int, default=500, help="Distinct queries sampled from the data")
+    parser.add_argument("--revalidate", action="store_true", help="Send If-None-Match with remembered ETags")
+    args = parser.parse_args()
+
+    stats, elapsed = asyncio.run(run(args.url.rstrip("/"), args.duration, args.concurrency,
+                                     args.revalidate, args.queries))
+    lat = np.array(stats["latencies"]) * 1000
+    total = len(lat)
+    print("=" * 60)
+    print(f"  READ API LOAD TEST  ({args.concurrency} clients, {elapsed:.1f}s"
+          f"{', revalidating' if args.revalidate else ''})")
+    print("=" * 60)
+    print(f"  Requests:     {total:,}  ({total / elapsed:,.0f} req/s)")
+    print(f"  Status:       {', '.join(f'{k}: {v:,}' for k, v in sorted(stats['status'].items()))}")
+    print(f"  Errors:       {stats['errors']}")
+    print(f"  Transferred:  {stats['bytes'] / 1024 / 1024:,.1f} MB")
+    if total:
+        p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+        print(f"  Latency ms:   p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f}  max {lat.max():.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,494 @@
+"""
+Data Snapshot Archive
+======================
+Keeps every version of the src/data files in one content-addressed,
+delta-compressed archive, replacing the ad-hoc *.json.bak copies and
+_backup_<stamp>/ folders.
+
+  - a version is stored once per distinct content (sha256), whatever path
+    or date it was seen under
+  - a new version of a file is stored as a line delta against the file's
+    previous version when that is smaller than storing it whole; delta
+    chains are capped at MAX_CHAIN so a restore never replays too many
+  - JSON files are diffed in a canonical pretty-printed form (indent=1),
+    since minified JSON is a single line and would never share a line with
+    its previous version. The delta records the serializer layout
+    (indent, separators, ensure_ascii, trailing newline) that rebuilds the
+    exact original bytes; a file that no layout reproduces byte-for-byte
+    (e.g. 1.50 written by another tool) falls back to a raw line delta.
+    Keys keep their order (no sort_keys) because the restore must be exact
+  - objects are compressed with zstd when the `zstandard` package is
+    installed, gzip otherwise (the codec is recorded per object)
+  - index.json lists each file's versions by snapshot time (local time), so
+    "the file as of 2026-03-09" is a bisect over that list
+
+Requires Python 3.8+.
+
+Layout (gitignored):
+  src/data/.snapshots/index.json
+  src/data/.snapshots/objects/ab/abcdef...    compressed full copy or delta
+
+USAGE:
+  python src/scripts/snapshot_archive.py                       # snapshot every data file
+  python src/scripts/snapshot_archive.py src/data/rankings/rankings.json
+  python src/scripts/snapshot_archive.py --import-legacy       # ingest *.bak / _backup_* copies
+  python src/scripts/snapshot_archive.py --list src/data/betting-lines/games.json
+  python src/scripts/snapshot_archive.py --restore 2026-03-09 src/data/rankings/rankings.json
+  python src/scripts/snapshot_archive.py --restore 2026-03-09 --to /tmp/data-0309   # whole tree
+  python src/scripts/snapshot_archive.py --stats
+"""
+import argparse
+import bisect
+import gzip
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+BASE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA = os.path.join(BASE, "src", "data")
+ARCHIVE_DIR = os.path.join(DATA, ".snapshots")
+INDEX_FILE = "index.json"
+
+SNAPSHOT_EXTENSIONS = (".json", ".csv")
+# Directories under src/data that are derived, cached or legacy backups
+SKIP_DIRS = {".snapshots", "parquet", "deltas"}
+LEGACY_DIR = re.compile(r"^_backup_(\d{8})_(\d{6})$")
+LEGACY_SUFFIX = ".bak"
+
+MAX_CHAIN = 30  # deltas replayed at most per restore
+DELTA_MIN_SAVING = 0.9  # keep a delta only if it is < 90% of the full object
+
+
+# ── Line delta ────────────────────────────────────────────────────
+
+def make_delta(base, target):
+    """Binary delta turning `base` into `target`: JSON op list, newline, literal bytes.
+
+    Ops are [0, base_line, count] (copy lines from base) or [1, nbytes]
+    (take the next nbytes of the literal section).
+    """
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    where = {}
+    for i, line in enumerate(base_lines):
+        where.setdefault(line, []).append(i)
+
+    ops, literal = [], bytearray()
+    expect = 0  # base line that would continue the current copy
+    i = 0
+    while i < len(target_lines):
+        line = target_lines[i]
+        start = None
+        if expect < len(base_lines) and base_lines[expect] == line:
+            start = expect
+        elif line in where:
+            # Prefer the first occurrence at or after where the last copy ended
+            positions = where[line]
+            k = bisect.bisect_left(positions, expect)
+            start = positions[k] if k < len(positions) else positions[0]
+        if start is None:
+            if ops and ops[-1][0] == 1:
+                ops[-1][1] += len(line)
+            else:
+                ops.append([1, len(line)])
+            literal += line
+            i += 1
+            continue
+        count = 1
+        while (i + count < len(target_lines) and start + count < len(base_lines)
+               and base_lines[start + count] == target_lines[i + count]):
+            count += 1
+        if ops and ops[-1][0] == 0 and ops[-1][1] + ops[-1][2] == start:
+            ops[-1][2] += count
+        else:
+            ops.append([0, start, count])
+        expect = start + count
+        i += count
+    return json.dumps(ops, separators=(",", ":")).encode() + b"\n" + bytes(literal)
+
+
+def json_layout(data):
+    """(parsed value, layout) where `layout` re-serializes to exactly `data`; (None, None) if not JSON."""
+    try:
+        text = data.decode("utf-8")
+        value = json.loads(text)
+    except ValueError:
+        return None, None
+    newline = text.endswith("\n")
+    m = re.search(r"\n([ \t]+)\S", text)
+    indent = None
+    if m:
+        ws = m.group(1)
+        indent = "\t" if ws.startswith("\t") else len(ws)
+    separator_options = [[",", ": "]] if indent is not None else [[",", ":"], [", ", ": "]]
+    for separators in separator_options:
+        for ensure_ascii in ([False, True] if text.isascii() else [False]):
+            layout = {"indent": indent, "separators": separators, "ascii": ensure_ascii, "newline": newline}
+            if render_json(value, layout) == data:
+                return value, layout
+    return value, None
+
+
+def render_json(value, layout):
+    text = json.dumps(value, indent=layout["indent"], separators=tuple(layout["separators"]),
+                      ensure_ascii=layout["ascii"])
+    return (text + "\n" if layout["newline"] else text).encode("utf-8")
+
+
+def canonical_json(value):
+    """One value per line, so line deltas work whatever the file's own layout."""
+    return json.dumps(value, indent=1, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def apply_delta(base, delta):
+    header, _, literal = delta.partition(b"\n")
+    base_lines = base.splitlines(keepends=True)
+    out, pos = [], 0
+    for op in json.loads(header):
+        if op[0] == 0:
+            out.extend(base_lines[op[1]:op[1] + op[2]])
+        else:
+            out.append(literal[pos:pos + op[1]])
+            pos += op[1]
+    return b"".join(out)
+
+
+# ── Compression ───────────────────────────────────────────────────
+
+def compress(data):
+    """(codec, bytes) using the best codec available."""
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=19).compress(data)
+    return "gzip", gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def decompress(codec, data):
+    if codec == "gzip":
+        return gzip.decompress(data)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Object is zstd-compressed; install the `zstandard` package to read it")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unknown codec {codec!r}")
+
+
+# ── Archive ───────────────────────────────────────────────────────
+
+def rel_path(path):
+    return os.path.relpath(os.path.abspath(path), BASE).replace(os.sep, "/")
+
+
+class Archive:
+    """index.json plus the object store.
+
+    index = {"objects": {sha: {"codec", "size", "stored", "base", "depth", ["layout"]}},
+             "files":   {repo-relative path: [[timestamp, sha or None], ...]}}
+    A None sha marks the file as deleted from that time on.
+    """
+
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, INDEX_FILE)
+        self.index = {"objects": {}, "files": {}}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                self.index = json.load(f)
+        self._cache = {}
+
+    @property
+    def objects(self):
+        return self.index["objects"]
+
+    @property
+    def files(self):
+        return self.index["files"]
+
+    def save(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, separators=(",", ":"))
+        os.replace(tmp, self.index_path)
+
+    def _object_path(self, sha):
+        return os.path.join(self.root, "objects", sha[:2], sha)
+
+    # ── Reading ──
+
+    def read(self, sha):
+        """Raw bytes of an object, replaying its delta chain."""
+        if sha in self._cache:
+            return self._cache[sha]
+        chain = []
+        cur = sha
+        while cur is not None and cur not in self._cache:
+            chain.append(cur)
+            cur = self.objects[cur]["base"]
+        data = self._cache.get(cur)
+        for s in reversed(chain):
+            meta = self.objects[s]
+            with open(self._object_path(s), "rb") as f:
+                payload = decompress(meta["codec"], f.read())
+            if meta["base"] is None:
+                data = payload
+            elif meta.get("layout"):
+                # Delta between canonical forms; re-serialize in the file's own layout
+                canon = apply_delta(canonical_json(json.loads(data)), payload)
+                data = render_json(json.loads(canon), meta["layout"])
+            else:
+                data = apply_delta(data, payload)
+            if hashlib.sha256(data).hexdigest() != s:
+                raise RuntimeError(f"Archive object {s} is corrupt")
+        self._cache = {sha: data}  # keep only the last result; chains share prefixes rarely enough
+        return data
+
+    def version_at(self, path, when):
+        """sha of `path` as of timestamp `when` (None if absent or deleted then)."""
+        versions = self.files.get(path, [])
+        k = bisect.bisect_right([t for t, _ in versions], when)
+        return versions[k - 1][1] if k else None
+
+    # ── Writing ──
+
+    def _head(self, path):
+        """Most recently stored version of `path` (delta base candidate)."""
+        for _, sha in reversed(self.files.get(path, [])):
+            if sha is not None:
+                return sha
+        return None
+
+    def store(self, data, base=None):
+        """Store `data` (delta against `base` when that pays off); returns (sha, stored bytes added)."""
+        sha = hashlib.sha256(data).hexdigest()
+        if sha in self.objects:
+            return sha, 0
+        codec, full = compress(data)
+        meta = {"codec": codec, "size": len(data), "stored": len(full), "base": None, "depth": 0}
+        payload = full
+        if base is not None and base in self.objects and self.objects[base]["depth"] < MAX_CHAIN:
+            base_data = self.read(base)
+            value, layout = json_layout(data)
+            if layout is not None:
+                try:
+                    source, target = canonical_json(json.loads(base_data)), canonical_json(value)
+                except ValueError:
+                    layout = None
+            if layout is None:
+                layout, source, target = None, base_data, data
+            codec_d, delta = compress(make_delta(source, target))
+            if len(delta) < len(full) * DELTA_MIN_SAVING:
+                payload = delta
+                meta.update(codec=codec_d, stored=len(delta), base=base,
+                            depth=self.objects[base]["depth"] + 1)
+                if layout is not None:
+                    meta["layout"] = layout
+        path = self._object_path(sha)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+        self.objects[sha] = meta
+        return sha, meta["stored"]
+
+    def record(self, path, sha, when):
+        """Add a version entry unless it repeats the version already current at `when`."""
+        versions = self.files.setdefault(path, [])
+        if self.version_at(path, when) == sha:
+            return False
+        # bisect on the timestamps (insort's key= needs Python 3.10)
+        versions.insert(bisect.bisect_right([t for t, _ in versions], when), [when, sha])
+        return True
+
+    def snapshot_file(self, full_path, path, when):
+        """Archive one file under repo-relative `path`; returns (changed, stored bytes added)."""
+        with open(full_path, "rb") as f:
+            data = f.read()
+        sha, added = self.store(data, base=self._head(path))
+        return self.record(path, sha, when), added
+
+
+# ── Discovery ─────────────────────────────────────────────────────
+
+def data_files(root=DATA):
+    """Repo-relative paths of every snapshot-able file under src/data."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not LEGACY_DIR.match(d))
+        for name in sorted(filenames):
+            if name.endswith(SNAPSHOT_EXTENSIONS):
+                found.append(rel_path(os.path.join(dirpath, name)))
+    return found
+
+
+def legacy_copies(root=DATA):
+    """[(full path, original repo-relative path, timestamp)] for *.bak files and _backup_* folders."""
+    copies = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for name in sorted(filenames):
+            full = os.path.join(dirpath, name)
+            if name.endswith(LEGACY_SUFFIX):
+                when = datetime.fromtimestamp(os.path.getmtime(full)).isoformat(timespec="seconds")
+                copies.append((full, rel_path(full[:-len(LEGACY_SUFFIX)]), when))
+                continue
+            # src/data/_backup_20260309_184422/wiaa-seeding/x.json -> src/data/wiaa-seeding/x.json
+            parts = os.path.relpath(full, root).split(os.sep)
+            m = LEGACY_DIR.match(parts[0])
+            if m and len(parts) > 1:
+                when = datetime.strptime(m.group(1) + m.group(2), "%Y%m%d%H%M%S").isoformat(timespec="seconds")
+                copies.append((full, rel_path(os.path.join(root, *parts[1:])), when))
+    return copies
+
+
+def parse_when(text):
+    """Timestamp at the end of a YYYY-MM-DD date, or a full ISO timestamp as given."""
+    if re.fullmatch(r"\d{4}-\d{2}-\d{2}", text):
+        return text + "T23:59:59"
+    return datetime.fromisoformat(text).isoformat(timespec="seconds")
+
+
+def _fmt_kb(n):
+    return f"{n / 1024:,.1f} KB"
+
+
+# ── Commands ──────────────────────────────────────────────────────
+
+def snapshot(archive, paths, when):
+    full_scan = not paths
+    paths = paths or data_files()
+    changed = added = 0
+    for path in paths:
+        ok, n = archive.snapshot_file(os.path.join(BASE, path), path, when)
+        changed += ok
+        added += n
+        if ok:
+            print(f"  📸 {path}")
+    if full_scan:
+        # Files that were archived but no longer exist get a deletion marker
+        present = set(paths)
+        for path in sorted(archive.files):
+            if path not in present and archive.version_at(path, when) is not None:
+                archive.record(path, None, when)
+                changed += 1
+                print(f"  🗑️  {path} (deleted)")
+    archive.save()
+    print(f"\n✅ {changed} of {len(paths)} file(s) changed, {_fmt_kb(added)} added to the archive")
+
+
+def import_legacy(archive):
+    copies = legacy_copies()
+    if not copies:
+        print("  No *.bak or _backup_* copies found")
+        return
+    added = 0
+    for full, path, when in copies:
+        ok, n = archive.snapshot_file(full, path, when)
+        added += n
+        print(f"  {'📥' if ok else '= '} {rel_path(full)} → {path} @ {when}")
+    archive.save()
+    legacy_bytes = sum(os.path.getsize(full) for full, _, _ in copies)
+    print(f"\n✅ Imported {len(copies)} legacy copies ({_fmt_kb(legacy_bytes)} on disk) "
+          f"into {_fmt_kb(added)} of archive objects")
+    print("   The legacy copies can now be deleted.")
+
+
+def list_versions(archive, paths):
+    for path in paths or sorted(archive.files):
+        versions = archive.files.get(path)
+        if not versions:
+            print(f"  {path}: not archived")
+            continue
+        print(f"  {path}")
+        for when, sha in versions:
+            if sha is None:
+                print(f"    {when}  deleted")
+                continue
+            meta = archive.objects[sha]
+            kind = f"delta (depth {meta['depth']})" if meta["base"] else "full"
+            print(f"    {when}  {sha[:12]}  {_fmt_kb(meta['size']):>12} → {_fmt_kb(meta['stored']):>10}  {kind}")
+
+
+def restore(archive, paths, when, target_dir=None):
+    """Write each file's version as of `when` to its path (or under `target_dir`)."""
+    explicit = bool(paths)
+    restored = 0
+    for path in paths or sorted(archive.files):
+        sha = archive.version_at(path, when)
+        if sha is None:
+            if explicit:
+                print(f"  ⚠️  {path}: no version at {when}")
+            continue
+        out = os.path.join(target_dir or BASE, path)
+        if target_dir is None and os.path.exists(out):
+            # Archive what is about to be overwritten so the restore can be undone
+            now = datetime.now().isoformat(timespec="seconds")
+            archive.snapshot_file(out, path, now)
+        data = archive.read(sha)
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        tmp = out + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, out)
+        restored += 1
+        print(f"  ♻️  {path} ← {sha[:12]} ({_fmt_kb(len(data))})")
+    archive.save()
+    print(f"\n✅ Restored {restored} file(s) as of {when}" + (f" into {target_dir}" if target_dir else ""))
+
+
+def stats(archive):
+    versions = [(p, sha) for p, vs in archive.files.items() for _, sha in vs if sha]
+    logical = sum(archive.objects[sha]["size"] for _, sha in versions)
+    stored = sum(m["stored"] for m in archive.objects.values())
+    deltas = sum(1 for m in archive.objects.values() if m["base"])
+    codecs = sorted({m["codec"] for m in archive.objects.values()})
+    legacy = sum(os.path.getsize(full) for full, _, _ in legacy_copies())
+    print("=" * 60)
+    print("  SNAPSHOT ARCHIVE")
+    print("=" * 60)
+    print(f"  Files:            {len(archive.files)}")
+    print(f"  Versions:         {len(versions)}")
+    print(f"  Objects:          {len(archive.objects)} ({deltas} deltas, codec: {', '.join(codecs) or '-'})")
+    print(f"  Versions as-is:   {_fmt_kb(logical)}")
+    print(f"  Stored:           {_fmt_kb(stored)}"
+          + (f"  ({100 * stored / logical:.1f}% of the versions)" if logical else ""))
+    if legacy:
+        print(f"  Legacy copies:    {_fmt_kb(legacy)} still on disk (*.bak, _backup_*)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="*", help="Data files (default: everything under src/data)")
+    parser.add_argument("--restore", metavar="DATE", help="Restore the version as of DATE (YYYY-MM-DD or ISO time)")
+    parser.add_argument("--to", metavar="DIR", help="With --restore: write under DIR instead of in place")
+    parser.add_argument("--list", action="store_true", help="List archived versions")
+    parser.add_argument("--stats", action="store_true", help="Show archive size vs. the versions it holds")
+    parser.add_argument("--import-legacy", action="store_true", help="Archive the *.bak and _backup_* copies")
+    args = parser.parse_args()
+
+    archive = Archive()
+    paths = [rel_path(p) for p in args.paths]
+    if args.restore:
+        restore(archive, paths, parse_when(args.restore), args.to)
+    elif args.list:
+        list_versions(archive, paths)
+    elif args.stats:
+        stats(archive)
+    elif args.import_legacy:
+        import_legacy(archive)
+    else:
+        print("=" * 60)
+        print(f"  DATA SNAPSHOT ({'zstd' if zstandard else 'gzip'})")
+        print("=" * 60)
+        snapshot(archive, paths, datetime.now().isoformat(timespec="seconds"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""
+Team Registry
+==============
+One alias registry for NCAA team names across every data file.
+
+src/data/team-registry.json assigns each school a stable integer ID and lists
+every spelling seen in rankings.json, games.json, ncaa-scores.json,
+seeding.json, injuries, football-games.json, logo mapping and snapshots.
+
+Lookups go through a normalized-name hash index (O(1)) and are exact:
+only registered names and aliases resolve. Fuzzy matching (a mascot-stripping
+prefix match, then a trigram match) is opt-in via resolve(name, fuzzy=True)
+for interactive lookups and --build review; joins (key(), canonical()) never
+use it, so an unknown team cannot silently join onto a different school.
+Answers are memoized so each spelling is matched once per run.
+
+USAGE:
+  sys.path.insert(0, os.path.join(BASE, "src", "scripts"))
+  from team_registry import load_registry, file_slug
+
+  reg = load_registry()
+  reg.resolve("Miami (FL)")      # -> team ID or None (exact / alias only)
+  reg.resolve("Abilene Christian Wildcats", fuzzy=True)   # interactive lookups
+  reg.key("Connecticut")         # -> team ID, or the normalized name if unknown
+  reg.name(reg.resolve("Uconn")) # -> "UConn"
+
+  # Rebuild / extend the registry from the data files:
+  python -X utf8 src/scripts/team_registry.py --build
+"""
+import argparse
+import json
+import os
+import re
+import unicodedata
+from functools import lru_cache
+
+BASE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA = os.path.join(BASE, "src", "data")
+REGISTRY_FILE = os.path.join(DATA, "team-registry.json")
+
+FUZZY_MIN_SCORE = 0.6   # trigram Jaccard needed to accept a fuzzy match
+FUZZY_MIN_MARGIN = 0.1  # ...and how far ahead of the runner-up it must be
+
+# Spellings that no normalization or fuzzy rule can recover
+SEED_ALIASES = {
+    "American University": ["American"],
+    "Army": ["Army West Point"],
+    "Brigham Young": ["BYU"],
+    "California": ["Cal"],
+    "California Baptist": ["Cal Baptist"],
+    "Charleston": ["College of Charleston"],
+    "East Tennessee State": ["E. Tennessee State", "ETSU"],
+    "Central Connecticut State": ["Central Connecticut"],
+    "Chicago St.": ["Chicago State"],
+    "Detroit-Mercy": ["Detroit", "Detroit Mercy"],
+    "Florida International": ["FIU"],
+    "Fort Wayne": ["Purdue Fort Wayne", "IPFW"],
+    "Illinois-Chicago": ["UIC"],
+    "LIU": ["Long Island", "Long Island University", "LIU-Brooklyn"],
+    "LSU": ["Louisiana State"],
+    "Louisiana": ["Louisiana-Lafayette", "Louisiana Lafayette"],
+    "Loyola (IL)": ["Loyola-Chicago", "Loyola Chicago"],
+    "Loyola (MD)": ["Loyola Maryland"],
+    "Louisiana-Monroe": ["Louisiana Monroe", "UL Monroe"],
+    "McNeese": ["McNeese State"],
+    "Merrimack": ["Merrimack College"],
+    "Miami (FL)": ["Miami", "Miami Florida"],
+    "Miami (OH)": ["Miami Ohio"],
+    "Middle Tennessee State": ["Middle Tennessee", "Middle Tennessee St."],
+    "NC State": ["North Carolina State"],
+    "NJIT": ["N.J.I.T."],
+    "Nicholls State": ["Nicholls"],
+    "Ole Miss": ["Mississippi"],
+    "Omaha": ["Nebraska-Omaha", "Nebraska Omaha"],
+    "Pennsylvania": ["Penn"],
+    "Prairie View A&M": ["Prairie View"],
+    "Queens University": ["Queens"],
+    "SIU-Edwardsville": ["SIUE"],
+    "SMU": ["Southern Methodist"],
+    "Sam Houston State": ["Sam Houston"],
+    "Southeast Missouri State": ["Southeast Missouri"],
+    "Southern Mississippi": ["Southern Miss"],
+    "Saint Mary's": ["St. Mary's (CAL)", "Saint Mary's (CA)"],
+    "Saint Joseph's": ["St. Joseph's"],
+    "Tennessee-Martin": ["UT Martin"],
+    "Texas A&M-CC": ["Texas A&M-Corpus Christi"],
+    "Texas-Arlington": ["UT Arlington"],
+    "Texas-RGV": ["UT Rio Grande Valley"],
+    "UMKC": ["Kansas City", "Missouri-Kansas City"],
+    "The Citadel": ["Citadel"],
+    "UC Santa Barbara": ["Cal-Santa Barbara"],
+    "UCF": ["Central Florida"],
+    "UConn": ["Connecticut", "Uconn"],
+    "UMBC": ["Maryland-Baltimore County"],
+    "UNC Wilmington": ["UNC-Wilmington"],
+    "Charlotte": ["UNC-Charlotte"],
+    "UTSA": ["Texas-San Antonio"],
+    "VMI": ["Virginia Military"],
+}
+
+# Files scanned by --build for spellings to register: (path, extractor)
+SOURCES = [
+    ("betting-lines/games.json", lambda d: [n for g in d for n in (g.get("away"), g.get("home"))]),
+    ("betting-lines/injuries.json", lambda d: list(d)),
+    ("seeding/seeding.json", lambda d: [t.get("Team") for t in d]),
+    ("ncaa-logo-mapping.json", lambda d: list(d)),
+    ("pre_tournament_snapshots/ncaa/seeding-20260315.json", lambda d: [t.get("Team") for t in d]),
+]
+
+
+# ── Key derivation (memoized) ─────────────────────────────────────
+
+@lru_cache(maxsize=None)
+def normalize(name):
+    """Canonical lookup key: ASCII, lower case, punctuation-free, St./Saint unified."""
+    s = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode()
+    s = s.lower().replace("&", " and ")
+    s = re.sub(r"[.'’()]", "", s)
+    s = re.sub(r"[^a-z0-9]+", " ", s).strip()
+    tokens = s.split()
+    if tokens and tokens[0] == "the":
+        tokens = tokens[1:]
+    if tokens and tokens[0] == "st":
+        tokens[0] = "saint"
+    if len(tokens) > 1 and tokens[-1] == "st":
+        tokens[-1] = "state"
+    return " ".join(tokens)
+
+
+@lru_cache(maxsize=None)
+def file_slug(name):
+    """Logo filename stem for a team name (the fetch / mapping scripts' convention)."""
+    safe_name = name.lower().strip()
+    safe_name = safe_name.replace(' ', '-')
+    safe_name = safe_name.replace("'", '')
+    safe_name = safe_name.replace("(", '').replace(")", '')
+    safe_name = safe_name.replace("&", 'and')
+    return ''.join(c for c in safe_name if c.isalnum() or c == '-')
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# ── Registry ──────────────────────────────────────────────────────
+
+class TeamRegistry:
+    def __init__(self, teams=None, path=REGISTRY_FILE):
+        self.path = path
+        self.teams = {}     # id -> {"id", "name", "aliases"}
+        self.index = {}     # normalized spelling -> id
+        self.slugs = {}     # file_slug of any spelling -> id
+        self.grams = {}     # trigram -> set of ids
+        self.words = set()  # tokens of school names (never stripped as a mascot)
+        self.prefixes = {}  # proper token-prefix of a spelling -> ids of teams with such a spelling
+        self._memo = {}
+        for t in teams or []:
+            self._insert(t["id"], t["name"], t.get("aliases", []))
+
+    def _insert(self, team_id, name, aliases):
+        entry = self.teams.setdefault(team_id, {"id": team_id, "name": name, "aliases": []})
+        for spelling in [name] + list(aliases):
+            if spelling != entry["name"] and spelling not in entry["aliases"]:
+                entry["aliases"].append(spelling)
+            key = normalize(spelling)
+            self.index.setdefault(key, team_id)
+            self.slugs.setdefault(file_slug(spelling), team_id)
+            tokens = key.split()
+            self.words.update(tokens)
+            for cut in range(1, len(tokens)):
+                self.prefixes.setdefault(" ".join(tokens[:cut]), set()).add(team_id)
+            for g in trigrams(key):
+                self.grams.setdefault(g, set()).add(team_id)
+        self._memo.clear()
+
+    # Lookups
+
+    def resolve(self, name, fuzzy=False):
+        """Team ID for a registered name or alias, or None; fuzzy=True also tries _fuzzy()."""
+        if not name:
+            return None
+        memo_key = (name, fuzzy)
+        if memo_key in self._memo:
+            return self._memo[memo_key]
+        key = normalize(name)
+        team_id = self.index.get(key)
+        if team_id is None and fuzzy:
+            team_id = self._fuzzy(key)[0]
+        self._memo[memo_key] = team_id
+        return team_id
+
+    def key(self, name):
+        """Join key: the team ID for a registered name / alias, otherwise the normalized name."""
+        team_id = self.resolve(name)
+        return team_id if team_id is not None else normalize(name)
+
+    def canonical(self, name):
+        """Registry spelling for a name (or the name itself when unknown)."""
+        team_id = self.resolve(name)
+        return self.teams[team_id]["name"] if team_id is not None else name
+
+    def name(self, team_id):
+        return self.teams[team_id]["name"]
+
+    def by_slug(self, slug):
+        return self.slugs.get(slug)
+
+    def _fuzzy(self, key):
+        """(id, score, how) via mascot-stripping prefix, then trigram Jaccard."""
+        tokens = key.split()
+        # "Abilene Christian Wildcats" -> "abilene christian", but not
+        # "Cal Baptist" -> "Cal": the stripped words must not be school words.
+        # Nor "Miami RedHawks" -> "Miami" or "Texas Rangers" -> "Texas": a prefix
+        # that starts another team's spelling ("miami oh", "texas a and m") is ambiguous.
+        for cut in range(len(tokens) - 1, 0, -1):
+            if self.words.intersection(tokens[cut:]):
+                break
+            prefix = " ".join(tokens[:cut])
+            hit = self.index.get(prefix)
+            if hit is not None:
+                if self.prefixes.get(prefix, set()) - {hit}:
+                    break
+                return hit, 1.0, "prefix"
+
+        grams = trigrams(key)
+        counts = {}
+        for g in grams:
+            for team_id in self.grams.get(g, ()):
+                counts[team_id] = counts.get(team_id, 0) + 1
+        scored = []
+        for team_id, shared in counts.items():
+            best = max(
+                shared / len(grams | trigrams(normalize(s)))
+                for s in [self.teams[team_id]["name"]] + self.teams[team_id]["aliases"]
+            )
+            scored.append((best, team_id))
+        scored.sort(reverse=True)
+        if not scored or scored[0][0] < FUZZY_MIN_SCORE:
+            return None, scored[0][0] if scored else 0.0, "none"
+        if len(scored) > 1 and scored[0][0] - scored[1][0] < FUZZY_MIN_MARGIN:
+            return None, scored[0][0], "ambiguous"
+        return scored[0][1], scored[0][0], "trigram"
+
+    # Editing
+
+    def add_team(self, name, aliases=()):
+        existing = self.resolve(name, fuzzy=False)
+        if existing is not None:
+            self._insert(existing, self.teams[existing]["name"], aliases)
+            return existing
+        team_id = max(self.teams, default=0) + 1
+        self._insert(team_id, name, aliases)
+        return team_id
+
+    def add_alias(self, team_id, alias):
+        self._insert(team_id, self.teams[team_id]["name"], [alias])
+
+    def save(self, path=None):
+        path = path or self.path
+        data = {"teams": [self.teams[i] for i in sorted(self.teams)]}
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+
+
+_REGISTRY = {}
+
+
+def load_registry(path=REGISTRY_FILE):
+    """Load (once per process) the registry at `path`."""
+    if path not in _REGISTRY:
+        teams = []
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                teams = json.load(f)["teams"]
+        _REGISTRY[path] = TeamRegistry(teams, path)
+    return _REGISTRY[path]
+
+
+# ── Build ─────────────────────────────────────────────────────────
+
+def build(path=REGISTRY_FILE):
+    reg = load_registry(path)
+
+    with open(os.path.join(DATA, "rankings", "rankings.json"), encoding="utf-8") as f:
+        for name in sorted(r.get("team") or r.get("Team") for r in json.load(f)):
+            reg.add_team(name)
+    for name, aliases in SEED_ALIASES.items():
+        reg.add_team(name, aliases)
+
+    added, unresolved = [], []
+    for rel, extract in SOURCES:
+        full = os.path.join(DATA, rel)
+        if not os.path.exists(full):
+            continue
+        with open(full, encoding="utf-8") as f:
+            names = {n for n in extract(json.load(f)) if n}
+        for n in sorted(names):
+            if reg.resolve(n, fuzzy=False) is not None:
+                continue
+            team_id, score, how = reg._fuzzy(normalize(n))
+            if team_id is None:
+                unresolved.append((rel, n, how, score))
+            else:
+                reg.add_alias(team_id, n)
+                added.append((n, reg.name(team_id), how, score))
+
+    reg.save()
+    print(f"  Registry: {len(reg.teams)} teams, {len(reg.index)} spellings → {path}")
+    if added:
+        print(f"\n  Added {len(added)} fuzzy alias(es) — review:")
+        for n, canon, how, score in added:
+            print(f"    {n:35s} → {canon:30s} ({how} {score:.2f})")
+    if unresolved:
+        print(f"\n  Unresolved ({len(unresolved)}):")
+        for rel, n, how, score in unresolved:
+            print(f"    {n:35s} [{rel}] ({how} {score:.2f})")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--build", action="store_true", help="Create/extend team-registry.json from the data files")
+    parser.add_argument("name", nargs="*", help="Names to resolve")
+    args = parser.parse_args()
+
+    if args.build:
+        build()
+    reg = load_registry()
+    for n in args.name:
+        team_id = reg.resolve(n, fuzzy=True)
+        print(f"  {n!r} → {team_id} ({reg.name(team_id) if team_id is not None else 'unknown'})")
+
+
+if __name__ == "__main__":
+    main()
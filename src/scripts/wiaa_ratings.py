@@ -0,0 +1,260 @@
+"""
+WIAA Rating Engine
+===================
+Computes the "WIAA Line Maker" rating columns (RAW_ → RANK_ → WTRANK_ →
+BBMI_Score / BBMI_Rank) for every school in every division without Excel.
+
+Per division and per stat, RAW values are scaled piecewise-linearly so the
+division minimum maps to scale.floor (1), the median to scale.median (25)
+and the maximum to scale.ceiling (50); for stats where lower is better the
+result is mirrored (floor + ceiling - score). WTRANK = RANK * weight and
+BBMI_Score is the sum of WTRANK over all stats; BBMI_Rank orders schools by
+score within their division. Weights, directions and the scale live in
+src/data/wiaa-rating-weights.json.
+
+RAW inputs:
+  - "games" stats (points scored / against / difference) and the record are
+    recomputed from completed games in wiaa-team/WIAA-team.json
+  - "stats" stats (shooting, rebounds, Q_Wins, ...) are not in the game
+    feed and are read from the RAW_ columns of wiaa_diagnostic.csv
+  - a missing RAW value scores scale.floor
+
+All stats of a division are scaled in one vectorized pass over a
+schools × stats matrix.
+
+USAGE:
+  python src/scripts/wiaa_ratings.py                     # write wiaa-rankings/wiaa-ratings.json
+  python src/scripts/wiaa_ratings.py --csv out.csv       # also write diagnostic-format CSV
+  python src/scripts/wiaa_ratings.py --check             # reproduce wiaa_diagnostic.csv from its own RAW_ columns
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import warnings
+from collections import defaultdict
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from artifact_writer import write_json
+
+BASE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA = os.path.join(BASE, "src", "data")
+WEIGHTS_FILE = os.path.join(DATA, "wiaa-rating-weights.json")
+GAMES_FILE = os.path.join(DATA, "wiaa-team", "WIAA-team.json")
+STATS_FILE = os.path.join(DATA, "wiaa_diagnostic.csv")
+OUTPUT_FILE = os.path.join(DATA, "wiaa-rankings", "wiaa-ratings.json")
+
+
+def load_config(path=WEIGHTS_FILE):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ── Inputs ────────────────────────────────────────────────────────
+
+def load_stats_table(path=STATS_FILE):
+    """{(division, team): {"record", "RAW stat": float}} from the diagnostic CSV's RAW_ columns.
+
+    Schools are keyed by division too: names are not unique statewide
+    (there is a Valley Christian in D4 and in D5).
+    """
+    table = {}
+    if not os.path.exists(path):
+        return table
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            entry = {"record": row.get("Record", "")}
+            for k, v in row.items():
+                if k.startswith("RAW_"):
+                    entry[k[4:]] = float(v) if v not in ("", None) else np.nan
+            table[(int(float(row["Division"])), row["Team"])] = entry
+    return table
+
+
+def game_stats(path=GAMES_FILE):
+    """{(division, team): {"record", points stats}} from completed games in WIAA-team.json."""
+    with open(path, encoding="utf-8") as f:
+        games = json.load(f)
+    by_team = defaultdict(list)
+    schools = set()
+    for g in games:
+        if not g.get("teamDiv"):
+            continue
+        key = (int(float(g["teamDiv"])), g["team"])
+        schools.add(key)
+        if g.get("result") in ("W", "L") and g.get("teamScore") is not None and g.get("oppScore") is not None:
+            by_team[key].append(g)
+
+    out = {}
+    for key in schools:
+        played = by_team.get(key, [])
+        wins = sum(g["result"] == "W" for g in played)
+        entry = {"record": f"{wins}-{len(played) - wins}"}
+        if played:
+            scored = np.array([g["teamScore"] for g in played], dtype=float)
+            allowed = np.array([g["oppScore"] for g in played], dtype=float)
+            entry.update(Points_Scored=scored.mean(), Points_Against=allowed.mean(),
+                         Point_Difference=(scored - allowed).mean())
+        out[key] = entry
+    return out
+
+
+def raw_matrix(config, stats_table, games_table=None):
+    """(teams, divisions, records, schools × stats RAW matrix) merging both sources per config."""
+    stat_names = list(config["stats"])
+    schools = sorted(set(stats_table) | set(games_table or {}))
+    teams = [team for _, team in schools]
+    divisions = np.array([div for div, _ in schools], dtype=np.int64)
+    raw = np.full((len(schools), len(stat_names)), np.nan)
+    records = []
+    for i, key in enumerate(schools):
+        from_games = (games_table or {}).get(key, {})
+        from_stats = stats_table.get(key, {})
+        records.append(from_games.get("record") or from_stats.get("record", ""))
+        for j, name in enumerate(stat_names):
+            use_games = games_table is not None and config["stats"][name].get("source") == "games"
+            value = (from_games if use_games else from_stats).get(name)
+            if value is not None:
+                raw[i, j] = value
+    return teams, divisions, records, raw
+
+
+# ── Engine ────────────────────────────────────────────────────────
+
+def scale_scores(raw, higher_is_better, floor=1.0, median=25.0, ceiling=50.0):
+    """RANK_ scores for one division: schools × stats, min→floor, median→median, max→ceiling per column."""
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns
+        lo = np.nanmin(raw, axis=0)
+        mid = np.nanmedian(raw, axis=0)
+        hi = np.nanmax(raw, axis=0)
+        below = floor + (median - floor) * (raw - lo) / (mid - lo)
+        above = median + (ceiling - median) * (raw - mid) / (hi - mid)
+    score = np.where(raw <= mid, below, above)
+    # Degenerate halves (e.g. everyone at 0 charges) and missing values sit at the floor
+    score = np.where(np.isfinite(score), score, floor)
+    return np.where(higher_is_better, score, floor + ceiling - score)
+
+
+def rank_desc(scores):
+    """1 = best; ties share the better rank (Excel RANK)."""
+    return np.searchsorted(np.sort(-scores), -scores, side="left") + 1
+
+
+def compute(config, divisions, raw):
+    """(RANK matrix, WTRANK matrix, BBMI_Score, BBMI_Rank) for every school."""
+    stats = config["stats"]
+    scale = config.get("scale", {})
+    floor, median, ceiling = scale.get("floor", 1), scale.get("median", 25), scale.get("ceiling", 50)
+    higher = np.array([s.get("higher_is_better", True) for s in stats.values()])
+    weights = np.array([float(s.get("weight", 0)) for s in stats.values()])
+
+    ranks = np.empty_like(raw)
+    bbmi_rank = np.zeros(len(raw), dtype=np.int64)
+    for div in np.unique(divisions):
+        rows = divisions == div
+        ranks[rows] = scale_scores(raw[rows], higher, floor, median, ceiling)
+    wtranks = ranks * weights
+    score = wtranks.sum(axis=1)
+    for div in np.unique(divisions):
+        rows = divisions == div
+        bbmi_rank[rows] = rank_desc(score[rows])
+    return ranks, wtranks, score, bbmi_rank
+
+
+def build_rows(config, teams, divisions, records, raw, ranks, wtranks, score, bbmi_rank):
+    """Diagnostic-format rows sorted by division and BBMI_Rank."""
+    names = list(config["stats"])
+    rows = []
+    for i, team in enumerate(teams):
+        row = {"Division": int(divisions[i]), "Team": team, "BBMI_Rank": int(bbmi_rank[i]),
+               "BBMI_Score": round(float(score[i]), 4), "Record": records[i]}
+        for j, name in enumerate(names):
+            row[f"RAW_{name}"] = None if np.isnan(raw[i, j]) else round(float(raw[i, j]), 3)
+        for j, name in enumerate(names):
+            row[f"RANK_{name}"] = round(float(ranks[i, j]), 3)
+        for j, name in enumerate(names):
+            row[f"WTRANK_{name}"] = round(float(wtranks[i, j]), 4)
+        row["WTRANK_TOTAL"] = round(float(score[i]), 4)
+        rows.append(row)
+    rows.sort(key=lambda r: (r["Division"], r["BBMI_Rank"], r["Team"]))
+    return rows
+
+
+# ── Check against the workbook ────────────────────────────────────
+
+def check(config, path=STATS_FILE):
+    """Recompute the diagnostic CSV from its own RAW_ columns and report the largest differences."""
+    with open(path, newline="", encoding="utf-8") as f:
+        expected = {(int(float(r["Division"])), r["Team"]): r for r in csv.DictReader(f)}
+    teams, divisions, records, raw = raw_matrix(config, load_stats_table(path))
+    ranks, wtranks, score, bbmi_rank = compute(config, divisions, raw)
+    names = list(config["stats"])
+
+    def col(prefix, name):
+        return np.array([float(expected[(int(d), t)][f"{prefix}{name}"]) for d, t in zip(divisions, teams)])
+
+    rank_err = max(np.abs(ranks[:, j] - col("RANK_", n)).max() for j, n in enumerate(names))
+    wt_err = max(np.abs(wtranks[:, j] - col("WTRANK_", n)).max() for j, n in enumerate(names))
+    total_err = np.abs(score - col("WTRANK_", "TOTAL")).max()
+    score_diff = np.abs(score - col("BBMI_", "Score"))
+    rank_match = (bbmi_rank == col("BBMI_", "Rank")).mean()
+    print(f"  Schools:               {len(teams)} in {len(np.unique(divisions))} divisions")
+    print(f"  RANK_ max |Δ|:         {rank_err:.4f}   (CSV is rounded to 3 decimals)")
+    print(f"  WTRANK_ max |Δ|:       {wt_err:.4f}")
+    print(f"  WTRANK_TOTAL max |Δ|:  {total_err:.4f}")
+    print(f"  BBMI_Score within 0.001: {(score_diff < 0.001).sum()} of {len(teams)} "
+          f"(max |Δ| {score_diff.max():.4f})")
+    print(f"  BBMI_Rank identical:   {100 * rank_match:.1f}%")
+    # The workbook's BBMI_Score is not always its own WTRANK_TOTAL; show how often
+    stale = np.abs(col("BBMI_", "Score") - col("WTRANK_", "TOTAL")) >= 0.001
+    if stale.any():
+        print(f"  Note: the CSV's BBMI_Score differs from its own WTRANK_TOTAL for {stale.sum()} schools; "
+              f"the engine matches WTRANK_TOTAL")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--check", action="store_true",
+                        help="Recompute wiaa_diagnostic.csv from its RAW_ columns and compare")
+    parser.add_argument("--csv", help="Also write the columns as a diagnostic-format CSV")
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    args = parser.parse_args()
+
+    config = load_config()
+    print("=" * 60)
+    print("  WIAA RATING ENGINE")
+    print("=" * 60)
+    if args.check:
+        check(config)
+        return
+
+    started = time.perf_counter()
+    teams, divisions, records, raw = raw_matrix(config, load_stats_table(), game_stats())
+    ranks, wtranks, score, bbmi_rank = compute(config, divisions, raw)
+    rows = build_rows(config, teams, divisions, records, raw, ranks, wtranks, score, bbmi_rank)
+    elapsed = time.perf_counter() - started
+
+    missing = int(np.isnan(raw).any(axis=1).sum())
+    print(f"  Schools:   {len(teams)} ({missing} with missing RAW stats)")
+    print(f"  Time:      {1000 * elapsed:.0f} ms")
+    for div in sorted({r["Division"] for r in rows}):
+        top = [r for r in rows if r["Division"] == div][:3]
+        print(f"  D{div}: " + ", ".join(f"{r['BBMI_Rank']}. {r['Team']} ({r['BBMI_Score']:.2f})" for r in top))
+
+    write_json(args.output, rows)
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"  CSV written to {args.csv}")
+    print(f"\n✅ Done! {len(rows)} schools rated")
+
+
+if __name__ == "__main__":
+    main()
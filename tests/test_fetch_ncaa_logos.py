@@ -0,0 +1,138 @@
+"""
+fetch-ncaa-logos.py against a local aiohttp stub of TheSportsDB.
+
+Checks that uncached searches are throttled by the token bucket, that badge
+downloads overlap instead of running one at a time, and that mapping paths
+follow --output-dir.
+
+USAGE:
+  python -m unittest tests/test_fetch_ncaa_logos.py
+"""
+import asyncio
+import importlib.util
+import os
+import tempfile
+import time
+import unittest
+
+from aiohttp import web
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEAMS = ["Duke", "Kansas", "Gonzaga", "Houston", "Purdue", "Auburn"]
+DELAY = 0.2       # seconds between throttled searches
+BURST = 2         # searches allowed back-to-back
+DOWNLOAD_SECONDS = 0.5
+
+
+def load_fetcher():
+    spec = importlib.util.spec_from_file_location("fetch_ncaa_logos", os.path.join(BASE, "fetch-ncaa-logos.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class StubSportsDb:
+    """searchteams.php + badge images, recording search times and download concurrency."""
+
+    def __init__(self):
+        self.search_times = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.app = web.Application()
+        self.app.router.add_get("/searchteams.php", self.search)
+        self.app.router.add_get("/badges/{name}", self.badge)
+
+    async def search(self, request):
+        self.search_times.append(time.monotonic())
+        name = request.query["t"]
+        return web.json_response({"teams": [{
+            "idTeam": str(TEAMS.index(name) + 1),
+            "strSport": "Basketball",
+            "strBadge": f"{request.url.origin()}/badges/{name}.png",
+        }]})
+
+    async def badge(self, request):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(DOWNLOAD_SECONDS)
+            return web.Response(body=b"\x89PNG stub " + request.match_info["name"].encode(),
+                                content_type="image/png")
+        finally:
+            self.in_flight -= 1
+
+
+class FetchLogosTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.fetcher = load_fetcher()
+        self.fetcher.REQUEST_DELAY = DELAY
+        self.fetcher.REQUEST_BURST = BURST
+        self.fetcher.PUBLIC_DIR = os.path.join(root, "public")
+        self.fetcher.MAPPING_FILE = os.path.join(root, "ncaa-logo-mapping.json")
+        self.fetcher.CACHE_FILE = os.path.join(root, "cache.sqlite")
+        self.fetcher.LEGACY_CACHE_FILE = os.path.join(root, "cache.json")
+        self.output_dir = os.path.join(root, "public", "logos", "ncaa-test")
+        self.fetcher.setup(self.output_dir)
+
+        self.stub = StubSportsDb()
+        self.runner = web.AppRunner(self.stub.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.api_url = f"http://127.0.0.1:{port}/searchteams.php"
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+        self.tmp.cleanup()
+
+    async def fetch(self, mapping):
+        stats = {"total": len(TEAMS), "processed": 0, "found": 0, "downloaded": 0, "skipped": 0, "failed": 0}
+        cache = self.fetcher.open_cache()
+        try:
+            await self.fetcher.fetch_all(TEAMS, cache, mapping, stats, self.api_url, self.output_dir)
+        finally:
+            cache.close()
+        return stats
+
+    async def test_searches_are_throttled(self):
+        stats = await self.fetch({})
+        self.assertEqual(stats["downloaded"], len(TEAMS))
+        times = sorted(self.stub.search_times)
+        self.assertEqual(len(times), len(TEAMS))
+        # Token bucket: the first BURST go at once, then one every DELAY seconds
+        for k in range(BURST, len(times)):
+            self.assertGreaterEqual(times[k] - times[0], (k - BURST + 1) * DELAY - 0.02)
+
+    async def test_downloads_overlap(self):
+        started = time.monotonic()
+        await self.fetch({})
+        elapsed = time.monotonic() - started
+        self.assertGreater(self.stub.max_in_flight, 1)
+        # One at a time would take at least len(TEAMS) * DOWNLOAD_SECONDS
+        self.assertLess(elapsed, len(TEAMS) * DOWNLOAD_SECONDS)
+
+    async def test_mapping_follows_output_dir(self):
+        mapping = {"Duke": {"filename": "old.png", "path": "/logos/ncaa/old.png", "variants": {"32": "/x.png"}}}
+        await self.fetch(mapping)
+        self.assertEqual(mapping["Duke"]["path"], "/logos/ncaa-test/duke.png")
+        self.assertEqual(mapping["Duke"]["sportsdb_id"], "1")
+        self.assertIn("variants", mapping["Duke"])
+        for team in TEAMS:
+            entry = mapping[team]
+            self.assertTrue(os.path.exists(os.path.join(self.output_dir, entry["filename"])))
+
+        # Second run: every logo is on disk, so no searches and the same paths
+        self.stub.search_times.clear()
+        again = {}
+        stats = await self.fetch(again)
+        self.assertEqual(stats["skipped"], len(TEAMS))
+        self.assertEqual(self.stub.search_times, [])
+        self.assertEqual({t: e["path"] for t, e in again.items()}, {t: mapping[t]["path"] for t in TEAMS})
+
+
+if __name__ == "__main__":
+    unittest.main()
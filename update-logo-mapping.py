@@ -2,26 +2,37 @@
 """
 Auto-update ncaa-logo-mapping.json with manually added logos
 Scans the logos folder and adds any new logos to the mapping file
+
+Logo files are matched to teams through the team registry, so a file named
+after any known spelling (e.g. connecticut.png for UConn) is picked up.
+
+Usage:
+    python update-logo-mapping.py            # one-shot scan
+    python update-logo-mapping.py --watch    # keep running; apply logo adds/renames/deletes as they happen
+    python update-logo-mapping.py --watch --poll   # watch without inotify
 """
 
+import argparse
 import json
 import os
+import sys
+import time
 from pathlib import Path
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "scripts"))
+from artifact_writer import write_json
+from file_watch import watch
+from logo_assets import drop_logos
+from team_registry import file_slug, load_registry
+
 # Configuration
 LOGOS_DIR = "public/logos/ncaa"
 MAPPING_FILE = "src/data/ncaa-logo-mapping.json"
 RANKINGS_FILE = "src/data/rankings/rankings.json"
+DEBOUNCE = 0.5  # seconds of quiet before a burst of file changes is applied
+POLL_INTERVAL = 1.0  # seconds between listings when inotify is unavailable
 
-def sanitize_filename(name):
-    """Convert team name to safe filename (same logic as fetch script)"""
-    safe_name = name.lower().strip()
-    safe_name = safe_name.replace(' ', '-')
-    safe_name = safe_name.replace("'", '')
-    safe_name = safe_name.replace('(', '').replace(')', '')
-    safe_name = safe_name.replace('&', 'and')
-    safe_name = ''.join(c for c in safe_name if c.isalnum() or c == '-')
-    return safe_name
+sanitize_filename = file_slug  # memoized; same logic as fetch script
 
 def load_team_names():
     """Load all team names from rankings.json"""
@@ -61,12 +72,57 @@ def load_mapping():
     return {}
 
 def save_mapping(mapping):
-    """Save mapping file"""
-    os.makedirs(os.path.dirname(MAPPING_FILE), exist_ok=True)
-    with open(MAPPING_FILE, 'w', encoding='utf-8') as f:
-        json.dump(mapping, f, indent=2)
+    """Save mapping file (atomically, so the dev server never reads half a file)"""
+    write_json(MAPPING_FILE, mapping)
+
+def build_team_index(team_names):
+    """(canonical logo filename -> team, registry ID -> team)"""
+    registry = load_registry()
+    filename_to_team = {f"{sanitize_filename(team)}.png": team for team in team_names}
+    team_by_id = {registry.resolve(team, fuzzy=False): team for team in team_names}
+    return filename_to_team, team_by_id
+
+def team_for_logo(logo_file, filename_to_team, team_by_id, logos):
+    """Team a logo file belongs to, or None.
+
+    Files named after an alias resolve through the registry, unless the team's
+    canonically named file is also present.
+    """
+    if logo_file in filename_to_team:
+        return filename_to_team[logo_file]
+    team_id = load_registry().by_slug(logo_file[:-4])
+    if team_id in team_by_id and f"{sanitize_filename(team_by_id[team_id])}.png" not in logos:
+        return team_by_id[team_id]
+    return None
+
+def forget_built(entry):
+    """Drop assets an earlier build-logo-assets.py wrote into a mapping entry"""
+    entry.pop("variants", None)
+    entry.pop("sprites", None)
+
+def apply_logo(mapping, team_name, logo_file):
+    """Point a team's mapping entry at logo_file; returns 'new', 'updated' or None"""
+    if team_name not in mapping:
+        mapping[team_name] = {
+            "filename": logo_file,
+            "path": f"/logos/ncaa/{logo_file}"
+        }
+        return "new"
+    # Update existing entry (in case path changed)
+    if mapping[team_name].get("filename") != logo_file:
+        mapping[team_name]["filename"] = logo_file
+        mapping[team_name]["path"] = f"/logos/ncaa/{logo_file}"
+        forget_built(mapping[team_name])
+        return "updated"
+    return None
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--watch", action="store_true", help="Keep running and apply logo changes as they happen")
+    parser.add_argument("--poll", action="store_true", help="With --watch: poll the folder instead of using inotify")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE, help="Seconds of quiet before applying a burst of changes")
+    args = parser.parse_args()
+
     print("=" * 70)
     print("NCAA LOGO MAPPING AUTO-UPDATER")
     print("=" * 70)
@@ -82,37 +138,31 @@ def main():
     print(f"✓ Current mapping has {len(mapping)} entries")
     
     # Build filename to team name lookup
-    filename_to_team = {}
-    for team in team_names:
-        filename = f"{sanitize_filename(team)}.png"
-        filename_to_team[filename] = team
+    filename_to_team, team_by_id = build_team_index(team_names)
+    logos = set(existing_logos)
     
     # Find new logos
     new_logos = []
     updated_logos = []
+    orphaned = []
     
     for logo_file in existing_logos:
         # Check if this logo file matches a team
-        if logo_file in filename_to_team:
-            team_name = filename_to_team[logo_file]
-            
-            # Check if already in mapping
-            if team_name not in mapping:
-                new_logos.append(team_name)
-                mapping[team_name] = {
-                    "filename": logo_file,
-                    "path": f"/logos/ncaa/{logo_file}"
-                }
-            else:
-                # Update existing entry (in case path changed)
-                if mapping[team_name].get("filename") != logo_file:
-                    updated_logos.append(team_name)
-                    mapping[team_name]["filename"] = logo_file
-                    mapping[team_name]["path"] = f"/logos/ncaa/{logo_file}"
+        team_name = team_for_logo(logo_file, filename_to_team, team_by_id, logos)
+        if team_name is None:
+            orphaned.append(logo_file)
+            continue
+        change = apply_logo(mapping, team_name, logo_file)
+        if change == "new":
+            new_logos.append(team_name)
+        elif change == "updated":
+            updated_logos.append(team_name)
     
     # Save updated mapping
     if new_logos or updated_logos:
         save_mapping(mapping)
+        # Built variants / sprites show the old file until the next asset build
+        drop_logos("ncaa", updated_logos)
         print("\n💾 Updated mapping file!")
     else:
         print("\n✓ Mapping file is already up to date")
@@ -139,11 +189,6 @@ def main():
             print(f"  ✓ {team}")
     
     # Check for logos without matching teams
-    orphaned = []
-    for logo_file in existing_logos:
-        if logo_file not in filename_to_team:
-            orphaned.append(logo_file)
-    
     if orphaned:
         print(f"\n⚠️  Found {len(orphaned)} logo file(s) that don't match any team:")
         for logo in sorted(orphaned)[:5]:
@@ -152,8 +197,120 @@ def main():
             print(f"  ... and {len(orphaned) - 5} more")
         print("\n  These might be typos or old files you can delete.")
     
+    if args.watch:
+        try:
+            watch_logos(logos, team_names, args.debounce, args.poll)
+        except KeyboardInterrupt:
+            print("\n⏹️  Stopped watching")
+        return
+
     print(f"\n✅ Done! Mapping file: {MAPPING_FILE}")
     print("   Restart your dev server to see the changes.\n")
 
+# ===== WATCH MODE =====
+def apply_batch(mapping, logos, changed, filename_to_team, team_by_id):
+    """Update only the entries touched by `changed` {logo file: kind}.
+
+    Returns (update log lines, logo files that match no team, teams whose
+    logo file changed or was overwritten, so their built assets are stale).
+    """
+    log, orphaned, stale = [], [], set()
+    file_to_team = {info.get("filename"): team for team, info in mapping.items()}
+
+    for logo_file, kind in sorted(changed.items()):
+        if kind == "removed":
+            logos.discard(logo_file)
+        else:
+            logos.add(logo_file)
+
+    # Removals first, so a rename resolves to a single update
+    for logo_file, kind in sorted(changed.items(), key=lambda c: (c[1] != "removed", c[0])):
+        if kind == "removed":
+            team_name = file_to_team.get(logo_file)
+            if team_name is None or mapping[team_name].get("filename") != logo_file:
+                continue
+            # Fall back to another file for the same team (e.g. an alias-named one)
+            replacement = next((f for f in sorted(logos)
+                                if team_for_logo(f, filename_to_team, team_by_id, logos) == team_name), None)
+            if replacement:
+                apply_logo(mapping, team_name, replacement)
+                log.append(f"🔄 {team_name}: {logo_file} → {replacement}")
+            else:
+                # Keep the entry (sportsdb_id, etc.) so a re-fetch finds the team again
+                mapping[team_name].pop("filename", None)
+                mapping[team_name].pop("path", None)
+                forget_built(mapping[team_name])
+                log.append(f"🗑️  {team_name}: {logo_file} removed")
+            stale.add(team_name)
+        else:
+            team_name = team_for_logo(logo_file, filename_to_team, team_by_id, logos)
+            if team_name is None:
+                orphaned.append(logo_file)
+                continue
+            change = apply_logo(mapping, team_name, logo_file)
+            if change == "new":
+                log.append(f"✨ {team_name}: {logo_file}")
+            elif change == "updated":
+                log.append(f"🔄 {team_name}: → {logo_file}")
+                stale.add(team_name)
+            elif kind == "modified" and mapping[team_name].get("filename") == logo_file:
+                # Same file name, new image
+                if "variants" in mapping[team_name] or "sprites" in mapping[team_name]:
+                    forget_built(mapping[team_name])
+                    log.append(f"🖼️  {team_name}: {logo_file} replaced")
+                stale.add(team_name)
+    return log, orphaned, stale
+
+def watch_logos(logos, team_names, debounce, force_poll):
+    """Apply logo adds / renames / deletes to the mapping as they happen
+
+    The mapping is re-read from disk for every batch, so fields written by
+    fetch-ncaa-logos.py in the meantime (new teams, sportsdb_id) are kept
+    rather than overwritten from memory. A team whose logo is renamed,
+    deleted or overwritten is dropped from the built page assets
+    (src/data/logo-assets), so its components show the new file right away.
+    """
+    logos_dir = os.path.normpath(LOGOS_DIR)
+    rankings_dir = os.path.normpath(os.path.dirname(RANKINGS_FILE))
+    filename_to_team, team_by_id = build_team_index(team_names)
+
+    print(f"\n👀 Watching {LOGOS_DIR}/ (Ctrl+C to stop)")
+    for batch in watch([logos_dir, rankings_dir], debounce=debounce, force_poll=force_poll,
+                       poll_interval=POLL_INTERVAL):
+        stamp = time.strftime("%H:%M:%S")
+        if batch is None:
+            # Events were lost: fall back to one full rescan
+            changed = {f: "added" for f in get_existing_logos()}
+            changed.update({f: "removed" for f in logos - set(changed)})
+            print(f"\n[{stamp}] Event queue overflowed, rescanning")
+        else:
+            changed = {os.path.basename(p): kind for p, kind in batch.items()
+                       if os.path.dirname(p) == logos_dir and p.endswith(".png")}
+            if os.path.normpath(RANKINGS_FILE) in batch:
+                # New team list: every logo may map differently
+                team_names = load_team_names()
+                filename_to_team, team_by_id = build_team_index(team_names)
+                changed = {f: "added" for f in logos} | changed
+                print(f"\n[{stamp}] rankings.json changed ({len(team_names)} teams)")
+        if not changed:
+            continue
+
+        started = time.perf_counter()
+        mapping = load_mapping()
+        log, orphaned, stale = apply_batch(mapping, logos, changed, filename_to_team, team_by_id)
+        if log:
+            save_mapping(mapping)
+        # Pages fall back to the logo's path until build-logo-assets.py runs again
+        dropped = drop_logos("ncaa", stale) if stale else 0
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"\n[{stamp}] {len(changed)} file change(s), {len(log)} mapping update(s) in {elapsed:.0f} ms")
+        if dropped:
+            print(f"  🧹 {len(stale)} team(s) dropped from the built logo assets until the next build-logo-assets.py run")
+        for line in log:
+            print(f"  {line}")
+        if orphaned:
+            shown = ", ".join(sorted(orphaned)[:5]) + (f" ... and {len(orphaned) - 5} more" if len(orphaned) > 5 else "")
+            print(f"  ⚠️  {len(orphaned)} logo file(s) don't match any team: {shown}")
+
 if __name__ == "__main__":
     main()
@@ -1,8 +1,13 @@
 import os
+import re
 import csv
-import json
+import sys
+from functools import lru_cache
 import win32com.client as win32
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "scripts"))
+from artifact_writer import write_json
+
 # ============================================
 # CONFIGURATION
 # ============================================
@@ -58,9 +63,9 @@ def read_range(sheet, start_row, end_row, cols):
 # ============================================
 # HELPER: Create slug from team name
 # ============================================
+@lru_cache(maxsize=None)
 def create_slug(team_name):
-    """Create a URL-friendly slug from team name"""
-    import re
+    """Create a URL-friendly slug from team name (memoized per name)"""
     slug = team_name.lower()
     # Replace spaces and slashes with hyphens
     slug = re.sub(r'[\s/]+', '-', slug)
@@ -256,8 +261,7 @@ def extract_division_bracket(wb, config):
     json_path = os.path.join(OUTPUT_DIR, f"{output_name}.json")
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(teams, f, indent=2)
+    write_json(json_path, teams)
     
     print(f"  ✓ Created {output_name}.json with {len(teams)} teams")
     